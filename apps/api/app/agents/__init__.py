@@ -3,12 +3,14 @@
 from .context import MedicationRunContext, VistaRunContext
 from .medication_enrichment import build_medication_enrichment_agent
 from .medication_grouping import build_medication_grouping_agent
-from .tools import build_medication_tools
+from .tools import MedicationPrefetch, build_medication_tools, prefetch_medication_data
 
 __all__ = [
+    "MedicationPrefetch",
     "MedicationRunContext",
     "VistaRunContext",
     "build_medication_enrichment_agent",
     "build_medication_grouping_agent",
     "build_medication_tools",
+    "prefetch_medication_data",
 ]
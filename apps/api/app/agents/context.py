@@ -5,7 +5,11 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+from ..services.vista_tools import DEFAULT_MAX_PAGES, DEFAULT_PAGE_SIZE
+
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from agents.mcp import MCPServerStreamableHttp
 
     from ..models.summaries import MedicationGroupingOutput
@@ -22,25 +26,28 @@ class VistaRunContext:
     station: str | None
     user_duz: str | None
     options: dict[str, object] = field(default_factory=dict)
-    max_pages: int = 4
-    page_size: int = 100
-    tool_cache: dict[str, tuple[tuple[object, ...], object]] = field(
+    max_pages: int = DEFAULT_MAX_PAGES
+    page_size: int = DEFAULT_PAGE_SIZE
+    tool_cache: dict[str, dict[tuple[object, ...], object]] = field(
         default_factory=dict
     )
 
     def get_cached_tool(self, name: str, params: tuple[object, ...]) -> object | None:
-        entry = self.tool_cache.get(name)
-        if entry is None:
+        entries = self.tool_cache.get(name)
+        if entries is None:
             return None
-        cached_params, cached_data = entry
-        if cached_params != params:
-            return None
-        return cached_data
+        return entries.get(params)
 
     def set_cached_tool(
         self, name: str, params: tuple[object, ...], data: object
     ) -> None:
-        self.tool_cache[name] = (params, data)
+        self.tool_cache.setdefault(name, {})[params] = data
+
+    def iter_cached_tool(
+        self, name: str
+    ) -> Iterator[tuple[tuple[object, ...], object]]:
+        """Iterate over every cached ``(params, data)`` entry for a tool."""
+        return iter(self.tool_cache.get(name, {}).items())
 
     def get_int_option(self, key: str, default: int) -> int:
         """Return an integer option value with safe coercion.
@@ -6,17 +6,16 @@ import json
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from agents import Agent, FunctionTool, ModelSettings, OpenAIChatCompletionsModel
+from agents import Agent, FunctionTool, ModelSettings
 
 from ..config import settings
 from ..models.summaries import MedicationSummary
+from ..services.azure_openai_router import get_azure_openai_router
 from .context import MedicationRunContext
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
-    from openai import AsyncAzureOpenAI
-
 PROMPT_PATH = (
     Path(__file__).resolve().parents[1] / "prompts" / "medication_enrichment.md"
 )
@@ -24,26 +23,28 @@ PROMPT_PATH = (
 
 def build_medication_enrichment_agent(
     *,
-    openai_client: AsyncAzureOpenAI,
     tools: Sequence[FunctionTool],
+    model_name: str | None = None,
 ) -> Agent[MedicationRunContext]:
     """Create the medication enrichment agent."""
 
-    instructions = (
-        PROMPT_PATH.read_text(encoding="utf-8")
-        + "\n\n"
-        + "Output should be a JSON object with the following schema:\n\n"
-        + json.dumps(MedicationSummary.model_json_schema())
-    )
+    instructions = PROMPT_PATH.read_text(encoding="utf-8")
+    if not settings.summary_structured_outputs:
+        instructions += (
+            "\n\n"
+            + "Output should be a JSON object with the following schema:\n\n"
+            + json.dumps(MedicationSummary.model_json_schema())
+        )
 
     return Agent[MedicationRunContext](
         name="MedicationEnrichmentAgent",
         instructions=instructions,
-        model=OpenAIChatCompletionsModel(
-            model=settings.azure_openai_deployment_name,
-            openai_client=openai_client,
-        ),
+        model=get_azure_openai_router().model(model_name),
         tools=list(tools),
+        # Native structured output: the schema is enforced by the response format
+        output_type=(
+            MedicationSummary if settings.summary_structured_outputs else None
+        ),
         model_settings=ModelSettings(
             temperature=0.15,
             top_p=0.1,
@@ -3,9 +3,8 @@
 import logging
 from typing import TYPE_CHECKING, Any
 
-from agents import Agent, OpenAIChatCompletionsModel
+from agents import Agent
 
-from ..config import settings
 from ..services.mcp_client import get_vista_mcp_client
 
 logger = logging.getLogger(__name__)
@@ -98,9 +97,7 @@ def get_orchestrator_agent(
     else:
         mcp_servers = []
 
-    from ..services.azure_openai import create_azure_openai_client
-
-    client = create_azure_openai_client()
+    from ..services.azure_openai_router import get_azure_openai_router
 
     agent = Agent(
         name="Vista Clinical Assistant",
@@ -111,10 +108,7 @@ def get_orchestrator_agent(
             if not mcp_servers
             else ""
         ),
-        model=OpenAIChatCompletionsModel(
-            model=settings.azure_openai_deployment_name,
-            openai_client=client,
-        ),
+        model=get_azure_openai_router().model(),
         mcp_servers=mcp_servers,
     )
 
@@ -2,24 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import TYPE_CHECKING, TypeVar, cast
+from typing import TYPE_CHECKING, TypedDict, TypeVar, cast
 
 from agents import FunctionTool, RunContextWrapper, function_tool
 
-from ..services import vista_tools
+from ..services import patient_data_cache, vista_tools
+from ..services.vista_tools import (
+    DEFAULT_LABS_DAYS_BACK,
+    DEFAULT_MEDICATION_DAYS_BACK,
+    DEFAULT_N_MOST_RECENT,
+    DEFAULT_PROBLEMS_DAYS_BACK,
+    DEFAULT_VITALS_DAYS_BACK,
+    LabObservation,
+    MedicationRecord,
+    ProblemRecord,
+    VitalObservation,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable
 
-    from ..services.vista_tools import (
-        LabObservation,
-        MedicationRecord,
-        ProblemRecord,
-        VitalObservation,
-    )
-
-if TYPE_CHECKING:
     from .context import MedicationRunContext
 else:  # pragma: no cover - runtime fallback for type hints
     MedicationRunContext = object
@@ -38,6 +42,11 @@ async def _get_or_load[ToolResultT](
     params: tuple[object, ...],
     loader: Callable[[], Awaitable[ToolResultT]],
 ) -> ToolResultT:
+    """Return the run-cached result for ``params`` or load (and cache) it.
+
+    ``loader`` should go through ``patient_data_cache`` so results are also
+    shared across runs and features.
+    """
     cached = context.get_cached_tool(cache_name, params)
     if cached is not None:
         return cast("ToolResultT", cached)
@@ -47,26 +56,54 @@ async def _get_or_load[ToolResultT](
     return data
 
 
+async def _get_or_load_window[ObservationT: (LabObservation, VitalObservation)](
+    context: MedicationRunContext,
+    cache_name: str,
+    days_back: int,
+    n_most_recent: int,
+    loader: Callable[[], Awaitable[dict[str, list[ObservationT]]]],
+) -> dict[str, list[ObservationT]]:
+    """Like ``_get_or_load`` but also serves narrower windows from wider results."""
+
+    params = _as_cache_key(days_back, n_most_recent)
+    if context.get_cached_tool(cache_name, params) is None:
+        for cached_params, cached in context.iter_cached_tool(cache_name):
+            cached_days, cached_count = cached_params
+            if (
+                isinstance(cached_days, int)
+                and isinstance(cached_count, int)
+                and cached_days >= days_back
+                and cached_count >= n_most_recent
+            ):
+                narrowed = vista_tools.narrow_series(
+                    cast("dict[str, list[ObservationT]]", cached),
+                    days_back=days_back,
+                    n_most_recent=n_most_recent,
+                )
+                context.set_cached_tool(cache_name, params, narrowed)
+                return narrowed
+
+    return await _get_or_load(context, cache_name, params, loader)
+
+
 def _as_json(payload_key: str, payload_value: object) -> str:
     return json.dumps({payload_key: payload_value})
 
 
-@function_tool(
-    name_override="fetch_medications",
-    description_override="Fetch and cache medications needed for grouping.",
-)
-async def _fetch_medications_tool(
-    ctx: RunContextWrapper[MedicationRunContext],
-    include_pending: bool = True,
-    days_back: int | None = None,
-) -> str:
-    context = ctx.context
-    resolved_days = days_back or context.get_int_option("medication_days_back", 183)
+async def _load_medications(
+    context: MedicationRunContext,
+    include_pending: bool,
+    days_back: int | None,
+) -> list[MedicationRecord]:
+    resolved_days = days_back or context.get_int_option(
+        "medication_days_back", DEFAULT_MEDICATION_DAYS_BACK
+    )
     cache_key = _as_cache_key(include_pending, resolved_days)
 
     async def _load() -> list[MedicationRecord]:
-        return await vista_tools.fetch_medications(
+        return await patient_data_cache.load_medications(
             context.vista_mcp,
+            user_duz=context.user_duz,
             patient_icn=context.patient_icn,
             station=context.station,
             include_pending=include_pending,
@@ -75,26 +112,23 @@ async def _fetch_medications_tool(
             max_pages=context.max_pages,
         )
 
-    medications = await _get_or_load(context, "fetch_medications", cache_key, _load)
-    return _as_json("medications", medications)
+    return await _get_or_load(context, "fetch_medications", cache_key, _load)
 
 
-@function_tool(
-    name_override="fetch_problems",
-    description_override="Fetch problem list entries for indication matching.",
-)
-async def _fetch_problems_tool(
-    ctx: RunContextWrapper[MedicationRunContext],
-    active_only: bool = True,
-    days_back: int | None = None,
-) -> str:
-    context = ctx.context
-    resolved_days = days_back or context.get_int_option("problems_days_back", 365)
+async def _load_problems(
+    context: MedicationRunContext,
+    active_only: bool,
+    days_back: int | None,
+) -> list[ProblemRecord]:
+    resolved_days = days_back or context.get_int_option(
+        "problems_days_back", DEFAULT_PROBLEMS_DAYS_BACK
+    )
     cache_key = _as_cache_key(active_only, resolved_days)
 
     async def _load() -> list[ProblemRecord]:
-        return await vista_tools.fetch_problems(
+        return await patient_data_cache.load_problems(
             context.vista_mcp,
+            user_duz=context.user_duz,
             patient_icn=context.patient_icn,
             station=context.station,
             days_back=resolved_days,
@@ -103,27 +137,25 @@ async def _fetch_problems_tool(
             max_pages=context.max_pages,
         )
 
-    problems = await _get_or_load(context, "fetch_problems", cache_key, _load)
-    return _as_json("problems", problems)
+    return await _get_or_load(context, "fetch_problems", cache_key, _load)
 
 
-@function_tool(
-    name_override="fetch_labs",
-    description_override="Retrieve recent lab results for medication monitoring.",
-)
-async def _fetch_labs_tool(
-    ctx: RunContextWrapper[MedicationRunContext],
-    days_back: int | None = None,
-    n_most_recent: int | None = None,
-) -> str:
-    context = ctx.context
-    resolved_days = days_back or context.get_int_option("labs_days_back", 1825)
-    resolved_count = n_most_recent or context.get_int_option("labs_n_most_recent", 3)
-    cache_key = _as_cache_key(resolved_days, resolved_count)
+async def _load_labs(
+    context: MedicationRunContext,
+    days_back: int | None,
+    n_most_recent: int | None,
+) -> dict[str, list[LabObservation]]:
+    resolved_days = days_back or context.get_int_option(
+        "labs_days_back", DEFAULT_LABS_DAYS_BACK
+    )
+    resolved_count = n_most_recent or context.get_int_option(
+        "labs_n_most_recent", DEFAULT_N_MOST_RECENT
+    )
 
     async def _load() -> dict[str, list[LabObservation]]:
-        return await vista_tools.fetch_labs(
+        return await patient_data_cache.load_labs(
             context.vista_mcp,
+            user_duz=context.user_duz,
             patient_icn=context.patient_icn,
             station=context.station,
             days_back=resolved_days,
@@ -132,27 +164,27 @@ async def _fetch_labs_tool(
             max_pages=context.max_pages,
         )
 
-    labs = await _get_or_load(context, "fetch_labs", cache_key, _load)
-    return _as_json("labs", labs)
+    return await _get_or_load_window(
+        context, "fetch_labs", resolved_days, resolved_count, _load
+    )
 
 
-@function_tool(
-    name_override="fetch_vitals",
-    description_override="Retrieve recent vital sign measurements for monitoring.",
-)
-async def _fetch_vitals_tool(
-    ctx: RunContextWrapper[MedicationRunContext],
-    days_back: int | None = None,
-    n_most_recent: int | None = None,
-) -> str:
-    context = ctx.context
-    resolved_days = days_back or context.get_int_option("vitals_days_back", 365)
-    resolved_count = n_most_recent or context.get_int_option("vitals_n_most_recent", 3)
-    cache_key = _as_cache_key(resolved_days, resolved_count)
+async def _load_vitals(
+    context: MedicationRunContext,
+    days_back: int | None,
+    n_most_recent: int | None,
+) -> dict[str, list[VitalObservation]]:
+    resolved_days = days_back or context.get_int_option(
+        "vitals_days_back", DEFAULT_VITALS_DAYS_BACK
+    )
+    resolved_count = n_most_recent or context.get_int_option(
+        "vitals_n_most_recent", DEFAULT_N_MOST_RECENT
+    )
 
     async def _load() -> dict[str, list[VitalObservation]]:
-        return await vista_tools.fetch_vitals(
+        return await patient_data_cache.load_vitals(
             context.vista_mcp,
+            user_duz=context.user_duz,
             patient_icn=context.patient_icn,
             station=context.station,
             days_back=resolved_days,
@@ -161,10 +193,104 @@ async def _fetch_vitals_tool(
             max_pages=context.max_pages,
         )
 
-    vitals = await _get_or_load(context, "fetch_vitals", cache_key, _load)
+    return await _get_or_load_window(
+        context, "fetch_vitals", resolved_days, resolved_count, _load
+    )
+
+
+@function_tool(
+    name_override="fetch_medications",
+    description_override="Fetch and cache medications needed for grouping.",
+)
+async def _fetch_medications_tool(
+    ctx: RunContextWrapper[MedicationRunContext],
+    include_pending: bool = True,
+    days_back: int | None = None,
+) -> str:
+    medications = await _load_medications(ctx.context, include_pending, days_back)
+    return _as_json("medications", medications)
+
+
+@function_tool(
+    name_override="fetch_problems",
+    description_override="Fetch problem list entries for indication matching.",
+)
+async def _fetch_problems_tool(
+    ctx: RunContextWrapper[MedicationRunContext],
+    active_only: bool = True,
+    days_back: int | None = None,
+) -> str:
+    problems = await _load_problems(ctx.context, active_only, days_back)
+    return _as_json("problems", problems)
+
+
+@function_tool(
+    name_override="fetch_labs",
+    description_override="Retrieve recent lab results for medication monitoring.",
+)
+async def _fetch_labs_tool(
+    ctx: RunContextWrapper[MedicationRunContext],
+    days_back: int | None = None,
+    n_most_recent: int | None = None,
+) -> str:
+    labs = await _load_labs(ctx.context, days_back, n_most_recent)
+    return _as_json("labs", labs)
+
+
+@function_tool(
+    name_override="fetch_vitals",
+    description_override="Retrieve recent vital sign measurements for monitoring.",
+)
+async def _fetch_vitals_tool(
+    ctx: RunContextWrapper[MedicationRunContext],
+    days_back: int | None = None,
+    n_most_recent: int | None = None,
+) -> str:
+    vitals = await _load_vitals(ctx.context, days_back, n_most_recent)
     return _as_json("vitals", vitals)
 
 
+class MedicationPrefetch(TypedDict):
+    """Normalized Vista data loaded before the medication agents run."""
+
+    medications: list[MedicationRecord]
+    problems: list[ProblemRecord]
+    labs: dict[str, list[LabObservation]]
+    vitals: dict[str, list[VitalObservation]]
+
+
+async def prefetch_medication_data(context: MedicationRunContext) -> MedicationPrefetch:
+    """Load all four medication summary datasets concurrently.
+
+    Uses the same defaults and caches as the agent tools (window options come from
+    ``context.options``), so any later tool call for the same data is served from
+    the run cache instead of Vista.
+    """
+
+    include_pending = context.options.get("medication_include_pending", True)
+    tasks = (
+        asyncio.ensure_future(
+            _load_medications(context, include_pending is not False, None)
+        ),
+        asyncio.ensure_future(_load_problems(context, True, None)),
+        asyncio.ensure_future(_load_labs(context, None, None)),
+        asyncio.ensure_future(_load_vitals(context, None, None)),
+    )
+    try:
+        medications, problems, labs, vitals = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            _ = task.cancel()
+        raise
+
+    return MedicationPrefetch(
+        medications=medications,
+        problems=problems,
+        labs=labs,
+        vitals=vitals,
+    )
+
+
 def build_medication_tools() -> dict[str, FunctionTool]:
     """Return the collection of tools used by medication agents."""
 
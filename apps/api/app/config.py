@@ -1,10 +1,24 @@
 import os
 from typing import ClassVar
 
-from pydantic import Field, field_validator
+from pydantic import BaseModel, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class AzureOpenAIDeploymentSettings(BaseModel):
+    """One extra Azure OpenAI endpoint/deployment the router may send calls to."""
+
+    name: str
+    endpoint: str
+    deployment: str
+    # Logical model served; agents asking for this model may use this deployment
+    model: str | None = None
+    api_key: str = ""
+    weight: float = Field(default=1.0, gt=0)
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+
+
 class Settings(BaseSettings):
     """
     Application settings loaded from environment variables.
@@ -47,14 +61,49 @@ class Settings(BaseSettings):
     azure_openai_api_version: str = Field(
         default="2025-03-01-preview", alias="AZURE_OPENAI_API_VERSION"
     )
+    azure_openai_deployments: list[AzureOpenAIDeploymentSettings] = Field(
+        default_factory=list,
+        alias="AZURE_OPENAI_DEPLOYMENTS",
+        description="JSON list of extra deployments to load-balance and fail over to",
+    )
     azure_client_id: str = Field(
         default="", alias="AZURE_CLIENT_ID"
     )  # For managed identity
+    azure_openai_token_refresh_margin_seconds: int = Field(
+        default=300,
+        alias="AZURE_OPENAI_TOKEN_REFRESH_MARGIN_SECONDS",
+        description="Refresh managed identity tokens this many seconds before expiry",
+    )
     azure_openai_max_concurrency: int = Field(
         default=2,
         alias="AZURE_OPENAI_MAX_CONCURRENCY",
         description="Maximum number of concurrent Azure OpenAI runs allowed",
     )
+    azure_openai_interactive_reserved_concurrency: int = Field(
+        default=2,
+        alias="AZURE_OPENAI_INTERACTIVE_RESERVED_CONCURRENCY",
+        description="Extra concurrent Azure OpenAI calls only interactive chat may use",
+    )
+    azure_openai_adaptive_concurrency: bool = Field(
+        default=False,
+        alias="AZURE_OPENAI_ADAPTIVE_CONCURRENCY",
+        description="Adapt concurrency (AIMD) from AZURE_OPENAI_MAX_CONCURRENCY",
+    )
+    azure_openai_min_concurrency: int = Field(
+        default=1,
+        alias="AZURE_OPENAI_MIN_CONCURRENCY",
+        description="Lowest concurrency the adaptive limiter will back off to",
+    )
+    azure_openai_max_concurrency_ceiling: int = Field(
+        default=8,
+        alias="AZURE_OPENAI_MAX_CONCURRENCY_CEILING",
+        description="Highest concurrency the adaptive limiter will grow to",
+    )
+    azure_openai_latency_spike_factor: float = Field(
+        default=2.0,
+        alias="AZURE_OPENAI_LATENCY_SPIKE_FACTOR",
+        description="Model calls slower than this multiple of their average back off",
+    )
     azure_openai_rate_limit_max_attempts: int = Field(
         default=3,
         alias="AZURE_OPENAI_RATE_LIMIT_MAX_ATTEMPTS",
@@ -70,6 +119,16 @@ class Settings(BaseSettings):
         alias="AZURE_OPENAI_RATE_LIMIT_JITTER_MS",
         description="Maximum jitter (milliseconds) added to Azure OpenAI backoff",
     )
+    azure_openai_requests_per_minute: int = Field(
+        default=0,
+        alias="AZURE_OPENAI_REQUESTS_PER_MINUTE",
+        description="Deployment RPM quota to pace requests against (0 disables)",
+    )
+    azure_openai_tokens_per_minute: int = Field(
+        default=0,
+        alias="AZURE_OPENAI_TOKENS_PER_MINUTE",
+        description="Deployment TPM quota to pace requests against (0 disables)",
+    )
 
     # Vista MCP Configuration
     vista_mcp_server_url: str = Field(
@@ -80,6 +139,158 @@ class Settings(BaseSettings):
         alias="VISTA_MCP_TIMEOUT_SECONDS",
         description="Timeout in seconds for Vista MCP HTTP requests",
     )
+    vista_mcp_pool_max_size: int = Field(
+        default=32,
+        alias="VISTA_MCP_POOL_MAX_SIZE",
+        description="Maximum number of pooled Vista MCP sessions kept open",
+    )
+    vista_mcp_pool_idle_timeout_seconds: int = Field(
+        default=300,
+        alias="VISTA_MCP_POOL_IDLE_TIMEOUT_SECONDS",
+        description="Seconds an unused pooled Vista MCP session stays open",
+    )
+    vista_mcp_pool_health_check_interval_seconds: int = Field(
+        default=30,
+        alias="VISTA_MCP_POOL_HEALTH_CHECK_INTERVAL_SECONDS",
+        description="Idle seconds after which a pooled session is pinged before reuse",
+    )
+    chat_session_max_sessions: int = Field(
+        default=0,
+        alias="CHAT_SESSION_MAX_SESSIONS",
+        description="Chat conversations kept server-side (0 disables sessions)",
+    )
+    chat_session_ttl_seconds: float = Field(
+        default=1800.0,
+        alias="CHAT_SESSION_TTL_SECONDS",
+        description="Idle seconds before a chat session is dropped",
+    )
+    chat_session_max_history_tokens: int = Field(
+        default=8000,
+        alias="CHAT_SESSION_MAX_HISTORY_TOKENS",
+        description="History budget per session before old turns are compacted",
+    )
+    chat_tool_cache_ttl_seconds: float = Field(
+        default=300.0,
+        alias="CHAT_TOOL_CACHE_TTL_SECONDS",
+        description="Seconds a chat session reuses an MCP tool result (0 disables)",
+    )
+    chat_tool_cache_max_bytes: int = Field(
+        default=4 * 1024 * 1024,
+        alias="CHAT_TOOL_CACHE_MAX_BYTES",
+        description="Tool result memory budget per chat session in bytes",
+    )
+    chat_fast_path_enabled: bool = Field(
+        default=False,
+        alias="CHAT_FAST_PATH_ENABLED",
+        description="Answer simple data requests from Vista without the agent",
+    )
+    chat_mcp_tool_top_k: int = Field(
+        default=0,
+        alias="CHAT_MCP_TOOL_TOP_K",
+        description="Vista MCP tools exposed per chat turn, by relevance (0 = all)",
+    )
+    stream_disconnect_poll_seconds: float = Field(
+        default=0.5,
+        alias="STREAM_DISCONNECT_POLL_SECONDS",
+        description="How often idle chat/summary streams check for a client disconnect",
+    )
+
+    # Cross-request patient data cache (normalized Vista tool results)
+    patient_data_cache_ttl_seconds: int = Field(
+        default=300,
+        alias="PATIENT_DATA_CACHE_TTL_SECONDS",
+        description="Seconds a cached Vista result is reused (0 disables the cache)",
+    )
+    patient_data_cache_max_entries: int = Field(
+        default=2000,
+        alias="PATIENT_DATA_CACHE_MAX_ENTRIES",
+        description="Maximum number of cached Vista results",
+    )
+    patient_data_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        alias="PATIENT_DATA_CACHE_MAX_BYTES",
+        description="Approximate memory budget for cached Vista results in bytes",
+    )
+    summary_prefetch_enabled: bool = Field(
+        default=False,
+        alias="SUMMARY_PREFETCH_ENABLED",
+        description="Fetch all summary datasets concurrently before the agents run",
+    )
+    summary_grouping_model: str = Field(
+        default="",
+        alias="SUMMARY_GROUPING_MODEL",
+        description="Grouping stage model (default AZURE_OPENAI_DEPLOYMENT_NAME)",
+    )
+    summary_grouping_fast_model: str = Field(
+        default="",
+        alias="SUMMARY_GROUPING_FAST_MODEL",
+        description="Smaller model tried first for grouping; escalates on bad output",
+    )
+    summary_enrichment_model: str = Field(
+        default="",
+        alias="SUMMARY_ENRICHMENT_MODEL",
+        description="Enrichment stage model (default AZURE_OPENAI_DEPLOYMENT_NAME)",
+    )
+    summary_enrichment_fast_model: str = Field(
+        default="",
+        alias="SUMMARY_ENRICHMENT_FAST_MODEL",
+        description="Smaller model tried first for enrichment; escalates on bad output",
+    )
+    summary_cache_enabled: bool = Field(
+        default=False,
+        alias="SUMMARY_CACHE_ENABLED",
+        description="Reuse summaries generated from identical Vista data",
+    )
+    summary_cache_dir: str = Field(
+        default=".cache/summaries",
+        alias="SUMMARY_CACHE_DIR",
+        description="Directory for cached summaries (contains PHI)",
+    )
+    summary_cache_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        alias="SUMMARY_CACHE_MAX_BYTES",
+        description="Disk budget for cached summaries in bytes",
+    )
+    summary_incremental_enabled: bool = Field(
+        default=False,
+        alias="SUMMARY_INCREMENTAL_ENABLED",
+        description="Re-run only the medication groups whose Vista data changed",
+    )
+    summary_structured_outputs: bool = Field(
+        default=True,
+        alias="SUMMARY_STRUCTURED_OUTPUTS",
+        description="Enforce summary output schemas with native structured outputs",
+    )
+    summary_output_repair_attempts: int = Field(
+        default=1,
+        alias="SUMMARY_OUTPUT_REPAIR_ATTEMPTS",
+        description="Final-turn retries when an agent's output fails its schema",
+    )
+    summary_enrichment_batch_size: int = Field(
+        default=0,
+        alias="SUMMARY_ENRICHMENT_BATCH_SIZE",
+        description="Groups per concurrent enrichment run (0 enriches all at once)",
+    )
+    summary_job_workers: int = Field(
+        default=2,
+        alias="SUMMARY_JOB_WORKERS",
+        description="Concurrent workers running queued summary jobs",
+    )
+    summary_job_result_ttl_seconds: float = Field(
+        default=900.0,
+        alias="SUMMARY_JOB_RESULT_TTL_SECONDS",
+        description="How long finished summary jobs stay retrievable",
+    )
+    summary_job_max_pending: int = Field(
+        default=100,
+        alias="SUMMARY_JOB_MAX_PENDING",
+        description="Queued summary jobs before new submissions are rejected",
+    )
+    summary_stream_batch_size: int = Field(
+        default=1,
+        alias="SUMMARY_STREAM_BATCH_SIZE",
+        description="Groups per enrichment run when streaming (0 uses the above)",
+    )
 
     # Rate limiting configuration (environment-specific)
     rate_limit_delay_ms: int = Field(
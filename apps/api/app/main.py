@@ -6,6 +6,9 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
 from .routers import chat, health, summaries, user
+from .services.azure_openai import close_azure_openai_client
+from .services.mcp_client import vista_mcp_pool
+from .services.summary_jobs import summary_job_queue
 from .services.tracing import initialize_langsmith_tracing
 
 # Configure logging only if not already configured
@@ -43,6 +46,9 @@ async def lifespan(_app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down VA AI Assist API")
+    await summary_job_queue.close()
+    await vista_mcp_pool.close()
+    await close_azure_openai_client()
 
 
 # Root path based on environment (use prefix only when deployed, not localhost)
@@ -23,6 +23,7 @@ class PatientContext(BaseModel):
 class ChatRequest(BaseModel):
     """Chat request payload"""
 
+    id: str | None = None  # Conversation ID, sent by the AI SDK's useChat
     messages: list[ChatMessage]
     patient: PatientContext | None = None  # Patient context for Vista queries
     # Keep backward compatibility
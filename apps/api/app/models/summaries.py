@@ -85,3 +85,43 @@ class MedicationSummaryResponse(BaseModel):
 
     summary_type: Literal["medication"]
     data: MedicationSummary
+
+
+SummaryJobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class SummaryJobResponse(BaseModel):
+    """Status of a queued summary job, with its result once finished."""
+
+    job_id: str
+    status: SummaryJobStatus
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: MedicationSummaryResponse | None = None
+    error: str | None = None
+
+
+class SummaryProgressEvent(BaseModel):
+    """Streamed when a pipeline stage finishes."""
+
+    type: Literal["progress"] = "progress"
+    stage: Literal["data_fetched", "grouping_complete"]
+    group_count: int | None = None
+
+
+class SummaryGroupEvent(BaseModel):
+    """Streamed for each medication group as soon as it is enriched."""
+
+    type: Literal["group"] = "group"
+    group: MedicationGroup
+
+
+class SummaryCompleteEvent(BaseModel):
+    """Final streamed event; its summary supersedes any streamed groups."""
+
+    type: Literal["summary"] = "summary"
+    summary: MedicationSummaryResponse
+
+
+SummaryStreamEvent = SummaryProgressEvent | SummaryGroupEvent | SummaryCompleteEvent
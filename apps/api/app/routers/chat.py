@@ -3,12 +3,14 @@
 import json
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
+from ..config import settings
 from ..dependencies import Context
 from ..models.chat import ChatRequest
 from ..services.chat import ChatService
+from ..services.stream_disconnect import cancel_on_disconnect, chat_stream_stats
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +18,13 @@ router = APIRouter()
 
 
 @router.post("/chat")
-async def chat(chat_request: ChatRequest, ctx: Context):
+async def chat(chat_request: ChatRequest, request: Request, ctx: Context):
     """
     Streaming chat endpoint
 
     Args:
         chat_request: Chat request containing messages
+        request: HTTP request, polled so a disconnect cancels the agent run
         ctx: Request context with user authentication
 
     Returns:
@@ -36,11 +39,18 @@ async def chat(chat_request: ChatRequest, ctx: Context):
         # Create a safe streaming wrapper to prevent stack trace exposure
         async def safe_stream_generator():
             try:
-                async for chunk in chat_service.generate_stream(
+                stream = chat_service.generate_stream(
                     messages=chat_request.messages,
                     context=ctx,
                     # Keep for backward compatibility
                     patient_dfn=chat_request.patient_dfn,
+                    conversation_id=chat_request.id,
+                )
+                async for chunk in cancel_on_disconnect(
+                    request,
+                    stream,
+                    stats=chat_stream_stats,
+                    poll_interval=settings.stream_disconnect_poll_seconds,
                 ):
                     yield chunk
             except Exception as e:
@@ -4,10 +4,18 @@ from datetime import UTC, datetime
 
 import httpx
 from fastapi import APIRouter
-from openai import AsyncAzureOpenAI
 
 from ..config import settings
 from ..models import HealthResponse
+from ..services.azure_openai import get_azure_openai_client
+from ..services.azure_openai_router import get_azure_openai_router
+from ..services.azure_rate_limiter import azure_openai_cooldown, azure_rate_limiter
+from ..services.chat_sessions import chat_session_store
+from ..services.mcp_tool_cache import tool_result_cache_stats
+from ..services.patient_data_cache import patient_data_cache
+from ..services.stream_disconnect import chat_stream_stats, summary_stream_stats
+from ..services.summary_cache import summary_cache
+from ..services.summary_jobs import summary_job_queue
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +37,21 @@ async def health_check() -> HealthResponse:
 
 
 @router.get("/health/azure-openai")
-async def check_azure_openai() -> dict[str, str | bool]:
+async def check_azure_openai() -> dict[str, str | bool | float]:
     """Check Azure OpenAI connection and quota status"""
+    cooldown_remaining = azure_openai_cooldown.remaining()
+    if cooldown_remaining > 0:
+        # Probing during a Retry-After window would only extend the throttling
+        return {
+            "status": "throttled",
+            "rate_limited": True,
+            "retry_after_seconds": round(cooldown_remaining, 1),
+            "endpoint": settings.azure_openai_endpoint,
+            "deployment": settings.azure_openai_deployment_name,
+        }
+
     try:
-        client = AsyncAzureOpenAI(
-            api_key=settings.azure_openai_api_key,
-            api_version=settings.azure_openai_api_version,
-            azure_endpoint=settings.azure_openai_endpoint,
-        )
+        client = get_azure_openai_client()
 
         # Try a minimal completion to test the connection
         response = await client.chat.completions.create(
@@ -86,6 +101,63 @@ async def check_azure_openai() -> dict[str, str | bool]:
         }
 
 
+@router.get("/health/patient-data-cache")
+async def check_patient_data_cache() -> dict[str, int | bool]:
+    """Report hit/miss counters and size of the cross-request patient data cache."""
+    return {
+        "enabled": patient_data_cache.enabled,
+        **patient_data_cache.stats().as_dict(),
+    }
+
+
+@router.get("/health/chat-sessions")
+async def check_chat_sessions() -> dict[str, int | bool]:
+    """Report reuse, compaction and eviction counters of the chat session store."""
+    return {
+        "enabled": chat_session_store.enabled,
+        **chat_session_store.stats().as_dict(),
+    }
+
+
+@router.get("/health/chat-tool-cache")
+async def check_chat_tool_cache() -> dict[str, int]:
+    """Report reuse of MCP tool results within chat sessions."""
+    return tool_result_cache_stats.as_dict()
+
+
+@router.get("/health/streams")
+async def check_streams() -> dict[str, dict[str, int]]:
+    """Streaming response counts, including streams abandoned by the client"""
+    return {
+        "chat": chat_stream_stats.as_dict(),
+        "summary": summary_stream_stats.as_dict(),
+    }
+
+
+@router.get("/health/summary-cache")
+async def check_summary_cache() -> dict[str, int | bool]:
+    """Report hit/miss counters of the disk-backed summary cache."""
+    return {"enabled": summary_cache.enabled, **summary_cache.stats().as_dict()}
+
+
+@router.get("/health/summary-jobs")
+async def check_summary_jobs() -> dict[str, int]:
+    """Report worker count and outcome counters of the summary job queue."""
+    return summary_job_queue.stats()
+
+
+@router.get("/health/azure-rate-limiter")
+async def check_azure_rate_limiter() -> dict[str, object]:
+    """Report Azure OpenAI slot usage and queue wait times per priority class."""
+    return azure_rate_limiter.stats()
+
+
+@router.get("/health/azure-openai-deployments")
+async def check_azure_openai_deployments() -> list[dict[str, object]]:
+    """Report per-deployment health scores used by the Azure OpenAI router."""
+    return get_azure_openai_router().stats()
+
+
 @router.get("/health/ssl-certs")
 async def check_ssl_certificates() -> dict[str, str | bool | int]:
     """Check VA SSL certificate configuration by testing connection to VA PKI."""
@@ -1,15 +1,45 @@
 """summaries router."""
 
-from fastapi import APIRouter
+import json
+import logging
 
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from ..config import settings
 from ..dependencies import Context
-from ..models.summaries import SummariesRequest
+from ..models.summaries import SummariesRequest, SummaryJobResponse
+from ..services.stream_disconnect import cancel_on_disconnect, summary_stream_stats
 from ..services.summaries import SummariesService
+from ..services.summary_jobs import SummaryJob, summary_job_queue
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 _service = SummariesService()
 
 
+def _job_response(job: SummaryJob) -> SummaryJobResponse:
+    return SummaryJobResponse(
+        job_id=job.id,
+        status=job.status,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        result=job.result,
+        error=job.error,
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=SummaryJobResponse)
+async def get_summary_job(job_id: str, ctx: Context) -> SummaryJobResponse:
+    """Return the status of a summary job and its result once it has finished."""
+    job = await summary_job_queue.get(job_id, owner=ctx.user.sub if ctx.user else None)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Summary job not found")
+    return _job_response(job)
+
+
 @router.post("/{summary_type}")
 async def create_summary(
     summary_type: SummariesService.SummaryType,
@@ -18,3 +48,69 @@ async def create_summary(
 ):
     ctx.patient = request.patient
     return await _service.generate_summary(summary_type, request, ctx)
+
+
+@router.post("/{summary_type}/jobs", status_code=202, response_model=SummaryJobResponse)
+async def create_summary_job(
+    summary_type: SummariesService.SummaryType,
+    request: SummariesRequest,
+    ctx: Context,
+) -> SummaryJobResponse:
+    """Queue a summary job; poll ``GET /jobs/{job_id}`` for the result."""
+    ctx.patient = request.patient
+    job = await summary_job_queue.submit(summary_type, request, ctx)
+    return _job_response(job)
+
+
+@router.post("/{summary_type}/stream")
+async def stream_summary(
+    summary_type: SummariesService.SummaryType,
+    request: SummariesRequest,
+    http_request: Request,
+    ctx: Context,
+):
+    """
+    Streaming summary endpoint
+
+    Each progress, group and final summary event is sent as a ``2:`` data line
+    holding a one-element JSON array; errors are sent as ``3:`` lines, matching
+    the chat stream's framing. The summary run is cancelled if the client
+    disconnects.
+    """
+    ctx.patient = request.patient
+
+    async def safe_stream_generator():
+        try:
+            events = (
+                f"2:{json.dumps([event.model_dump(mode='json')])}\n"
+                async for event in _service.stream_summary(summary_type, request, ctx)
+            )
+            async for chunk in cancel_on_disconnect(
+                http_request,
+                events,
+                stats=summary_stream_stats,
+                poll_interval=settings.stream_disconnect_poll_seconds,
+            ):
+                yield chunk
+        except HTTPException as e:
+            logger.error(f"Summary stream error: {e.detail}")
+            error_message = (
+                e.detail
+                if e.status_code < 500
+                else "Failed to generate the summary. Please try again later."
+            )
+            yield f"3:{json.dumps(error_message)}\n"
+        except Exception as e:
+            logger.error(f"Summary stream error: {e!s}", exc_info=True)
+            error_message = "An internal server error occurred. Please try again later."
+            yield f"3:{json.dumps(error_message)}\n"
+
+    return StreamingResponse(
+        content=safe_stream_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
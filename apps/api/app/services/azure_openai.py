@@ -1,40 +1,125 @@
 """Azure OpenAI client service with managed identity support."""
 
+import asyncio
+import contextlib
+import logging
+import time
+
 from agents import (
     set_default_openai_api,
     set_default_openai_client,
     set_tracing_disabled,
 )
-from azure.identity import ManagedIdentityCredential
-from openai import AsyncAzureOpenAI
+from azure.core.credentials import AccessToken
+from azure.identity.aio import ManagedIdentityCredential
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
 
 from ..config import settings
+from .azure_rate_limiter import (
+    AzureOpenAIQuota,
+    azure_openai_quota,
+    azure_rate_limiter,
+)
+
+logger = logging.getLogger(__name__)
+
+COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+# Process-wide client, created on first use
+_azure_openai_client: AsyncAzureOpenAI | None = None
+_token_provider: "ManagedIdentityTokenProvider | None" = None
+
+
+class ManagedIdentityTokenProvider:
+    """Async ``azure_ad_token_provider`` that refreshes tokens ahead of expiry.
+
+    Requests keep using the cached token while a background task fetches its
+    replacement, so only the very first call (or a call after the token has fully
+    expired) waits on the identity endpoint.
+    """
+
+    _credential: ManagedIdentityCredential
+    _refresh_margin_seconds: float
+    _token: AccessToken | None
+    _refresh_task: asyncio.Task[AccessToken] | None
+
+    def __init__(
+        self,
+        credential: ManagedIdentityCredential,
+        *,
+        refresh_margin_seconds: float,
+    ) -> None:
+        self._credential = credential
+        self._refresh_margin_seconds = refresh_margin_seconds
+        self._token = None
+        self._refresh_task = None
+
+    async def __call__(self) -> str:
+        now = time.time()
+        token = self._token
+
+        if token is None or token.expires_on <= now:
+            token = await self._refresh()
+        elif token.expires_on - now <= self._refresh_margin_seconds:
+            _ = self._start_refresh()
+
+        return token.token
+
+    async def close(self) -> None:
+        """Stop any pending refresh and release the credential's transport."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            _ = self._refresh_task.cancel()
+            _ = await asyncio.wait({self._refresh_task})
+        await self._credential.close()
+
+    async def _refresh(self) -> AccessToken:
+        # Shield so one cancelled request does not abort the fetch other requests
+        # are waiting on.
+        return await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> asyncio.Task[AccessToken]:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(
+                self._fetch_token(), name="azure-openai-token-refresh"
+            )
+            self._refresh_task.add_done_callback(_discard_task_exception)
+        return self._refresh_task
+
+    async def _fetch_token(self) -> AccessToken:
+        try:
+            token = await self._credential.get_token(COGNITIVE_SERVICES_SCOPE)
+        except Exception as e:
+            logger.error(f"Managed identity token refresh failed: {e}")
+            raise
+        self._token = token
+        logger.debug(
+            "Refreshed Azure OpenAI token (expires in %.0fs)",
+            token.expires_on - time.time(),
+        )
+        return token
+
+
+def _discard_task_exception(task: asyncio.Task[AccessToken]) -> None:
+    # Background refresh failures are already logged; the next caller retries.
+    if not task.cancelled():
+        _ = task.exception()
 
 
 def create_azure_openai_client() -> AsyncAzureOpenAI:
     """
     Create Azure OpenAI client for AWS deployment with managed identity support.
 
+    Prefer ``get_azure_openai_client`` so the HTTP connection pool and managed
+    identity token are shared across requests.
+
     Returns:
         AsyncAzureOpenAI: Configured Azure OpenAI client
     """
-    # Production AWS with managed identity
-    if settings.azure_client_id:
-        credential = ManagedIdentityCredential(client_id=settings.azure_client_id)
-        token = credential.get_token("https://cognitiveservices.azure.com/.default")
-
-        client = AsyncAzureOpenAI(
-            azure_ad_token=token.token,
-            api_version=settings.azure_openai_api_version,
-            azure_endpoint=settings.azure_openai_endpoint,
-        )
-    # Local development with API key
-    else:
-        client = AsyncAzureOpenAI(
-            api_key=settings.azure_openai_api_key,
-            api_version=settings.azure_openai_api_version,
-            azure_endpoint=settings.azure_openai_endpoint,
-        )
+    client = build_azure_openai_client(
+        endpoint=settings.azure_openai_endpoint,
+        api_key=settings.azure_openai_api_key,
+        quota=azure_openai_quota,
+    )
 
     # Set as default for all agents
     # set_default_openai_client(client)
@@ -43,3 +128,86 @@ def create_azure_openai_client() -> AsyncAzureOpenAI:
     set_tracing_disabled(disabled=True)
 
     return client
+
+
+def build_azure_openai_client(
+    *,
+    endpoint: str,
+    api_key: str,
+    quota: AzureOpenAIQuota,
+) -> AsyncAzureOpenAI:
+    """Create a client for one Azure OpenAI resource, paced by ``quota``.
+
+    Managed identity (when ``AZURE_CLIENT_ID`` is set) takes precedence over
+    ``api_key``; the token provider is shared by every resource.
+    """
+    # Production AWS with managed identity
+    if settings.azure_client_id:
+        return AsyncAzureOpenAI(
+            azure_ad_token_provider=_get_token_provider(),
+            api_version=settings.azure_openai_api_version,
+            azure_endpoint=endpoint,
+            http_client=_create_http_client(quota),
+        )
+
+    # Local development with API key
+    return AsyncAzureOpenAI(
+        api_key=api_key or settings.azure_openai_api_key,
+        api_version=settings.azure_openai_api_version,
+        azure_endpoint=endpoint,
+        http_client=_create_http_client(quota),
+    )
+
+
+def _get_token_provider() -> ManagedIdentityTokenProvider:
+    global _token_provider
+
+    if _token_provider is None:
+        credential = ManagedIdentityCredential(client_id=settings.azure_client_id)
+        _token_provider = ManagedIdentityTokenProvider(
+            credential,
+            refresh_margin_seconds=settings.azure_openai_token_refresh_margin_seconds,
+        )
+    return _token_provider
+
+
+def _create_http_client(quota: AzureOpenAIQuota) -> DefaultAsyncHttpxClient:
+    # Every request is paced against the deployment's RPM/TPM quota and feeds
+    # the adaptive concurrency limit
+    return DefaultAsyncHttpxClient(
+        event_hooks={
+            "request": [quota.throttle_request, azure_rate_limiter.mark_request],
+            "response": [quota.record_response, azure_rate_limiter.record_response],
+        }
+    )
+
+
+def get_azure_openai_client() -> AsyncAzureOpenAI:
+    """Return the process-wide Azure OpenAI client, creating it on first use."""
+    global _azure_openai_client
+
+    if _azure_openai_client is None:
+        _azure_openai_client = create_azure_openai_client()
+    return _azure_openai_client
+
+
+async def close_azure_openai_client() -> None:
+    """Close the shared client, the router's per-deployment clients and the
+    credential (used on application shutdown)."""
+    # Imported here: the router module is built on top of this one
+    from .azure_openai_router import close_azure_openai_router
+
+    global _azure_openai_client, _token_provider
+
+    await close_azure_openai_router()
+
+    client, provider = _azure_openai_client, _token_provider
+    _azure_openai_client = None
+    _token_provider = None
+
+    if client is not None:
+        with contextlib.suppress(Exception):
+            await client.close()
+    if provider is not None:
+        with contextlib.suppress(Exception):
+            await provider.close()
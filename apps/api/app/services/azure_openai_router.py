@@ -0,0 +1,524 @@
+"""Route Azure OpenAI model calls across several endpoint/deployment pairs."""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, cast, override
+
+from agents import Model, OpenAIChatCompletionsModel
+from openai import APIConnectionError, APITimeoutError, InternalServerError
+
+from ..config import AzureOpenAIDeploymentSettings, settings
+from .azure_openai import build_azure_openai_client, get_azure_openai_client
+from .azure_rate_limiter import (
+    AzureOpenAICooldown,
+    AzureOpenAIQuota,
+    RequestPriority,
+    azure_openai_cooldown,
+    azure_openai_quota,
+    azure_rate_limiter,
+    parse_retry_after,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Mapping
+    from contextlib import AbstractAsyncContextManager
+
+    from agents import (
+        AgentOutputSchemaBase,
+        Handoff,
+        ModelResponse,
+        ModelSettings,
+        ModelTracing,
+        Tool,
+        TResponseInputItem,
+    )
+    from agents.items import TResponseStreamEvent
+    from openai import AsyncAzureOpenAI
+    from openai.types.responses.response_prompt_param import ResponsePromptParam
+
+logger = logging.getLogger(__name__)
+
+# Steer traffic away from a deployment that failed without sending Retry-After
+FAILOVER_COOLDOWN_SECONDS = 5.0
+
+# Weight of the newest sample in the latency and error-rate moving averages
+_EWMA_ALPHA = 0.2
+
+
+class DeploymentTarget:
+    """One endpoint/deployment pair with its own client, quota and health stats."""
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        deployment: str,
+        model: str,
+        weight: float,
+        client: AsyncAzureOpenAI,
+        quota: AzureOpenAIQuota,
+        owns_client: bool = True,
+    ) -> None:
+        self.name = name
+        self.deployment = deployment
+        self.model = model
+        self.weight = weight
+        self.quota = quota
+        self.client = client
+        # The primary target borrows the shared client, which is closed elsewhere
+        self.owns_client = owns_client
+        self._chat_model = OpenAIChatCompletionsModel(
+            model=deployment, openai_client=client
+        )
+        # With somewhere to fail over to, skip the SDK's retries on this target
+        self._failover_chat_model = OpenAIChatCompletionsModel(
+            model=deployment, openai_client=client.with_options(max_retries=0)
+        )
+        self.latency_seconds: float | None = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def chat_model(self, *, failover: bool) -> OpenAIChatCompletionsModel:
+        return self._failover_chat_model if failover else self._chat_model
+
+    @property
+    def cooldown(self) -> AzureOpenAICooldown:
+        return self.quota.cooldown
+
+    def score(self) -> float:
+        """Higher is better: weight scaled by spare quota, reliability and speed."""
+        quota = max(self.quota.remaining_fraction(), 0.05)
+        reliability = max(1.0 - self.error_rate, 0.05)
+        latency = max(self.latency_seconds or 1.0, 0.1)
+        return self.weight * quota * reliability / latency
+
+    def record_success(self, latency_seconds: float) -> None:
+        self.requests += 1
+        self.error_rate *= 1 - _EWMA_ALPHA
+        self.latency_seconds = (
+            latency_seconds
+            if self.latency_seconds is None
+            else (1 - _EWMA_ALPHA) * self.latency_seconds
+            + _EWMA_ALPHA * latency_seconds
+        )
+
+    def record_failure(self, exc: Exception, *, failover: bool) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.error_rate = (1 - _EWMA_ALPHA) * self.error_rate + _EWMA_ALPHA
+        # A lone deployment is paused only by Retry-After (via its client hooks)
+        if failover and self.cooldown.remaining() == 0:
+            self.cooldown.trip(_retry_after(exc) or FAILOVER_COOLDOWN_SECONDS)
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "name": self.name,
+            "deployment": self.deployment,
+            "model": self.model,
+            "weight": self.weight,
+            "score": round(self.score(), 4),
+            "latency_seconds": (
+                round(self.latency_seconds, 3) if self.latency_seconds else None
+            ),
+            "error_rate": round(self.error_rate, 3),
+            "quota_remaining_fraction": round(self.quota.remaining_fraction(), 3),
+            "cooldown_remaining_seconds": round(self.cooldown.remaining(), 2),
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+class _PoolCooldown(AzureOpenAICooldown):
+    """Cooldown view that only pauses a model's callers when every deployment
+    serving that model is paused."""
+
+    def __init__(self, router: AzureOpenAIRouter, model_name: str) -> None:
+        super().__init__()
+        self._router = router
+        self._model_name = model_name
+
+    @override
+    def trip(self, seconds: float) -> None:
+        # The throttled deployment's own cooldown is tripped by its client hooks
+        return
+
+    @override
+    def remaining(self) -> float:
+        return min(
+            (
+                target.cooldown.remaining()
+                for target in self._router.targets_for(self._model_name)
+            ),
+            default=0.0,
+        )
+
+
+class AzureOpenAIRouter:
+    """Pick a deployment per model call by health score and fail over on errors.
+
+    The primary deployment (``AZURE_OPENAI_DEPLOYMENT_NAME``) is always a target;
+    ``AZURE_OPENAI_DEPLOYMENTS`` adds more. A model name with no configured
+    target is served from the primary endpoint under that deployment name, with
+    the primary quota settings and cooldown.
+    """
+
+    targets: list[DeploymentTarget]
+    _cooldowns: dict[str, AzureOpenAICooldown]
+
+    def __init__(self, targets: list[DeploymentTarget]) -> None:
+        self.targets = targets
+        self._cooldowns = {}
+        self.cooldown = self.cooldown_for(settings.azure_openai_deployment_name)
+
+    def model(
+        self,
+        model_name: str | None = None,
+        *,
+        priority: RequestPriority | None = None,
+        user_key: str | None = None,
+    ) -> Model:
+        """Return an Agents SDK model that routes each call for ``model_name``.
+
+        With a ``priority``, each call holds an ``azure_rate_limiter`` slot for
+        its duration; without one, the caller is expected to hold a slot for the
+        whole run (as summaries do).
+        """
+        return RoutedChatCompletionsModel(
+            self,
+            model_name or settings.azure_openai_deployment_name,
+            priority=priority,
+            user_key=user_key,
+        )
+
+    def candidates(self, model_name: str) -> list[DeploymentTarget]:
+        """Targets serving ``model_name`` in the order they should be tried.
+
+        Deployments that are not cooling down come first, the first of them drawn
+        at random weighted by score so load spreads across healthy targets.
+        Paused deployments follow, soonest available first.
+        """
+        targets = self.targets_for(model_name)
+        available = [t for t in targets if t.cooldown.remaining() == 0]
+        paused = sorted(
+            (t for t in targets if t.cooldown.remaining() > 0),
+            key=lambda t: t.cooldown.remaining(),
+        )
+        if len(available) > 1:
+            weights = [t.score() for t in available]
+            first = random.choices(available, weights=weights)[0]
+            rest = sorted(
+                (t for t in available if t is not first),
+                key=lambda t: t.score(),
+                reverse=True,
+            )
+            available = [first, *rest]
+        return [*available, *paused]
+
+    def targets_for(self, model_name: str) -> list[DeploymentTarget]:
+        """Targets serving ``model_name``, adding a primary-endpoint one if none."""
+        targets = [t for t in self.targets if t.model == model_name]
+        return targets or [self._add_primary_target(model_name)]
+
+    def cooldown_for(self, model_name: str) -> AzureOpenAICooldown:
+        """Cooldown that holds back ``model_name`` runs only while every target
+        serving that model is paused."""
+        cooldown = self._cooldowns.get(model_name)
+        if cooldown is None:
+            cooldown = self._cooldowns[model_name] = _PoolCooldown(self, model_name)
+        return cooldown
+
+    def stats(self) -> list[dict[str, object]]:
+        return [target.stats() for target in self.targets]
+
+    async def close(self) -> None:
+        """Close the clients the targets own."""
+        for target in self.targets:
+            if target.owns_client:
+                with contextlib.suppress(Exception):
+                    await target.client.close()
+
+    def _add_primary_target(self, deployment: str) -> DeploymentTarget:
+        # Same endpoint as the primary deployment, so a 429 there pauses this too
+        quota = AzureOpenAIQuota(
+            requests_per_minute=settings.azure_openai_requests_per_minute,
+            tokens_per_minute=settings.azure_openai_tokens_per_minute,
+            cooldown=azure_openai_cooldown,
+        )
+        target = DeploymentTarget(
+            name=f"primary/{deployment}",
+            deployment=deployment,
+            model=deployment,
+            weight=1.0,
+            client=build_azure_openai_client(
+                endpoint=settings.azure_openai_endpoint,
+                api_key=settings.azure_openai_api_key,
+                quota=quota,
+            ),
+            quota=quota,
+        )
+        self.targets.append(target)
+        return target
+
+
+class RoutedChatCompletionsModel(Model):
+    """Chat Completions model that picks a deployment per call via the router.
+
+    A call that fails with throttling, a timeout, a connection error or a 5xx is
+    retried on the next candidate. Streams only fail over before the first event
+    has been yielded, so callers never see a partial response twice.
+    """
+
+    def __init__(
+        self,
+        router: AzureOpenAIRouter,
+        model_name: str,
+        *,
+        priority: RequestPriority | None = None,
+        user_key: str | None = None,
+    ) -> None:
+        self._router = router
+        self.model_name = model_name
+        self._priority = priority
+        self._user_key = user_key
+
+    @property
+    def cooldown(self) -> AzureOpenAICooldown:
+        """Cooldown of the deployments serving this model, for run-level retries."""
+        return self._router.cooldown_for(self.model_name)
+
+    def _slot(self) -> AbstractAsyncContextManager[None]:
+        if self._priority is None:
+            return contextlib.nullcontext()
+        return azure_rate_limiter.slot(priority=self._priority, user_key=self._user_key)
+
+    @override
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        prompt: ResponsePromptParam | None,
+    ) -> ModelResponse:
+        async with self._slot():
+            return await self._get_response(
+                system_instructions,
+                input,
+                model_settings,
+                tools,
+                output_schema,
+                handoffs,
+                tracing,
+                previous_response_id=previous_response_id,
+                prompt=prompt,
+            )
+
+    @override
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        prompt: ResponsePromptParam | None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        async with self._slot():
+            async for event in self._stream_response(
+                system_instructions,
+                input,
+                model_settings,
+                tools,
+                output_schema,
+                handoffs,
+                tracing,
+                previous_response_id=previous_response_id,
+                prompt=prompt,
+            ):
+                yield event
+
+    async def _get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        prompt: ResponsePromptParam | None,
+    ) -> ModelResponse:
+        candidates = self._router.candidates(self.model_name)
+        failover = len(candidates) > 1
+        for index, target in enumerate(candidates):
+            model = target.chat_model(failover=failover)
+            started_at = time.monotonic()
+            try:
+                response = await model.get_response(
+                    system_instructions,
+                    input,
+                    model_settings,
+                    tools,
+                    output_schema,
+                    handoffs,
+                    tracing,
+                    previous_response_id=previous_response_id,
+                    prompt=prompt,
+                )
+            except Exception as exc:
+                if not _should_fail_over(exc):
+                    raise
+                target.record_failure(exc, failover=failover)
+                if index == len(candidates) - 1:
+                    raise
+                _log_failover(target, exc)
+                continue
+            target.record_success(time.monotonic() - started_at)
+            return response
+        raise RuntimeError("No Azure OpenAI deployment available")
+
+    async def _stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        prompt: ResponsePromptParam | None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        candidates = self._router.candidates(self.model_name)
+        failover = len(candidates) > 1
+        for index, target in enumerate(candidates):
+            model = target.chat_model(failover=failover)
+            started_at = time.monotonic()
+            streamed = False
+            try:
+                async for event in model.stream_response(
+                    system_instructions,
+                    input,
+                    model_settings,
+                    tools,
+                    output_schema,
+                    handoffs,
+                    tracing,
+                    previous_response_id=previous_response_id,
+                    prompt=prompt,
+                ):
+                    streamed = True
+                    yield event
+            except Exception as exc:
+                if not _should_fail_over(exc):
+                    raise
+                target.record_failure(exc, failover=failover)
+                if streamed or index == len(candidates) - 1:
+                    raise
+                _log_failover(target, exc)
+                continue
+            target.record_success(time.monotonic() - started_at)
+            return
+
+
+def _should_fail_over(exc: Exception) -> bool:
+    if isinstance(exc, APIConnectionError | APITimeoutError | InternalServerError):
+        return True
+    return getattr(exc, "status_code", None) in {429, 503}
+
+
+def _retry_after(exc: Exception) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is None:
+        return None
+    return parse_retry_after(cast("Mapping[str, str]", headers))
+
+
+def _log_failover(target: DeploymentTarget, exc: Exception) -> None:
+    logger.warning(
+        "Azure OpenAI deployment %s failed (%s); failing over",
+        target.name,
+        type(exc).__name__,
+    )
+
+
+def _build_router() -> AzureOpenAIRouter:
+    targets = [
+        DeploymentTarget(
+            name="primary",
+            deployment=settings.azure_openai_deployment_name,
+            model=settings.azure_openai_deployment_name,
+            weight=1.0,
+            client=get_azure_openai_client(),
+            quota=azure_openai_quota,
+            owns_client=False,
+        )
+    ]
+    targets.extend(
+        _build_target(config) for config in settings.azure_openai_deployments
+    )
+    return AzureOpenAIRouter(targets)
+
+
+def _build_target(config: AzureOpenAIDeploymentSettings) -> DeploymentTarget:
+    quota = AzureOpenAIQuota(
+        requests_per_minute=config.requests_per_minute,
+        tokens_per_minute=config.tokens_per_minute,
+        cooldown=AzureOpenAICooldown(),
+    )
+    return DeploymentTarget(
+        name=config.name,
+        deployment=config.deployment,
+        model=config.model or config.deployment,
+        weight=config.weight,
+        client=build_azure_openai_client(
+            endpoint=config.endpoint, api_key=config.api_key, quota=quota
+        ),
+        quota=quota,
+    )
+
+
+# Process-wide router, created on first use alongside the shared client
+_router: AzureOpenAIRouter | None = None
+
+
+def get_azure_openai_router() -> AzureOpenAIRouter:
+    """Return the process-wide deployment router, creating it on first use."""
+    global _router
+
+    if _router is None:
+        _router = _build_router()
+        if len(_router.targets) > 1:
+            # Only hold back Azure runs when no deployment can take them
+            azure_rate_limiter.use_cooldown(_router.cooldown)
+            logger.info(
+                "Routing Azure OpenAI calls across %d deployments",
+                len(_router.targets),
+            )
+    return _router
+
+
+async def close_azure_openai_router() -> None:
+    """Close the router's per-deployment clients (used on application shutdown)."""
+    global _router
+
+    router, _router = _router, None
+    if router is not None:
+        await router.close()
@@ -3,24 +3,76 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import json
 import logging
 import random
-from typing import TYPE_CHECKING, TypeVar
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING, TypeVar, cast
 
 from openai import APIStatusError, RateLimitError
 
+from ..config import settings
+
 if TYPE_CHECKING:
-    from collections.abc import Awaitable, Callable
+    from collections.abc import AsyncGenerator, Awaitable, Callable, Mapping
+
+    import httpx
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
 
+class RequestPriority(IntEnum):
+    """Scheduling classes for Azure OpenAI work; lower values are served first."""
+
+    INTERACTIVE = 0
+    ON_DEMAND = 1
+    BACKGROUND = 2
+
+
+@dataclass
+class QueueWaitStats:
+    """Time callers of one priority class spent waiting for a slot."""
+
+    requests: int = 0
+    queued: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        average = self.total_wait_seconds / self.requests if self.requests else 0.0
+        return {**asdict(self), "average_wait_seconds": average}
+
+
 class AzureRateLimiter:
-    """Async rate limiter with retry/backoff for Azure OpenAI calls."""
+    """Async rate limiter with retry/backoff for Azure OpenAI calls.
+
+    Slots are granted by priority class first. Within a class, waiters are served
+    round-robin per user, so one user with many queued runs cannot hold every slot
+    while others wait.
 
-    _semaphore: asyncio.Semaphore
+    ``interactive_reserved`` extra slots can only be taken by interactive
+    requests, so chat is not left waiting behind a full window of summary runs.
+
+    In adaptive mode the concurrency limit follows AIMD: each healthy model call
+    adds ``1 / limit`` (about one slot per full window of successes), while a
+    429/503 or a call far slower than the recent average halves it, within
+    ``[min_concurrency, max_concurrency_ceiling]``. Calls are observed by the
+    ``httpx`` hooks of every Azure OpenAI client (``mark_request`` and
+    ``record_response``), with a latency baseline per deployment and response
+    kind, so multi-turn runs, tool calls and streaming do not skew it.
+    """
+
+    _limit: float
+    _active: int
+    _queues: dict[RequestPriority, OrderedDict[str, deque[asyncio.Future[None]]]]
+    _wait_stats: dict[RequestPriority, QueueWaitStats]
     _max_attempts: int
     _base_delay_seconds: float
     _jitter_seconds: float
@@ -31,30 +83,75 @@ class AzureRateLimiter:
         max_attempts: int,
         base_delay_seconds: float,
         jitter_seconds: float,
+        *,
+        adaptive: bool = False,
+        min_concurrency: int = 1,
+        max_concurrency_ceiling: int | None = None,
+        latency_spike_factor: float = 2.0,
+        cooldown: AzureOpenAICooldown | None = None,
+        interactive_reserved: int = 0,
     ) -> None:
         if max_concurrency < 1:
             raise ValueError("max_concurrency must be >= 1")
         if max_attempts < 1:
             raise ValueError("max_attempts must be >= 1")
+        if min_concurrency < 1:
+            raise ValueError("min_concurrency must be >= 1")
 
-        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._cooldown = cooldown or AzureOpenAICooldown()
+        self._adaptive = adaptive
+        self._min_concurrency = min_concurrency
+        self._max_concurrency_ceiling = max(
+            max_concurrency_ceiling or max_concurrency, min_concurrency
+        )
+        self._latency_spike_factor = latency_spike_factor
+        self._interactive_reserved = max(interactive_reserved, 0)
+        self._latency_averages: dict[str, float] = {}
+        self._last_decrease_at = 0.0
+        self._limit = float(
+            min(
+                max(max_concurrency, min_concurrency),
+                self._max_concurrency_ceiling,
+            )
+            if adaptive
+            else max_concurrency
+        )
+        self._active = 0
+        self._queues = {priority: OrderedDict() for priority in RequestPriority}
+        self._wait_stats = {priority: QueueWaitStats() for priority in RequestPriority}
         self._max_attempts = max_attempts
         self._base_delay_seconds = base_delay_seconds
         self._jitter_seconds = jitter_seconds
 
-    async def run(self, task_factory: Callable[[], Awaitable[T]]) -> T:
-        """Execute the coroutine returned by ``task_factory`` with retry handling."""
+    async def run(
+        self,
+        task_factory: Callable[[], Awaitable[T]],
+        *,
+        priority: RequestPriority = RequestPriority.ON_DEMAND,
+        user_key: str | None = None,
+        cooldown: AzureOpenAICooldown | None = None,
+    ) -> T:
+        """Execute the coroutine returned by ``task_factory`` with retry handling.
 
-        async with self._semaphore:
+        ``cooldown`` overrides the limiter's own, e.g. with the pool of
+        deployments serving the model the task calls.
+        """
+        cooldown = cooldown or self._cooldown
+        async with self.slot(priority=priority, user_key=user_key):
             attempt = 1
             while True:
+                await cooldown.wait()
                 try:
-                    return await task_factory()
+                    result = await task_factory()
                 except Exception as exc:
+                    if _is_throttled(exc):
+                        retry_after = _retry_after_seconds(exc)
+                        if retry_after:
+                            cooldown.trip(retry_after)
                     if not self._should_retry(exc, attempt):
                         raise
 
-                    delay = self._compute_delay(attempt)
+                    delay = max(self._compute_delay(attempt), cooldown.remaining())
                     logger.warning(
                         "Azure OpenAI rate limited (attempt %s/%s), retrying in %.2fs",
                         attempt,
@@ -63,23 +160,186 @@ class AzureRateLimiter:
                     )
                     await asyncio.sleep(delay)
                     attempt += 1
+                else:
+                    return result
 
-    def _should_retry(self, exc: Exception, attempt: int) -> bool:
-        if attempt >= self._max_attempts:
-            return False
+    @asynccontextmanager
+    async def slot(
+        self,
+        *,
+        priority: RequestPriority = RequestPriority.ON_DEMAND,
+        user_key: str | None = None,
+    ) -> AsyncGenerator[None]:
+        """Hold one concurrency slot, e.g. for the duration of a streamed run."""
+        await self._acquire(priority, user_key or "")
+        try:
+            yield
+        finally:
+            self._release()
 
-        if isinstance(exc, RateLimitError):
-            return True
+    async def mark_request(self, request: httpx.Request) -> None:
+        """``httpx`` request hook that timestamps a model call for AIMD."""
+        request.extensions[_STARTED_AT] = time.monotonic()
 
-        if isinstance(exc, APIStatusError) and exc.status_code in {429, 503}:
-            return True
+    async def record_response(self, response: httpx.Response) -> None:
+        """``httpx`` response hook feeding one model call's outcome into AIMD."""
+        started_at = response.request.extensions.get(_STARTED_AT)
+        if not isinstance(started_at, float):
+            return
+        if response.status_code in {429, 503}:
+            self._decrease(started_at, f"HTTP {response.status_code}")
+        elif response.is_success:
+            self._record_success(started_at, _latency_key(response))
 
-        status_code = getattr(exc, "status_code", None)
-        if status_code in {429, 503}:
-            return True
+    def use_cooldown(self, cooldown: AzureOpenAICooldown) -> None:
+        """Wait on ``cooldown`` instead, e.g. one spanning several deployments."""
+        self._cooldown = cooldown
+
+    def stats(self) -> dict[str, object]:
+        """Return active/queued counts and queue wait times per priority class."""
+        for priority, queue in self._queues.items():
+            self._wait_stats[priority].queued = sum(len(w) for w in queue.values())
+        return {
+            "adaptive": self._adaptive,
+            "max_concurrency": self._max_concurrency,
+            "concurrency_limit": round(self._limit, 2),
+            "interactive_reserved": self._interactive_reserved,
+            "latency_baselines_seconds": {
+                key: round(average, 3)
+                for key, average in self._latency_averages.items()
+            },
+            "active": self._active,
+            "cooldown_remaining_seconds": round(self._cooldown.remaining(), 2),
+            "queue_wait": {
+                priority.name.lower(): stats.as_dict()
+                for priority, stats in self._wait_stats.items()
+            },
+        }
+
+    async def _acquire(self, priority: RequestPriority, user_key: str) -> None:
+        started = time.monotonic()
+        if self._active < self._capacity(priority) and not self._has_waiters(priority):
+            self._active += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._queues[priority].setdefault(user_key, deque()).append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Granted a slot just as we were cancelled: hand it on
+                    self._release()
+                else:
+                    self._discard_waiter(priority, user_key, waiter)
+                raise
+
+        waited = time.monotonic() - started
+        stats = self._wait_stats[priority]
+        stats.requests += 1
+        stats.total_wait_seconds += waited
+        stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+        if waited >= 1.0:
+            logger.info(
+                "Azure OpenAI %s request waited %.2fs for a slot",
+                priority.name.lower(),
+                waited,
+            )
+
+    @property
+    def _max_concurrency(self) -> int:
+        return max(int(self._limit), 1)
+
+    def _capacity(self, priority: RequestPriority) -> int:
+        if priority is RequestPriority.INTERACTIVE:
+            return self._max_concurrency + self._interactive_reserved
+        return self._max_concurrency
 
-        message = str(exc).lower()
-        return "rate limit" in message or "too many requests" in message
+    def _record_success(self, started_at: float, key: str) -> None:
+        if not self._adaptive:
+            return
+
+        latency = time.monotonic() - started_at
+        average = self._latency_averages.get(key)
+        self._latency_averages[key] = (
+            latency if average is None else 0.8 * average + 0.2 * latency
+        )
+        if average is not None and latency > average * self._latency_spike_factor:
+            self._decrease(started_at, f"latency spike on {key} ({latency:.1f}s)")
+            return
+
+        self._limit = min(
+            self._limit + 1 / self._limit, float(self._max_concurrency_ceiling)
+        )
+        self._wake_waiters()
+
+    def _decrease(self, started_at: float, reason: str) -> None:
+        # Runs already in flight at the last cut report the same congestion; only
+        # the first of them should shrink the window.
+        if not self._adaptive or started_at < self._last_decrease_at:
+            return
+
+        previous = self._max_concurrency
+        self._limit = max(self._limit / 2, float(self._min_concurrency))
+        self._last_decrease_at = time.monotonic()
+        logger.warning(
+            "Azure OpenAI concurrency reduced %d -> %d (%s)",
+            previous,
+            self._max_concurrency,
+            reason,
+        )
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while (waiter := self._next_waiter()) is not None:
+            self._active += 1
+            waiter.set_result(None)
+
+    def _next_waiter(self) -> asyncio.Future[None] | None:
+        for priority in RequestPriority:
+            users = self._queues[priority]
+            if not users:
+                continue
+            if self._active >= self._capacity(priority):
+                # Lower classes have no more capacity than this one
+                return None
+            user_key, waiters = next(iter(users.items()))
+            waiter = waiters.popleft()
+            if waiters:
+                # Round-robin: this user's next waiter goes behind other users
+                users.move_to_end(user_key)
+            else:
+                del users[user_key]
+            return waiter
+        return None
+
+    def _discard_waiter(
+        self,
+        priority: RequestPriority,
+        user_key: str,
+        waiter: asyncio.Future[None],
+    ) -> None:
+        waiters = self._queues[priority].get(user_key)
+        if waiters is None:
+            return
+        with contextlib.suppress(ValueError):
+            waiters.remove(waiter)
+        if not waiters:
+            del self._queues[priority][user_key]
+
+    def _has_waiters(self, up_to: RequestPriority) -> bool:
+        """Whether anyone at ``up_to`` or a more urgent class is queued."""
+        return any(
+            self._queues[priority] for priority in RequestPriority if priority <= up_to
+        )
+
+    def _should_retry(self, exc: Exception, attempt: int) -> bool:
+        if attempt >= self._max_attempts:
+            return False
+
+        return _is_throttled(exc)
 
     def _compute_delay(self, attempt: int) -> float:
         base_delay: float = self._base_delay_seconds
@@ -90,3 +350,259 @@ class AzureRateLimiter:
             else 0.0
         )
         return backoff + jitter
+
+
+# httpx request extension holding when a model call was sent
+_STARTED_AT = "azure_rate_limiter_started_at"
+
+
+def _latency_key(response: httpx.Response) -> str:
+    """Baseline a call is compared with: its deployment and response kind.
+
+    Response hooks run once headers arrive, which for a stream is about the time
+    to first token but for a plain completion is the whole generation.
+    """
+    content_type = response.headers.get("content-type", "")
+    kind = "stream" if content_type.startswith("text/event-stream") else "response"
+    return f"{response.request.url.host}{response.request.url.path} {kind}"
+
+
+def _is_throttled(exc: Exception) -> bool:
+    if isinstance(exc, RateLimitError):
+        return True
+
+    if isinstance(exc, APIStatusError) and exc.status_code in {429, 503}:
+        return True
+
+    status_code = getattr(exc, "status_code", None)
+    if status_code in {429, 503}:
+        return True
+
+    message = str(exc).lower()
+    return "rate limit" in message or "too many requests" in message
+
+
+def _retry_after_seconds(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    return parse_retry_after(cast("Mapping[str, str]", headers))
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    """Return the server-requested wait from ``retry-after-ms``/``retry-after``."""
+    for name, scale in (("retry-after-ms", 1000.0), ("retry-after", 1.0)):
+        raw = headers.get(name)
+        if raw is None:
+            continue
+        try:
+            return max(float(raw) / scale, 0.0)
+        except ValueError:
+            continue
+    return None
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding at most one minute of quota."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self._refill_per_second = per_minute / 60.0
+        self._level = float(per_minute)
+        self._updated_at = time.monotonic()
+
+    @property
+    def level(self) -> float:
+        self._refill()
+        return self._level
+
+    def take(self, amount: float) -> float:
+        """Consume ``amount`` if available; otherwise return seconds to wait."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self._level >= amount:
+            self._level -= amount
+            return 0.0
+        return (amount - self._level) / self._refill_per_second
+
+    def calibrate(self, remaining: float) -> None:
+        """Lower the local estimate to what the server reports as remaining."""
+        self._refill()
+        self._level = min(self._level, max(remaining, 0.0))
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._level = min(
+            self.capacity, self._level + elapsed * self._refill_per_second
+        )
+
+
+class AzureOpenAICooldown:
+    """Process-wide pause after Azure OpenAI asks callers to back off.
+
+    A 429 with ``Retry-After`` applies to the whole deployment, so every caller
+    (summaries, chat, the health probe) waits out the window instead of adding to
+    the penalty with requests that would be rejected anyway.
+    """
+
+    def __init__(self) -> None:
+        self._until = 0.0
+        self.trips: int = 0
+
+    def trip(self, seconds: float) -> None:
+        """Pause new requests for ``seconds`` (extends, never shortens, a pause)."""
+        until = time.monotonic() + seconds
+        if until > self._until:
+            if self._until <= time.monotonic():
+                self.trips += 1
+                logger.warning(
+                    "Azure OpenAI throttled; pausing requests for %.1fs", seconds
+                )
+            self._until = until
+
+    def remaining(self) -> float:
+        """Seconds left in the current pause (0 when requests may proceed)."""
+        return max(self._until - time.monotonic(), 0.0)
+
+    async def wait(self) -> None:
+        """Sleep until any active pause has expired."""
+        remaining = self.remaining()
+        while remaining > 0:
+            await asyncio.sleep(remaining)
+            # The window may have been extended by another 429 meanwhile
+            remaining = self.remaining()
+
+
+class AzureOpenAIQuota:
+    """Process-wide requests/tokens-per-minute budget for the Azure deployment.
+
+    Every outgoing request waits for one request and its estimated tokens (prompt
+    plus ``max_tokens``, which is how Azure counts against TPM) before it is sent.
+    Buckets are recalibrated from the ``x-ratelimit-remaining-*`` headers, and a
+    ``Retry-After`` on a 429/503 trips the shared cooldown.
+    """
+
+    _requests: TokenBucket | None
+    _tokens: TokenBucket | None
+    _cooldown: AzureOpenAICooldown
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        cooldown: AzureOpenAICooldown,
+    ) -> None:
+        self._requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        )
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._cooldown = cooldown
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """Wait until the request fits in both budgets, then consume it.
+
+        Checking and consuming never awaits, so no lock is needed; each waiter
+        sleeps for its own shortfall and retries, and a request that fits is
+        never queued behind one still waiting for a refill.
+        """
+        while True:
+            await self._cooldown.wait()
+            delay = self._reserve(estimated_tokens)
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Recalibrate from an Azure OpenAI response's rate limit headers."""
+        for bucket, name in (
+            (self._requests, "x-ratelimit-remaining-requests"),
+            (self._tokens, "x-ratelimit-remaining-tokens"),
+        ):
+            raw = headers.get(name)
+            if bucket is None or raw is None:
+                continue
+            try:
+                bucket.calibrate(float(raw))
+            except ValueError:
+                continue
+
+        if status_code in {429, 503}:
+            retry_after = parse_retry_after(headers)
+            if retry_after:
+                self._cooldown.trip(retry_after)
+
+    @property
+    def cooldown(self) -> AzureOpenAICooldown:
+        return self._cooldown
+
+    def remaining_fraction(self) -> float:
+        """Share of the tightest configured budget still available (1.0 if none)."""
+        fractions = [
+            bucket.level / bucket.capacity
+            for bucket in (self._requests, self._tokens)
+            if bucket is not None
+        ]
+        return min(fractions, default=1.0)
+
+    async def throttle_request(self, request: httpx.Request) -> None:
+        """``httpx`` request hook that paces calls against this quota."""
+        await self.acquire(estimate_request_tokens(request.content))
+
+    async def record_response(self, response: httpx.Response) -> None:
+        """``httpx`` response hook that feeds rate limit headers back into the quota."""
+        self.observe(response.status_code, response.headers)
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        if self._requests is not None and self._requests.level < 1:
+            return self._requests.take(1)
+        if self._tokens is not None:
+            delay = self._tokens.take(estimated_tokens)
+            if delay > 0:
+                return delay
+        if self._requests is not None:
+            _ = self._requests.take(1)
+        return 0.0
+
+
+def estimate_request_tokens(body: bytes) -> int:
+    """Rough token estimate (about four characters per token) plus ``max_tokens``."""
+    completion_tokens = 0
+    try:
+        payload: object = json.loads(body) if body else None
+    except ValueError:
+        payload = None
+    if isinstance(payload, dict):
+        fields = cast("dict[str, object]", payload)
+        for key in ("max_completion_tokens", "max_tokens"):
+            value = fields.get(key)
+            if isinstance(value, int):
+                completion_tokens = value
+                break
+    return len(body) // 4 + completion_tokens
+
+
+# Quota and cooldown of the primary deployment (AZURE_OPENAI_DEPLOYMENT_NAME)
+azure_openai_cooldown = AzureOpenAICooldown()
+azure_openai_quota = AzureOpenAIQuota(
+    requests_per_minute=settings.azure_openai_requests_per_minute,
+    tokens_per_minute=settings.azure_openai_tokens_per_minute,
+    cooldown=azure_openai_cooldown,
+)
+
+# Shared by summaries and chat so priorities and fairness apply across both
+azure_rate_limiter = AzureRateLimiter(
+    max_concurrency=settings.azure_openai_max_concurrency,
+    max_attempts=settings.azure_openai_rate_limit_max_attempts,
+    base_delay_seconds=settings.azure_openai_rate_limit_base_delay_ms / 1000,
+    jitter_seconds=settings.azure_openai_rate_limit_jitter_ms / 1000,
+    adaptive=settings.azure_openai_adaptive_concurrency,
+    min_concurrency=settings.azure_openai_min_concurrency,
+    max_concurrency_ceiling=settings.azure_openai_max_concurrency_ceiling,
+    latency_spike_factor=settings.azure_openai_latency_spike_factor,
+    cooldown=azure_openai_cooldown,
+    interactive_reserved=settings.azure_openai_interactive_reserved_concurrency,
+)
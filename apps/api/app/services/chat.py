@@ -1,12 +1,12 @@
 """Chat service using OpenAI Agents SDK with Azure OpenAI"""
 
 import asyncio
-import contextlib
 import json
 import logging
 from collections.abc import AsyncGenerator
+from typing import TYPE_CHECKING
 
-from agents import RunConfig, Runner
+from agents import RunConfig, Runner, TResponseInputItem
 from agents.exceptions import AgentsException
 from mcp.shared.exceptions import McpError
 from openai.types.responses import ResponseTextDeltaEvent
@@ -15,8 +15,22 @@ from ..agents.orchestrator import get_orchestrator_agent
 from ..config import settings
 from ..dependencies.context import RequestContext
 from ..models.chat import ChatMessage
-from ..services.azure_openai import create_azure_openai_client
-from ..services.mcp_client import get_vista_mcp_client
+from ..services.azure_openai import get_azure_openai_client
+from ..services.azure_openai_router import get_azure_openai_router
+from ..services.azure_rate_limiter import RequestPriority
+from ..services.chat_fast_path import answer_chat_intent, classify_chat_intent
+from ..services.chat_sessions import (
+    ChatSession,
+    ChatSessionKey,
+    chat_session_store,
+)
+from ..services.mcp_client import vista_mcp_pool
+from ..services.mcp_tool_cache import CachingMCPServer
+from ..services.mcp_tool_selection import RelevantToolsMCPServer
+from ..services.vista_tools import VistaToolError
+
+if TYPE_CHECKING:
+    from agents.mcp import MCPServer
 
 logger = logging.getLogger(__name__)
 
@@ -26,14 +40,15 @@ class ChatService:
 
     def __init__(self):
         """Initialize chat service with Azure OpenAI client"""
-        # Create and set Azure OpenAI client
-        _ = create_azure_openai_client()
+        # Ensure the shared Azure OpenAI client exists and is set as default
+        _ = get_azure_openai_client()
 
     async def generate_stream(
         self,
         messages: list[ChatMessage],
         context: RequestContext,
         patient_dfn: str | None = None,  # Backward compatibility
+        conversation_id: str | None = None,
     ) -> AsyncGenerator[str]:
         """Generate a streaming response"""
         last_user_message = ""
@@ -73,8 +88,6 @@ class ChatService:
         else:
             enhanced_message = last_user_message
 
-        vista_mcp = None
-
         # Get auth params from context
         vista_context = context.require_vista_context(
             logger=logger,
@@ -87,6 +100,20 @@ class ChatService:
         station = patient_station or vista_context.station
         patient_icn = vista_context.icn
 
+        session: ChatSession | None = None
+        if conversation_id and chat_session_store.enabled:
+            session = chat_session_store.get_or_create(
+                ChatSessionKey(
+                    owner=context.user.sub if context.user else None,
+                    conversation_id=conversation_id,
+                ),
+                patient_icn=patient_icn,
+            )
+        user_item: TResponseInputItem = {"role": "user", "content": enhanced_message}
+        # Regenerate/reload resends the last question: its new answer replaces
+        # the previous turn, which is also left out of the history
+        regenerate = session is not None and session.repeats_last_turn(user_item)
+
         try:
             if settings.rate_limit_delay_ms > 0:
                 await asyncio.sleep(settings.rate_limit_delay_ms / 1000)
@@ -104,56 +131,133 @@ class ChatService:
                 else None,
             )
 
-            # Get MCP client and connect it after creating orchestrator
-            vista_mcp = get_vista_mcp_client(
+            # Lease a pooled MCP session after creating orchestrator
+            async with vista_mcp_pool.lease(
                 jwt_token,
                 user_duz=user_duz,
                 station=station,
-            )
-            logger.info(
-                "Initialized Vista MCP client for chat (jwt=%s, duz=%s, station=%s)",
-                "present" if jwt_token else "missing",
-                user_duz or "missing",
-                station or "missing",
-            )
-            await vista_mcp.connect()
-
-            # Add MCP server to orchestrator after connecting
-            orchestrator.mcp_servers = [vista_mcp]
-
-            # Configure run settings
-            run_config = RunConfig(
-                # Enable workflow tracing with a name
-                workflow_name="vista_patient_query",
-                # Include input/output data in traces (controlled by environment)
-                # NOTE: Set to False in production if handling PHI/sensitive data
-                trace_include_sensitive_data=settings.trace_include_sensitive_data,
-                # Add patient context as metadata
-                trace_metadata={
-                    "patient_icn": patient_icn,
-                    "patient_dfn": patient_dfn_local,
-                    "patient_station": patient_station,
-                    "user_duz": user_duz,
-                }
-                if patient_icn
-                else {},
-            )
+            ) as vista_mcp:
+                logger.info(
+                    "Leased Vista MCP session for chat (jwt=%s, duz=%s, station=%s)",
+                    "present" if jwt_token else "missing",
+                    user_duz or "missing",
+                    station or "missing",
+                )
 
-            # Use orchestrator agent with MCP tools
-            result = Runner.run_streamed(
-                orchestrator,
-                input=enhanced_message,
-                max_turns=3,  # Allow multiple turns for MCP tool calls
-                run_config=run_config,
-            )
+                intent = (
+                    classify_chat_intent(last_user_message)
+                    if settings.chat_fast_path_enabled and patient_icn
+                    else None
+                )
+                if intent is not None and patient_icn:
+                    try:
+                        lines = await answer_chat_intent(
+                            intent,
+                            vista_mcp,
+                            user_duz=user_duz,
+                            patient_icn=patient_icn,
+                            station=station,
+                        )
+                    except (VistaToolError, McpError) as e:
+                        logger.warning(
+                            "Fast path for %s failed, using the agent: %s", intent, e
+                        )
+                    else:
+                        logger.info("Answered %s request without the agent", intent)
+                        for line in lines:
+                            yield f"0:{json.dumps(line)}\n"
+                        if session is not None:
+                            chat_session_store.save(
+                                session,
+                                [
+                                    user_item,
+                                    {"role": "assistant", "content": "".join(lines)},
+                                ],
+                                replace_last=regenerate,
+                            )
+                        return
+
+                # Add MCP server to orchestrator once the session is connected
+                mcp_server: MCPServer = vista_mcp
+                if session is not None and session.tool_cache.enabled:
+                    # Repeat tool calls in this conversation skip Vista
+                    mcp_server = CachingMCPServer(mcp_server, session.tool_cache)
+                if settings.chat_mcp_tool_top_k > 0:
+                    # Follow-ups ("and last year?") lean on the previous question
+                    recent_questions = [m.content for m in messages if m.role == "user"]
+                    mcp_server = RelevantToolsMCPServer(
+                        mcp_server,
+                        query=" ".join(recent_questions[-2:]),
+                        top_k=settings.chat_mcp_tool_top_k,
+                    )
+                # Only the model calls hold an interactive limiter slot (queued
+                # ahead of summaries), not tool calls or the client's reads
+                orchestrator = orchestrator.clone(
+                    model=get_azure_openai_router().model(
+                        priority=RequestPriority.INTERACTIVE, user_key=user_duz
+                    ),
+                    mcp_servers=[mcp_server],
+                )
+
+                # Configure run settings
+                run_config = RunConfig(
+                    # Enable workflow tracing with a name
+                    workflow_name="vista_patient_query",
+                    # Include input/output data in traces (controlled by environment)
+                    # NOTE: Set to False in production if handling PHI/sensitive data
+                    trace_include_sensitive_data=settings.trace_include_sensitive_data,
+                    # Add patient context as metadata
+                    trace_metadata={
+                        "patient_icn": patient_icn,
+                        "patient_dfn": patient_dfn_local,
+                        "patient_station": patient_station,
+                        "user_duz": user_duz,
+                    }
+                    if patient_icn
+                    else {},
+                )
+
+                # Earlier turns (with their tool results) let follow-ups skip
+                # re-fetching data the model has already seen
+                history = (
+                    session.history(exclude_last=regenerate)
+                    if session is not None
+                    else []
+                )
+
+                # Use orchestrator agent with MCP tools
+                result = Runner.run_streamed(
+                    orchestrator,
+                    input=[*history, user_item] if history else enhanced_message,
+                    max_turns=3,  # Allow multiple turns for MCP tool calls
+                    run_config=run_config,
+                )
+
+                try:
+                    async for event in result.stream_events():
+                        if event.type == "raw_response_event" and isinstance(
+                            event.data, ResponseTextDeltaEvent
+                        ):
+                            # Properly escape the content for JSON
+                            content = json.dumps(event.data.delta)
+                            yield f"0:{content}\n"
+                finally:
+                    # Abandoned streams stop the agent run and its in-flight
+                    # model and MCP calls; a no-op once the run has finished
+                    result.cancel()
+
+                # stream_events() ends quietly when cancelled; keep the
+                # cancellation going so no partial turn is saved
+                task = asyncio.current_task()
+                if task is not None and task.cancelling():
+                    raise asyncio.CancelledError
 
-            async for event in result.stream_events():
-                if event.type == "raw_response_event" and isinstance(
-                    event.data, ResponseTextDeltaEvent
-                ):
-                    # Properly escape the content for JSON
-                    content = json.dumps(event.data.delta)
-                    yield f"0:{content}\n"
+                if session is not None:
+                    chat_session_store.save(
+                        session,
+                        result.to_input_list()[len(history) :],
+                        replace_last=regenerate,
+                    )
 
         except AgentsException as e:
             logger.error(f"Stream error: {e!s}", exc_info=True)
@@ -211,8 +315,3 @@ class ChatService:
                 )
             # Always yield a fully generic error message to the client.
             yield f"3:{json.dumps(error_message)}\n"
-        finally:
-            # Cleanup MCP connection
-            if vista_mcp is not None:
-                with contextlib.suppress(Exception):
-                    await vista_mcp.cleanup()
@@ -0,0 +1,211 @@
+"""Answer simple, unambiguous chat questions straight from Vista."""
+
+from __future__ import annotations
+
+import re
+from enum import StrEnum
+from typing import TYPE_CHECKING, cast
+
+from . import patient_data_cache
+from .vista_tools import (
+    DEFAULT_LABS_DAYS_BACK,
+    DEFAULT_MAX_PAGES,
+    DEFAULT_MEDICATION_DAYS_BACK,
+    DEFAULT_N_MOST_RECENT,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_PROBLEMS_DAYS_BACK,
+    DEFAULT_VITALS_DAYS_BACK,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from agents.mcp import MCPServerStreamableHttp
+
+    from .vista_tools import (
+        LabObservation,
+        MedicationRecord,
+        ProblemRecord,
+        VitalObservation,
+    )
+
+# Longer questions go to the agent even when every word is recognized
+MAX_QUESTION_WORDS = 10
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class ChatIntent(StrEnum):
+    MEDICATIONS = "medications"
+    PROBLEMS = "problems"
+    LABS = "labs"
+    VITALS = "vitals"
+
+
+_INTENT_WORDS: dict[str, ChatIntent] = {
+    "medication": ChatIntent.MEDICATIONS,
+    "medications": ChatIntent.MEDICATIONS,
+    "meds": ChatIntent.MEDICATIONS,
+    "problems": ChatIntent.PROBLEMS,
+    "problem": ChatIntent.PROBLEMS,
+    "diagnoses": ChatIntent.PROBLEMS,
+    "conditions": ChatIntent.PROBLEMS,
+    "labs": ChatIntent.LABS,
+    "lab": ChatIntent.LABS,
+    "vitals": ChatIntent.VITALS,
+    "vital": ChatIntent.VITALS,
+}
+
+# Words that do not change which data a simple question asks for
+_FILLER_WORDS = frozenset(
+    {
+        *("what", "whats", "which", "are", "is", "s", "the", "a", "me", "us"),
+        *("show", "list", "get", "give", "display", "pull", "up", "please"),
+        *("patient", "patients", "pt", "his", "her", "their", "this"),
+        *("current", "currently", "recent", "latest", "active", "all", "on"),
+        *("taking", "results", "signs", "of", "does", "have", "has"),
+    }
+)
+
+
+def classify_chat_intent(message: str) -> ChatIntent | None:
+    """Return the intent of a simple data request, or None if unsure.
+
+    Only questions made entirely of one intent word plus filler words match,
+    so anything with a qualifier (a date range, a specific test, a trend
+    question) goes to the agent.
+    """
+    words = _WORD.findall(message.lower().replace("'", ""))
+    if not words or len(words) > MAX_QUESTION_WORDS:
+        return None
+    intents = {_INTENT_WORDS.get(word) for word in words if word not in _FILLER_WORDS}
+    if len(intents) != 1:
+        return None
+    return intents.pop()
+
+
+async def answer_chat_intent(
+    intent: ChatIntent,
+    vista_mcp: MCPServerStreamableHttp,
+    *,
+    user_duz: str | None,
+    patient_icn: str,
+    station: str | None,
+) -> list[str]:
+    """Fetch the data for ``intent`` and render it as Markdown lines.
+
+    Data is loaded through ``patient_data_cache`` with the agent tools' default
+    windows, so a fast answer and a later agent run share one Vista fetch.
+    Vista errors propagate before any line is produced, so the caller can still
+    fall back to the agent.
+    """
+    if intent is ChatIntent.MEDICATIONS:
+        medications = await patient_data_cache.load_medications(
+            vista_mcp,
+            user_duz=user_duz,
+            patient_icn=patient_icn,
+            station=station,
+            include_pending=True,
+            days_back=DEFAULT_MEDICATION_DAYS_BACK,
+            limit=DEFAULT_PAGE_SIZE,
+            max_pages=DEFAULT_MAX_PAGES,
+        )
+        return _render_medications(medications)
+    if intent is ChatIntent.PROBLEMS:
+        problems = await patient_data_cache.load_problems(
+            vista_mcp,
+            user_duz=user_duz,
+            patient_icn=patient_icn,
+            station=station,
+            days_back=DEFAULT_PROBLEMS_DAYS_BACK,
+            active_only=True,
+            limit=DEFAULT_PAGE_SIZE,
+            max_pages=DEFAULT_MAX_PAGES,
+        )
+        return _render_problems(problems)
+    if intent is ChatIntent.LABS:
+        labs = await patient_data_cache.load_labs(
+            vista_mcp,
+            user_duz=user_duz,
+            patient_icn=patient_icn,
+            station=station,
+            days_back=DEFAULT_LABS_DAYS_BACK,
+            n_most_recent=DEFAULT_N_MOST_RECENT,
+            limit=DEFAULT_PAGE_SIZE,
+            max_pages=DEFAULT_MAX_PAGES,
+        )
+        return _render_series("Recent labs", labs, DEFAULT_LABS_DAYS_BACK)
+    vitals = await patient_data_cache.load_vitals(
+        vista_mcp,
+        user_duz=user_duz,
+        patient_icn=patient_icn,
+        station=station,
+        days_back=DEFAULT_VITALS_DAYS_BACK,
+        n_most_recent=DEFAULT_N_MOST_RECENT,
+        limit=DEFAULT_PAGE_SIZE,
+        max_pages=DEFAULT_MAX_PAGES,
+    )
+    return _render_series("Recent vitals", vitals, DEFAULT_VITALS_DAYS_BACK)
+
+
+def _join(*parts: str | None) -> str:
+    return ", ".join(part for part in parts if part)
+
+
+def _render_medications(medications: list[MedicationRecord]) -> list[str]:
+    days_back = DEFAULT_MEDICATION_DAYS_BACK
+    if not medications:
+        return [f"No medications found in Vista for the last {days_back} days."]
+    lines = [f"**Medications** ({len(medications)}, last {days_back} days)\n"]
+    for medication in medications:
+        details = _join(medication.get("dose"), medication.get("route"))
+        line = f"- **{medication.get('name') or 'Unknown'}**"
+        if details:
+            line += f" — {details}"
+        if medication.get("sig"):
+            line += f"; {medication.get('sig')}"
+        if medication.get("status"):
+            line += f" ({medication.get('status')})"
+        lines.append(line + "\n")
+    return lines
+
+
+def _render_problems(problems: list[ProblemRecord]) -> list[str]:
+    if not problems:
+        return ["No active problems found in Vista."]
+    lines = [f"**Active problems** ({len(problems)})\n"]
+    for problem in problems:
+        line = f"- **{problem.get('name') or 'Unknown'}**"
+        if problem.get("icd_code"):
+            line += f" ({problem.get('icd_code')})"
+        if problem.get("onset"):
+            line += f" — onset {problem.get('onset')}"
+        lines.append(line + "\n")
+    return lines
+
+
+def _render_series(
+    title: str,
+    series: Mapping[str, list[LabObservation]] | Mapping[str, list[VitalObservation]],
+    days_back: int,
+) -> list[str]:
+    if not series:
+        return [f"No {title.lower()} found in Vista for the last {days_back} days."]
+    count = DEFAULT_N_MOST_RECENT
+    lines = [f"**{title}** (last {count} per type, {days_back} days)\n"]
+    for name, observations in series.items():
+        readings = "; ".join(
+            _format_reading(cast("Mapping[str, str | None]", observation))
+            for observation in observations
+        )
+        lines.append(f"- **{name}**: {readings or 'no values'}\n")
+    return lines
+
+
+def _format_reading(observation: Mapping[str, str | None]) -> str:
+    reading = " ".join(
+        part for part in (observation.get("value"), observation.get("units")) if part
+    )
+    if observation.get("date"):
+        reading += f" ({observation.get('date')})"
+    return reading.strip()
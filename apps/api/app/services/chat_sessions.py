@@ -0,0 +1,261 @@
+"""Server-side chat history, bounded by a token budget and idle-session eviction."""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, cast
+
+from ..config import settings
+from .mcp_tool_cache import ToolResultCache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from agents import TResponseInputItem
+
+logger = logging.getLogger(__name__)
+
+# Characters of each question/answer kept when a turn is compacted
+COMPACTED_TEXT_MAX_CHARS = 500
+# The running summary keeps its most recent part once it outgrows this
+SUMMARY_MAX_CHARS = 4000
+
+
+@dataclass(frozen=True)
+class ChatSessionKey:
+    """A conversation is private to the user who started it."""
+
+    owner: str | None
+    conversation_id: str
+
+
+@dataclass
+class ChatSessionStats:
+    """Counters exposed for monitoring session reuse."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    resets: int = 0
+    compacted_turns: int = 0
+    sessions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+def _new_tool_cache() -> ToolResultCache:
+    return ToolResultCache(
+        ttl_seconds=settings.chat_tool_cache_ttl_seconds,
+        max_bytes=settings.chat_tool_cache_max_bytes,
+    )
+
+
+def _estimate_tokens(items: Iterable[TResponseInputItem]) -> int:
+    return len(json.dumps(list(items), default=str)) // 4
+
+
+def _text_of(item: TResponseInputItem) -> str:
+    """Plain text of a user or assistant message item ("" for tool items)."""
+    message = cast("dict[str, object]", item)
+    if message.get("role") not in {"user", "assistant"}:
+        return ""
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = cast("list[dict[str, object]]", content)
+        return "".join(str(part.get("text", "")) for part in parts)
+    return ""
+
+
+def _question_of(turn: list[TResponseInputItem]) -> str:
+    """Text of the user message that started ``turn``."""
+    return next(
+        (
+            _text_of(item)
+            for item in turn
+            if cast("dict[str, object]", item).get("role") == "user"
+        ),
+        "",
+    )
+
+
+def _clip(text: str) -> str:
+    text = " ".join(text.split())
+    if len(text) <= COMPACTED_TEXT_MAX_CHARS:
+        return text
+    return text[: COMPACTED_TEXT_MAX_CHARS - 1] + "…"
+
+
+@dataclass
+class ChatSession:
+    """Prior turns of one conversation, oldest first.
+
+    Each turn holds the agent items it produced (user message, tool calls,
+    tool results and the answer), so a follow-up can reuse earlier tool output.
+    Turns that no longer fit the token budget are folded into ``summary``;
+    raw MCP results stay reusable in ``tool_cache`` until they expire.
+    """
+
+    key: ChatSessionKey
+    patient_icn: str | None
+    turns: list[list[TResponseInputItem]] = field(default_factory=list)
+    summary: str = ""
+    last_used: float = field(default_factory=time.monotonic)
+    tool_cache: ToolResultCache = field(default_factory=_new_tool_cache)
+
+    def history(self, *, exclude_last: bool = False) -> list[TResponseInputItem]:
+        """Input items to send ahead of the next user message.
+
+        ``exclude_last`` leaves out the latest turn, e.g. when it is being
+        regenerated.
+        """
+        items: list[TResponseInputItem] = []
+        if self.summary:
+            items.append(
+                {
+                    "role": "system",
+                    "content": "Summary of earlier turns in this conversation:\n"
+                    + self.summary,
+                }
+            )
+        turns = self.turns[:-1] if exclude_last else self.turns
+        for turn in turns:
+            items.extend(turn)
+        return items
+
+    def repeats_last_turn(self, user_item: TResponseInputItem) -> bool:
+        """Whether ``user_item`` resends the latest turn's question.
+
+        Regenerate and reload requests resend the same last user message; their
+        answer should replace that turn rather than follow it.
+        """
+        if not self.turns:
+            return False
+        return _question_of(self.turns[-1]) == _text_of(user_item)
+
+    def add_turn(
+        self,
+        items: list[TResponseInputItem],
+        *,
+        max_tokens: int,
+        replace_last: bool = False,
+    ) -> int:
+        """Append a turn and compact the oldest ones; returns turns compacted.
+
+        ``replace_last`` drops the latest turn first (see ``repeats_last_turn``).
+        """
+        if replace_last and self.turns:
+            _ = self.turns.pop()
+        self.turns.append(items)
+        compacted = 0
+        while len(self.turns) > 1 and (_estimate_tokens(self.history()) > max_tokens):
+            self._compact(self.turns.pop(0))
+            compacted += 1
+        return compacted
+
+    def _compact(self, turn: list[TResponseInputItem]) -> None:
+        # Tool output of old turns is dropped; the question and answer remain
+        # (without the patient context header the chat service prepends)
+        question = _question_of(turn).rsplit("\n\n", 1)[-1]
+        answer = "".join(
+            _text_of(item)
+            for item in turn
+            if cast("dict[str, object]", item).get("role") == "assistant"
+        )
+        entry = f"- User: {_clip(question)}\n  Assistant: {_clip(answer)}"
+        summary = f"{self.summary}\n{entry}" if self.summary else entry
+        self.summary = summary[-SUMMARY_MAX_CHARS:]
+
+
+class ChatSessionStore:
+    """In-memory LRU of chat sessions that expire after ``ttl_seconds`` idle."""
+
+    _sessions: OrderedDict[ChatSessionKey, ChatSession]
+
+    def __init__(
+        self, *, max_sessions: int, ttl_seconds: float, max_history_tokens: int
+    ) -> None:
+        self._max_sessions = max_sessions
+        self._ttl_seconds = ttl_seconds
+        self.max_history_tokens = max_history_tokens
+        self._sessions = OrderedDict()
+        self._stats = ChatSessionStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_sessions > 0 and self._ttl_seconds > 0
+
+    def get_or_create(
+        self, key: ChatSessionKey, *, patient_icn: str | None
+    ) -> ChatSession:
+        """Return the live session for ``key``, or a new empty one.
+
+        A session started for another patient is discarded, so history never
+        crosses patients.
+        """
+        self._expire()
+        session = self._sessions.get(key)
+        if session is not None and session.patient_icn != patient_icn:
+            del self._sessions[key]
+            self._stats.resets += 1
+            session = None
+        if session is None:
+            self._stats.misses += 1
+            return ChatSession(key=key, patient_icn=patient_icn)
+        self._stats.hits += 1
+        session.last_used = time.monotonic()
+        self._sessions.move_to_end(key)
+        return session
+
+    def save(
+        self,
+        session: ChatSession,
+        turn: list[TResponseInputItem],
+        *,
+        replace_last: bool = False,
+    ) -> None:
+        """Record a finished turn and keep the session as most recently used.
+
+        ``replace_last`` overwrites the latest turn instead of appending, for a
+        regenerated answer.
+        """
+        if not self.enabled:
+            return
+        self._stats.compacted_turns += session.add_turn(
+            turn, max_tokens=self.max_history_tokens, replace_last=replace_last
+        )
+        session.last_used = time.monotonic()
+        self._sessions[session.key] = session
+        self._sessions.move_to_end(session.key)
+        while len(self._sessions) > self._max_sessions:
+            _ = self._sessions.popitem(last=False)
+            self._stats.evictions += 1
+
+    def stats(self) -> ChatSessionStats:
+        """Return a snapshot of the store counters."""
+        self._stats.sessions = len(self._sessions)
+        return ChatSessionStats(**self._stats.as_dict())
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self._ttl_seconds
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if session.last_used > cutoff:
+                break
+            del self._sessions[key]
+            self._stats.expirations += 1
+
+
+# Process-wide session store used by the chat service
+chat_session_store = ChatSessionStore(
+    max_sessions=settings.chat_session_max_sessions,
+    ttl_seconds=settings.chat_session_ttl_seconds,
+    max_history_tokens=settings.chat_session_max_history_tokens,
+)
@@ -1,6 +1,14 @@
 """Vista MCP Server client service."""
 
+import asyncio
+import contextlib
+import contextvars
+import hashlib
 import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
 
 from agents.mcp import MCPServerStreamableHttp, MCPServerStreamableHttpParams
 
@@ -39,68 +47,391 @@ def get_vista_mcp_client(
     )
 
     if requires_new_client:
-        try:
-            logger.info(
-                "Initializing Vista MCP client with URL: %s (timeout=%ds)",
-                settings.vista_mcp_server_url,
-                settings.vista_mcp_timeout_seconds,
-            )
+        new_instance = _build_vista_mcp_client(
+            jwt_token, user_duz=user_duz, station=station
+        )
 
-            params: MCPServerStreamableHttpParams = {
-                "url": settings.vista_mcp_server_url,
-                "timeout": float(settings.vista_mcp_timeout_seconds),
-                "sse_read_timeout": 300.0,
-                "terminate_on_close": True,
-            }
-
-            # Add JWT token and DUZ if provided
-            headers: dict[str, str] = {}
-            if jwt_token:
-                headers["Authorization"] = f"Bearer {jwt_token}"
-                logger.info("Using JWT authentication for MCP client")
-            if user_duz:
-                headers["X-Vista-DUZ"] = user_duz
-                logger.info(f"Using DUZ {user_duz} for MCP client")
-            if station:
-                headers["X-Vista-Station"] = station
-                logger.info(f"Using station {station} for MCP client")
-
-            if headers:
-                safe_headers: dict[str, str] = {}
-                for key, value in headers.items():
-                    if key.lower() == "authorization":
-                        safe_headers[key] = value.split(" ")[0] + " ..."
-                    else:
-                        safe_headers[key] = value
-                logger.info("Vista MCP headers: %s", safe_headers)
-                params["headers"] = headers
-
-            if not jwt_token and not user_duz and not station:
-                logger.info("No JWT token, DUZ, or station provided for MCP client")
-
-            new_instance = MCPServerStreamableHttp(
-                params=params,
-                name="vista-mcp",
-                cache_tools_list=True,
-            )
+        # Only cache global instance if no auth headers are required
+        if not jwt_token and not user_duz and not station:
+            _vista_mcp_instance = new_instance
+
+        return new_instance
+
+    if _vista_mcp_instance is None:
+        raise RuntimeError("Vista MCP client not initialized")
+    return _vista_mcp_instance
+
+
+def _build_vista_mcp_client(
+    jwt_token: str | None,
+    *,
+    user_duz: str | None,
+    station: str | None,
+) -> MCPServerStreamableHttp:
+    """Create a new, unconnected Vista MCP client with the given auth headers."""
+    try:
+        logger.info(
+            "Initializing Vista MCP client with URL: %s (timeout=%ds)",
+            settings.vista_mcp_server_url,
+            settings.vista_mcp_timeout_seconds,
+        )
+
+        params: MCPServerStreamableHttpParams = {
+            "url": settings.vista_mcp_server_url,
+            "timeout": float(settings.vista_mcp_timeout_seconds),
+            "sse_read_timeout": 300.0,
+            "terminate_on_close": True,
+        }
+
+        # Add JWT token and DUZ if provided
+        headers: dict[str, str] = {}
+        if jwt_token:
+            headers["Authorization"] = f"Bearer {jwt_token}"
+            logger.info("Using JWT authentication for MCP client")
+        if user_duz:
+            headers["X-Vista-DUZ"] = user_duz
+            logger.info(f"Using DUZ {user_duz} for MCP client")
+        if station:
+            headers["X-Vista-Station"] = station
+            logger.info(f"Using station {station} for MCP client")
+
+        if headers:
+            safe_headers: dict[str, str] = {}
+            for key, value in headers.items():
+                if key.lower() == "authorization":
+                    safe_headers[key] = value.split(" ")[0] + " ..."
+                else:
+                    safe_headers[key] = value
+            logger.info("Vista MCP headers: %s", safe_headers)
+            params["headers"] = headers
+
+        if not jwt_token and not user_duz and not station:
+            logger.info("No JWT token, DUZ, or station provided for MCP client")
+
+        new_instance = MCPServerStreamableHttp(
+            params=params,
+            name="vista-mcp",
+            cache_tools_list=True,
+        )
+
+        logger.info("Vista MCP client initialized successfully (Streamable HTTP)")
+        return new_instance
 
-            # Only cache global instance if no auth headers are required
-            if not jwt_token and not user_duz and not station:
-                _vista_mcp_instance = new_instance
+    except ImportError as e:
+        logger.error(f"MCP module import error: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error initializing MCP server: {e}")
+        raise
 
-            logger.info("Vista MCP client initialized successfully (Streamable HTTP)")
-            return new_instance
 
-        except ImportError as e:
-            logger.error(f"MCP module import error: {e}")
+@dataclass(frozen=True)
+class VistaSessionKey:
+    """Identity a pooled Vista MCP session is bound to.
+
+    The JWT is stored as a digest so raw tokens never end up in pool state or logs.
+    """
+
+    token_digest: str | None
+    user_duz: str | None
+    station: str | None
+
+    @classmethod
+    def from_credentials(
+        cls,
+        jwt_token: str | None,
+        *,
+        user_duz: str | None,
+        station: str | None,
+    ) -> "VistaSessionKey":
+        digest = (
+            hashlib.sha256(jwt_token.encode("utf-8")).hexdigest() if jwt_token else None
+        )
+        return cls(token_digest=digest, user_duz=user_duz, station=station)
+
+
+class _PooledVistaSession:
+    """A Vista MCP client whose connection lifetime is owned by a background task.
+
+    The MCP transport runs inside anyio task groups that must be exited by the task
+    that entered them, so connect and cleanup both happen in ``_own`` rather than in
+    whichever request happened to open or evict the session.
+    """
+
+    def __init__(
+        self,
+        key: VistaSessionKey,
+        server: MCPServerStreamableHttp,
+        *,
+        pooled: bool,
+    ) -> None:
+        self.key: VistaSessionKey = key
+        self.server: MCPServerStreamableHttp = server
+        self.pooled: bool = pooled
+        self.leases: int = 0
+        self.last_used: float = time.monotonic()
+        self.last_checked: float = self.last_used
+        self._ready: asyncio.Future[None] | None = None
+        self._closing: asyncio.Event = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_alive(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self.server.session is not None
+        )
+
+    async def open(self) -> None:
+        self._ready = asyncio.get_running_loop().create_future()
+        # Run the owner task in a fresh context so request-scoped context variables
+        # (tracing spans, etc.) do not leak into a connection that outlives them.
+        self._task = asyncio.create_task(
+            self._own(), name="vista-mcp-session", context=contextvars.Context()
+        )
+        try:
+            await asyncio.shield(self._ready)
+        except BaseException:
+            await self.close()
             raise
+
+    async def close(self) -> None:
+        self._closing.set()
+        task = self._task
+        if task is None:
+            return
+        if self._ready is not None and not self._ready.done():
+            _ = task.cancel()
+        _ = await asyncio.wait({task})
+
+    async def ping(self, timeout_seconds: float) -> bool:
+        session = self.server.session
+        if not self.is_alive or session is None:
+            return False
+        try:
+            async with asyncio.timeout(timeout_seconds):
+                _ = await session.send_ping()
+        except Exception as e:
+            logger.warning(f"Vista MCP session health check failed: {e}")
+            return False
+        self.last_checked = time.monotonic()
+        return True
+
+    async def _own(self) -> None:
+        ready = self._ready
+        assert ready is not None
+        try:
+            await self.server.connect()
+        except asyncio.CancelledError:
+            _ = ready.cancel()
+            return
         except Exception as e:
-            logger.error(f"Unexpected error initializing MCP server: {e}")
+            if not ready.done():
+                ready.set_exception(e)
+            return
+        ready.set_result(None)
+        try:
+            _ = await self._closing.wait()
+        finally:
+            with contextlib.suppress(Exception):
+                await self.server.cleanup()
+
+
+class VistaMCPSessionPool:
+    """Reuse connected Vista MCP sessions across requests.
+
+    Sessions are keyed by JWT identity, DUZ and station so a lease never carries
+    another user's Vista credentials. Concurrent leases of the same key share one
+    session (MCP multiplexes requests over a session); only the first caller pays
+    the connect handshake and tool-list fetch.
+    """
+
+    _sessions: OrderedDict[VistaSessionKey, _PooledVistaSession]
+    _key_locks: dict[VistaSessionKey, asyncio.Lock]
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        idle_timeout_seconds: float,
+        health_check_interval_seconds: float,
+        health_check_timeout_seconds: float = 5.0,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+
+        self._max_size = max_size
+        self._idle_timeout_seconds = idle_timeout_seconds
+        self._health_check_interval_seconds = health_check_interval_seconds
+        self._health_check_timeout_seconds = health_check_timeout_seconds
+        self._sessions = OrderedDict()
+        self._key_locks = {}
+
+    @property
+    def size(self) -> int:
+        """Number of sessions currently held by the pool."""
+        return len(self._sessions)
+
+    @contextlib.asynccontextmanager
+    async def lease(
+        self,
+        jwt_token: str | None = None,
+        *,
+        user_duz: str | None = None,
+        station: str | None = None,
+    ) -> AsyncGenerator[MCPServerStreamableHttp]:
+        """Lease a connected Vista MCP client for the given credentials.
+
+        The client must not be cleaned up by the caller; it is returned to the pool
+        when the context exits.
+        """
+        key = VistaSessionKey.from_credentials(
+            jwt_token, user_duz=user_duz, station=station
+        )
+        entry = await self._acquire(key, jwt_token, user_duz=user_duz, station=station)
+        failed = False
+        try:
+            yield entry.server
+        except Exception:
+            failed = True
             raise
+        finally:
+            await self._release(entry, failed=failed)
 
-    if _vista_mcp_instance is None:
-        raise RuntimeError("Vista MCP client not initialized")
-    return _vista_mcp_instance
+    async def close(self) -> None:
+        """Close every pooled session (used on application shutdown)."""
+        entries = list(self._sessions.values())
+        self._sessions.clear()
+        self._key_locks.clear()
+        for entry in entries:
+            await entry.close()
+
+    async def _acquire(
+        self,
+        key: VistaSessionKey,
+        jwt_token: str | None,
+        *,
+        user_duz: str | None,
+        station: str | None,
+    ) -> _PooledVistaSession:
+        await self._evict_idle()
+
+        lock = self._key_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._sessions.get(key)
+            if entry is not None and not await self._is_healthy(entry):
+                logger.info("Discarding unhealthy pooled Vista MCP session")
+                _ = self._sessions.pop(key, None)
+                await entry.close()
+                entry = None
+
+            if entry is None:
+                return await self._open(
+                    key, jwt_token, user_duz=user_duz, station=station
+                )
+
+            self._sessions.move_to_end(key)
+            entry.leases += 1
+            return entry
+
+    async def _release(self, entry: _PooledVistaSession, *, failed: bool) -> None:
+        entry.leases -= 1
+        entry.last_used = time.monotonic()
+        if failed:
+            # Force a ping before the next lease; the failure may have been transport
+            # level rather than a tool error.
+            entry.last_checked = 0.0
+
+        if entry.leases == 0 and self._sessions.get(entry.key) is not entry:
+            await entry.close()
+
+    async def _is_healthy(self, entry: _PooledVistaSession) -> bool:
+        if not entry.is_alive:
+            return False
+        if entry.leases > 0:
+            # Already in use by a concurrent request; it was checked when leased.
+            return True
+        since_check = time.monotonic() - entry.last_checked
+        if since_check < self._health_check_interval_seconds:
+            return True
+        return await entry.ping(self._health_check_timeout_seconds)
+
+    async def _open(
+        self,
+        key: VistaSessionKey,
+        jwt_token: str | None,
+        *,
+        user_duz: str | None,
+        station: str | None,
+    ) -> _PooledVistaSession:
+        evicted = self._make_room()
+        pooled = len(self._sessions) < self._max_size
+        if not pooled:
+            logger.warning(
+                "Vista MCP session pool exhausted (%d in use); "
+                "opening an unpooled session",
+                self._max_size,
+            )
+
+        server = _build_vista_mcp_client(jwt_token, user_duz=user_duz, station=station)
+        entry = _PooledVistaSession(key, server, pooled=pooled)
+        # Hold the lease while connecting so eviction never closes a session that
+        # is still opening.
+        entry.leases = 1
+        if pooled:
+            self._sessions[key] = entry
+
+        for stale in evicted:
+            await stale.close()
+
+        try:
+            await entry.open()
+        except BaseException:
+            if self._sessions.get(key) is entry:
+                del self._sessions[key]
+            raise
+        return entry
+
+    def _make_room(self) -> list[_PooledVistaSession]:
+        """Detach least recently used idle sessions until there is a free slot."""
+        evicted: list[_PooledVistaSession] = []
+        if len(self._sessions) < self._max_size:
+            return evicted
+        for key, entry in list(self._sessions.items()):
+            if entry.leases == 0:
+                del self._sessions[key]
+                evicted.append(entry)
+                if len(self._sessions) < self._max_size:
+                    break
+        return evicted
+
+    async def _evict_idle(self) -> None:
+        now = time.monotonic()
+        expired = [
+            (key, entry)
+            for key, entry in self._sessions.items()
+            if entry.leases == 0
+            and (
+                now - entry.last_used >= self._idle_timeout_seconds
+                or not entry.is_alive
+            )
+        ]
+        for key, _ in expired:
+            del self._sessions[key]
+        for key in list(self._key_locks):
+            if key not in self._sessions and not self._key_locks[key].locked():
+                del self._key_locks[key]
+        for _, entry in expired:
+            await entry.close()
+
+
+# Process-wide pool of connected Vista MCP sessions
+vista_mcp_pool = VistaMCPSessionPool(
+    max_size=settings.vista_mcp_pool_max_size,
+    idle_timeout_seconds=settings.vista_mcp_pool_idle_timeout_seconds,
+    health_check_interval_seconds=settings.vista_mcp_pool_health_check_interval_seconds,
+)
 
 
 # The global MCP client instance is managed by _vista_mcp_instance
@@ -0,0 +1,122 @@
+"""Conversation-scoped cache of MCP tool results."""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, override
+
+from .mcp_wrappers import DelegatingMCPServer
+
+if TYPE_CHECKING:
+    from agents.mcp import MCPServer
+    from mcp.types import CallToolResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ToolResultCacheStats:
+    """Counters exposed for monitoring tool result reuse (all conversations)."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+# Shared by every conversation's cache
+tool_result_cache_stats = ToolResultCacheStats()
+
+
+@dataclass
+class _Entry:
+    result: CallToolResult
+    expires_at: float
+    size_bytes: int
+
+
+class ToolResultCache:
+    """TTL + LRU cache of one conversation's tool results, bounded in bytes.
+
+    Cached results are shared between turns and must be treated as read-only.
+    """
+
+    _entries: OrderedDict[tuple[str, str], _Entry]
+
+    def __init__(self, *, ttl_seconds: float, max_bytes: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.size_bytes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0 and self._max_bytes > 0
+
+    def get(self, key: tuple[str, str]) -> CallToolResult | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            tool_result_cache_stats.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            tool_result_cache_stats.expirations += 1
+            tool_result_cache_stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        tool_result_cache_stats.hits += 1
+        return entry.result
+
+    def set(self, key: tuple[str, str], result: CallToolResult) -> None:
+        if not self.enabled:
+            return
+        size_bytes = len(result.model_dump_json())
+        if size_bytes > self._max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(
+            result=result,
+            expires_at=time.monotonic() + self._ttl_seconds,
+            size_bytes=size_bytes,
+        )
+        self.size_bytes += size_bytes
+        while self.size_bytes > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+            tool_result_cache_stats.evictions += 1
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        self.size_bytes -= self._entries.pop(key).size_bytes
+
+
+class CachingMCPServer(DelegatingMCPServer):
+    """Serve repeated tool calls (same name and arguments) from ``cache``.
+
+    Only successful results are cached; errors are always retried.
+    """
+
+    def __init__(self, server: MCPServer, cache: ToolResultCache) -> None:
+        super().__init__(server)
+        self._cache = cache
+
+    @override
+    async def call_tool(
+        self, tool_name: str, arguments: dict[str, Any] | None
+    ) -> CallToolResult:
+        key = (tool_name, json.dumps(arguments or {}, sort_keys=True, default=str))
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.info("Reusing %s result from earlier in the conversation", tool_name)
+            return cached
+
+        result = await self._server.call_tool(tool_name, arguments)
+        if not result.isError:
+            self._cache.set(key, result)
+        return result
@@ -0,0 +1,152 @@
+"""Expose only the MCP tools relevant to a chat message."""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Any, override
+
+from .mcp_wrappers import DelegatingMCPServer
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from agents import AgentBase, RunContextWrapper
+    from agents.mcp import MCPServer
+    from mcp.types import Tool as MCPTool
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# Clinical shorthand users type that rarely appears in tool descriptions
+_ALIASES = {
+    "med": "medication",
+    "rx": "medication",
+    "prescription": "medication",
+    "drug": "medication",
+    "bp": "vital",
+    "pulse": "vital",
+    "weight": "vital",
+    "temperature": "vital",
+    "dx": "problem",
+    "diagnosis": "problem",
+    "diagnose": "problem",
+    "condition": "problem",
+    "appointment": "visit",
+    "encounter": "visit",
+}
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+# Tool lists change rarely; keep indexes for the last few distinct lists
+_MAX_CACHED_INDEXES = 8
+
+
+def _stem(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "is", "us")):
+        return word[:-1]
+    return word
+
+
+def _terms(text: str) -> list[str]:
+    """Lower-cased word stems, splitting snake_case and camelCase identifiers."""
+    stems = (_stem(word.lower()) for word in _WORD.findall(text))
+    return [_ALIASES.get(stem, stem) for stem in stems]
+
+
+class ToolIndex:
+    """BM25 index over MCP tool names and descriptions."""
+
+    def __init__(self, tools: Sequence[MCPTool]) -> None:
+        self.tools = list(tools)
+        self._documents = [
+            # Name words count twice: they are the strongest signal
+            Counter(_terms(tool.name) * 2 + _terms(tool.description or ""))
+            for tool in self.tools
+        ]
+        self._lengths = [sum(document.values()) for document in self._documents]
+        self._average_length = sum(self._lengths) / max(len(self._lengths), 1) or 1.0
+        frequencies = Counter(term for document in self._documents for term in document)
+        count = len(self.tools)
+        self._idf = {
+            term: math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in frequencies.items()
+        }
+
+    def rank(self, query: str, top_k: int) -> list[MCPTool]:
+        """Return the ``top_k`` best-matching tools in their original order.
+
+        All tools are returned when nothing in the query matches any of them.
+        """
+        if top_k <= 0 or top_k >= len(self.tools):
+            return self.tools
+        terms = set(_terms(query))
+        scores = [self._score(index, terms) for index in range(len(self.tools))]
+        if not any(scores):
+            return self.tools
+        best = sorted(range(len(self.tools)), key=lambda i: (-scores[i], i))[:top_k]
+        return [self.tools[index] for index in sorted(best)]
+
+    def _score(self, index: int, terms: set[str]) -> float:
+        document = self._documents[index]
+        norm = _K1 * (1 - _B + _B * self._lengths[index] / self._average_length)
+        score = 0.0
+        for term in terms:
+            frequency = document.get(term, 0)
+            if frequency:
+                score += self._idf[term] * frequency * (_K1 + 1) / (frequency + norm)
+        return score
+
+
+_indexes: OrderedDict[tuple[tuple[str, str], ...], ToolIndex] = OrderedDict()
+
+
+def get_tool_index(tools: Sequence[MCPTool]) -> ToolIndex:
+    """Return a (cached) index for this exact tool list."""
+    key = tuple((tool.name, tool.description or "") for tool in tools)
+    index = _indexes.get(key)
+    if index is None:
+        index = ToolIndex(tools)
+        _indexes[key] = index
+        while len(_indexes) > _MAX_CACHED_INDEXES:
+            _ = _indexes.popitem(last=False)
+    else:
+        _indexes.move_to_end(key)
+    return index
+
+
+class RelevantToolsMCPServer(DelegatingMCPServer):
+    """Wrap an MCP server so ``list_tools`` returns only the top-k for a query.
+
+    Everything else is delegated, so tool calls still go to the wrapped
+    server's session.
+    """
+
+    def __init__(self, server: MCPServer, *, query: str, top_k: int) -> None:
+        super().__init__(server)
+        self._query = query
+        self._top_k = top_k
+
+    @override
+    async def list_tools(
+        self,
+        run_context: RunContextWrapper[Any] | None = None,
+        agent: AgentBase | None = None,
+    ) -> list[MCPTool]:
+        tools = await self._server.list_tools(run_context, agent)
+        selected = get_tool_index(tools).rank(self._query, self._top_k)
+        logger.info(
+            "Exposing %d of %d %s tools: %s",
+            len(selected),
+            len(tools),
+            self.name,
+            ", ".join(tool.name for tool in selected),
+        )
+        return selected
@@ -0,0 +1,57 @@
+"""Base class for MCP servers that wrap another server's session."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, override
+
+from agents.mcp import MCPServer
+
+if TYPE_CHECKING:
+    from agents import AgentBase, RunContextWrapper
+    from mcp.types import CallToolResult, GetPromptResult, ListPromptsResult
+    from mcp.types import Tool as MCPTool
+
+
+class DelegatingMCPServer(MCPServer):
+    """Forward every call to ``server``; subclasses override what they change."""
+
+    def __init__(self, server: MCPServer) -> None:
+        super().__init__(use_structured_content=server.use_structured_content)
+        self._server = server
+
+    @property
+    @override
+    def name(self) -> str:
+        return self._server.name
+
+    @override
+    async def connect(self) -> None:
+        await self._server.connect()
+
+    @override
+    async def cleanup(self) -> None:
+        await self._server.cleanup()
+
+    @override
+    async def list_tools(
+        self,
+        run_context: RunContextWrapper[Any] | None = None,
+        agent: AgentBase | None = None,
+    ) -> list[MCPTool]:
+        return await self._server.list_tools(run_context, agent)
+
+    @override
+    async def call_tool(
+        self, tool_name: str, arguments: dict[str, Any] | None
+    ) -> CallToolResult:
+        return await self._server.call_tool(tool_name, arguments)
+
+    @override
+    async def list_prompts(self) -> ListPromptsResult:
+        return await self._server.list_prompts()
+
+    @override
+    async def get_prompt(
+        self, name: str, arguments: dict[str, Any] | None = None
+    ) -> GetPromptResult:
+        return await self._server.get_prompt(name, arguments)
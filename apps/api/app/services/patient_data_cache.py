@@ -0,0 +1,335 @@
+"""Process-wide cache for normalized Vista patient data."""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, cast
+
+from ..config import settings
+from . import vista_tools
+from .single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from agents.mcp import MCPServerStreamableHttp
+
+    from .vista_tools import (
+        LabObservation,
+        MedicationRecord,
+        ProblemRecord,
+        VitalObservation,
+    )
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PatientDataKey:
+    """Cache key for one normalized ``vista_tools.fetch_*`` result.
+
+    ``user_duz`` is part of the key so a result fetched under one clinician's Vista
+    authorization is never served to another.
+    """
+
+    user_duz: str | None
+    station: str | None
+    patient_icn: str
+    tool: str
+    args: tuple[object, ...]
+
+
+@dataclass
+class PatientDataCacheStats:
+    """Counters exposed for monitoring cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    coalesced: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class _Entry:
+    value: object
+    expires_at: float
+    size_bytes: int
+
+
+class PatientDataCache:
+    """TTL + LRU cache bounded by entry count and approximate payload size.
+
+    Cached values are shared between requests and must be treated as read-only.
+    """
+
+    _entries: OrderedDict[PatientDataKey, _Entry]
+    _stats: PatientDataCacheStats
+    _loads: SingleFlight[PatientDataKey, object]
+
+    def __init__(self, *, ttl_seconds: float, max_entries: int, max_bytes: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._stats = PatientDataCacheStats()
+        self._loads = SingleFlight()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0 and self._max_entries > 0 and self._max_bytes > 0
+
+    def get(self, key: PatientDataKey) -> object | None:
+        """Return the cached value for ``key`` or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return entry.value
+
+    def set(self, key: PatientDataKey, value: object) -> None:
+        """Store ``value`` unless the cache is disabled or it exceeds the size cap."""
+        if not self.enabled:
+            return
+
+        size_bytes = _estimate_size(value)
+        if size_bytes > self._max_bytes:
+            logger.debug(
+                "Skipping patient data cache for %s (%d bytes)", key.tool, size_bytes
+            )
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(
+            value=value,
+            expires_at=time.monotonic() + self._ttl_seconds,
+            size_bytes=size_bytes,
+        )
+        self._stats.size_bytes += size_bytes
+        self._evict_overflow()
+
+    async def get_or_load[T](
+        self, key: PatientDataKey, loader: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Return the cached value for ``key``, loading and storing it on a miss.
+
+        Concurrent misses for the same key share a single load.
+        """
+        if self.enabled:
+            cached = self.get(key)
+            if cached is not None:
+                return cast("T", cached)
+
+        async def _load() -> object:
+            value = await loader()
+            self.set(key, value)
+            return value
+
+        return cast("T", await self._loads.do(key, _load))
+
+    def invalidate(self, *, patient_icn: str, station: str | None = None) -> int:
+        """Drop every cached result for a patient (optionally one station only)."""
+        keys = [
+            key
+            for key in self._entries
+            if key.patient_icn == patient_icn
+            and (station is None or key.station == station)
+        ]
+        for key in keys:
+            self._remove(key)
+        self._stats.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self._stats.invalidations += len(self._entries)
+        self._entries.clear()
+        self._stats.size_bytes = 0
+
+    def stats(self) -> PatientDataCacheStats:
+        """Return a snapshot of the cache counters."""
+        self._stats.entries = len(self._entries)
+        self._stats.coalesced = self._loads.coalesced
+        return PatientDataCacheStats(**self._stats.as_dict())
+
+    def _remove(self, key: PatientDataKey) -> None:
+        entry = self._entries.pop(key)
+        self._stats.size_bytes -= entry.size_bytes
+
+    def _evict_overflow(self) -> None:
+        while self._entries and (
+            len(self._entries) > self._max_entries
+            or self._stats.size_bytes > self._max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats.evictions += 1
+
+
+def _estimate_size(value: object) -> int:
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+# Process-wide cache shared by all medication summary runs
+patient_data_cache = PatientDataCache(
+    ttl_seconds=settings.patient_data_cache_ttl_seconds,
+    max_entries=settings.patient_data_cache_max_entries,
+    max_bytes=settings.patient_data_cache_max_bytes,
+)
+
+
+# Cached front ends for ``vista_tools.fetch_*``; every caller that has the
+# clinician's DUZ should go through these so results are shared across features.
+
+
+async def load_medications(
+    vista_mcp: MCPServerStreamableHttp,
+    *,
+    user_duz: str | None,
+    patient_icn: str,
+    station: str | None,
+    include_pending: bool,
+    days_back: int,
+    limit: int,
+    max_pages: int,
+) -> list[MedicationRecord]:
+    """``vista_tools.fetch_medications`` served from ``patient_data_cache``."""
+    key = PatientDataKey(
+        user_duz=user_duz,
+        station=station,
+        patient_icn=patient_icn,
+        tool="fetch_medications",
+        args=(include_pending, days_back, limit, max_pages),
+    )
+    return await patient_data_cache.get_or_load(
+        key,
+        lambda: vista_tools.fetch_medications(
+            vista_mcp,
+            patient_icn=patient_icn,
+            station=station,
+            include_pending=include_pending,
+            days_back=days_back,
+            limit=limit,
+            max_pages=max_pages,
+        ),
+    )
+
+
+async def load_problems(
+    vista_mcp: MCPServerStreamableHttp,
+    *,
+    user_duz: str | None,
+    patient_icn: str,
+    station: str | None,
+    active_only: bool,
+    days_back: int,
+    limit: int,
+    max_pages: int,
+) -> list[ProblemRecord]:
+    """``vista_tools.fetch_problems`` served from ``patient_data_cache``."""
+    key = PatientDataKey(
+        user_duz=user_duz,
+        station=station,
+        patient_icn=patient_icn,
+        tool="fetch_problems",
+        args=(active_only, days_back, limit, max_pages),
+    )
+    return await patient_data_cache.get_or_load(
+        key,
+        lambda: vista_tools.fetch_problems(
+            vista_mcp,
+            patient_icn=patient_icn,
+            station=station,
+            days_back=days_back,
+            active_only=active_only,
+            limit=limit,
+            max_pages=max_pages,
+        ),
+    )
+
+
+async def load_labs(
+    vista_mcp: MCPServerStreamableHttp,
+    *,
+    user_duz: str | None,
+    patient_icn: str,
+    station: str | None,
+    days_back: int,
+    n_most_recent: int,
+    limit: int,
+    max_pages: int,
+) -> dict[str, list[LabObservation]]:
+    """``vista_tools.fetch_labs`` served from ``patient_data_cache``."""
+    key = PatientDataKey(
+        user_duz=user_duz,
+        station=station,
+        patient_icn=patient_icn,
+        tool="fetch_labs",
+        args=(days_back, n_most_recent, limit, max_pages),
+    )
+    return await patient_data_cache.get_or_load(
+        key,
+        lambda: vista_tools.fetch_labs(
+            vista_mcp,
+            patient_icn=patient_icn,
+            station=station,
+            days_back=days_back,
+            n_most_recent=n_most_recent,
+            limit=limit,
+            max_pages=max_pages,
+        ),
+    )
+
+
+async def load_vitals(
+    vista_mcp: MCPServerStreamableHttp,
+    *,
+    user_duz: str | None,
+    patient_icn: str,
+    station: str | None,
+    days_back: int,
+    n_most_recent: int,
+    limit: int,
+    max_pages: int,
+) -> dict[str, list[VitalObservation]]:
+    """``vista_tools.fetch_vitals`` served from ``patient_data_cache``."""
+    key = PatientDataKey(
+        user_duz=user_duz,
+        station=station,
+        patient_icn=patient_icn,
+        tool="fetch_vitals",
+        args=(days_back, n_most_recent, limit, max_pages),
+    )
+    return await patient_data_cache.get_or_load(
+        key,
+        lambda: vista_tools.fetch_vitals(
+            vista_mcp,
+            patient_icn=patient_icn,
+            station=station,
+            days_back=days_back,
+            n_most_recent=n_most_recent,
+            limit=limit,
+            max_pages=max_pages,
+        ),
+    )
@@ -0,0 +1,69 @@
+"""Coalesce identical concurrent async calls into one in-flight execution."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+@dataclass
+class _Call[V]:
+    task: asyncio.Future[V]
+    waiters: int = 0
+
+
+class SingleFlight[K: Hashable, V]:
+    """Share one execution between concurrent callers using the same key.
+
+    The work runs in its own task, so a caller that is cancelled does not abort it
+    for the others; it is only cancelled once every waiting caller has gone away.
+    Results and exceptions are delivered to every waiter. Nothing is cached after
+    the call completes.
+    """
+
+    _calls: dict[K, _Call[V]]
+
+    def __init__(self) -> None:
+        self._calls = {}
+        self.coalesced: int = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct keys currently executing."""
+        return len(self._calls)
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        """Run ``fn`` for ``key`` or join an identical call already in flight."""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(task=asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(functools.partial(self._forget, key, call))
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                # Last interested caller left: stop the shared work and make sure
+                # later callers start a fresh execution instead of joining it.
+                self._forget(key, call)
+                _ = call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: K, call: _Call[V], _task: object = None) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if call.task.done() and not call.task.cancelled():
+            # Mark the outcome as retrieved even if every waiter was cancelled
+            _ = call.task.exception()
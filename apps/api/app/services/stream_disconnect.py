@@ -0,0 +1,96 @@
+"""Stop streaming work once the HTTP client has gone away."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterator
+
+    from starlette.requests import Request
+
+logger = logging.getLogger(__name__)
+
+# Chunks a stream may run ahead of a slow client before it is paused
+MAX_BUFFERED_CHUNKS = 64
+
+
+@dataclass
+class StreamStats:
+    """Counters exposed for monitoring streams the client did not wait for."""
+
+    started: int = 0
+    completed: int = 0
+    abandoned: int = 0
+    active: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+# Process-wide counters per streaming endpoint
+chat_stream_stats = StreamStats()
+summary_stream_stats = StreamStats()
+
+
+async def cancel_on_disconnect(
+    request: Request,
+    stream: AsyncIterator[str],
+    *,
+    stats: StreamStats,
+    poll_interval: float,
+) -> AsyncGenerator[str]:
+    """Yield from ``stream`` until it ends or the client disconnects.
+
+    ``stream`` is consumed by a separate task that is cancelled as soon as the
+    client is gone (or this generator is closed), so the work behind it unwinds
+    mid-await instead of at its next chunk: agent runs stop, and rate limiter
+    slots and MCP leases held in ``async with`` blocks are released. At most
+    ``MAX_BUFFERED_CHUNKS`` are buffered; beyond that ``stream`` waits for the
+    client to catch up.
+    """
+    queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=MAX_BUFFERED_CHUNKS)
+
+    async def produce() -> None:
+        try:
+            async for chunk in stream:
+                await queue.put(chunk)
+        finally:
+            # Once cancelled there is no reader left to wait for the end marker
+            task = asyncio.current_task()
+            if task is None or not task.cancelling():
+                await queue.put(None)
+
+    stats.started += 1
+    stats.active += 1
+    producer = asyncio.create_task(produce())
+    finished = False
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(queue.get(), poll_interval)
+            except TimeoutError:
+                if await request.is_disconnected():
+                    logger.info("Client disconnected, cancelling %s", request.url.path)
+                    return
+                continue
+            if chunk is None:
+                finished = True
+                await producer  # re-raises a failure of the stream
+                return
+            yield chunk
+    finally:
+        stats.active -= 1
+        if finished:
+            stats.completed += 1
+        else:
+            stats.abandoned += 1
+            _ = producer.cancel()
+            # Wait for the unwinding (unless this task is itself being
+            # cancelled); errors past this point have nobody to go to
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await producer
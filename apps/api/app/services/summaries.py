@@ -2,48 +2,240 @@
 
 from __future__ import annotations
 
-import contextlib
+import asyncio
+import functools
 import json
 import logging
 import re
+from dataclasses import replace
 from enum import Enum
 from typing import TYPE_CHECKING, TypeVar, cast
 
-from agents import RunConfig, Runner, RunResult
+from agents import ItemHelpers, RunConfig, Runner, RunResult
+from agents.exceptions import ModelBehaviorError
 from fastapi import HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 from ..agents import (
     MedicationRunContext,
     build_medication_enrichment_agent,
     build_medication_grouping_agent,
     build_medication_tools,
+    prefetch_medication_data,
 )
+from ..agents.medication_enrichment import PROMPT_PATH as ENRICHMENT_PROMPT_PATH
+from ..agents.medication_grouping import PROMPT_PATH as GROUPING_PROMPT_PATH
 from ..config import settings
 from ..models.summaries import (
+    MedicationGroup,
     MedicationGroupingOutput,
     MedicationSummary,
     MedicationSummaryResponse,
     SummariesRequest,
+    SummaryCompleteEvent,
+    SummaryGroupEvent,
+    SummaryProgressEvent,
+)
+from .azure_openai_router import RoutedChatCompletionsModel
+from .azure_rate_limiter import (
+    AzureRateLimiter,
+    RequestPriority,
+    azure_rate_limiter,
+)
+from .mcp_client import vista_mcp_pool
+from .summary_cache import content_key, summary_cache
+from .summary_incremental import (
+    merge_regrouped_groups,
+    plan_incremental_update,
+    renumber_groups,
 )
-from .azure_openai import create_azure_openai_client
-from .azure_rate_limiter import AzureRateLimiter
-from .mcp_client import get_vista_mcp_client
 
 if TYPE_CHECKING:
-    from agents import Agent
+    from collections.abc import AsyncGenerator, Awaitable, Callable, Sequence
+
+    from agents import Agent, FunctionTool, TResponseInputItem
+    from agents.mcp import MCPServerStreamableHttp
 
+    from ..agents import MedicationPrefetch
     from ..dependencies.context import RequestContext
+    from ..models.summaries import SummaryStreamEvent
+
+    SummaryEventHandler = Callable[[SummaryStreamEvent], Awaitable[None]]
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
 
+OUTPUT_REPAIR_PROMPT = (
+    "Your final answer did not match the required output schema:\n{error}\n\n"
+    "Reply again with only the corrected JSON object. Do not call any tools."
+)
+OUTPUT_REPAIR_ERROR_MAX_CHARS = 20_000
+
+_PREFETCH_KEYS = {"medications", "problems", "labs", "vitals"}
+
 JSON_CONTENT_MATCH_PATTERN = re.compile(
     r"(?:\s*```json\s*)?(.*?)(?:\s*```\s*)?$", re.DOTALL
 )
 
 
+def _cascade_models(fast_model: str, model: str) -> list[str | None]:
+    """Models to try for a stage, in order; None means the default deployment."""
+    final_model = model or None
+    if fast_model and fast_model != model:
+        return [fast_model, final_model]
+    return [final_model]
+
+
+@functools.cache
+def _pipeline_version() -> str:
+    """Hash of everything besides the input data that shapes a summary."""
+    return content_key(
+        GROUPING_PROMPT_PATH.read_text(encoding="utf-8"),
+        ENRICHMENT_PROMPT_PATH.read_text(encoding="utf-8"),
+        MedicationSummary.model_json_schema(),
+        settings.azure_openai_deployment_name,
+        settings.summary_grouping_model,
+        settings.summary_grouping_fast_model,
+        settings.summary_enrichment_model,
+        settings.summary_enrichment_fast_model,
+        settings.summary_structured_outputs,
+        settings.summary_enrichment_batch_size,
+        settings.summary_stream_batch_size,
+        settings.summary_prefetch_enabled,
+    )
+
+
+async def _load_cached_summary(cache_key: str) -> MedicationSummary | None:
+    cached = await summary_cache.get(cache_key)
+    if cached is None:
+        return None
+    try:
+        return MedicationSummary.model_validate(cached.get("summary"))
+    except ValidationError:
+        logger.warning("Ignoring unreadable cached summary %s", cache_key)
+        return None
+
+
+async def _load_baseline(
+    baseline_key: str,
+) -> tuple[MedicationPrefetch, MedicationSummary] | None:
+    """Return the data and summary from a patient's last summary run, if stored."""
+    cached = await summary_cache.get(baseline_key)
+    if cached is None:
+        return None
+    data = cached.get("data")
+    if not isinstance(data, dict) or not data.keys() >= _PREFETCH_KEYS:
+        return None
+    try:
+        summary = MedicationSummary.model_validate(cached.get("summary"))
+    except ValidationError:
+        logger.warning("Ignoring unreadable summary baseline %s", baseline_key)
+        return None
+    return cast("MedicationPrefetch", data), summary
+
+
+def _grouping_agents(
+    tools: dict[str, FunctionTool],
+) -> list[Agent[MedicationRunContext]]:
+    return [
+        build_medication_grouping_agent(
+            tools=[
+                tools["fetch_medications"],
+                tools["fetch_problems"],
+            ],
+            model_name=model_name,
+        )
+        for model_name in _cascade_models(
+            settings.summary_grouping_fast_model,
+            settings.summary_grouping_model,
+        )
+    ]
+
+
+def _enrichment_agents(
+    tools: dict[str, FunctionTool],
+) -> list[Agent[MedicationRunContext]]:
+    return [
+        build_medication_enrichment_agent(
+            tools=[
+                tools["fetch_labs"],
+                tools["fetch_vitals"],
+            ],
+            model_name=model_name,
+        )
+        for model_name in _cascade_models(
+            settings.summary_enrichment_fast_model,
+            settings.summary_enrichment_model,
+        )
+    ]
+
+
+async def _emit(
+    on_event: SummaryEventHandler | None, event: SummaryStreamEvent
+) -> None:
+    if on_event is not None:
+        await on_event(event)
+
+
+async def _emit_groups(
+    on_event: SummaryEventHandler | None, groups: Sequence[MedicationGroup]
+) -> None:
+    for group in groups:
+        await _emit(on_event, SummaryGroupEvent(group=group))
+
+
+def _medication_set(group: MedicationGroup) -> frozenset[str]:
+    return frozenset(" ".join(item.name.lower().split()) for item in group.medications)
+
+
+def _restore_group_numbers(
+    enriched: Sequence[MedicationGroup], originals: Sequence[MedicationGroup]
+) -> None:
+    """Give each enriched group the grouping stage's number for it.
+
+    Groups are matched by their medication set (and indication when two groups
+    share one), since batched runs number from 1. Output that does not map one
+    to one onto ``originals`` is rejected so the stage escalates or fails.
+    """
+    remaining = list(originals)
+    for group in enriched:
+        candidates = [
+            o for o in remaining if _medication_set(o) == _medication_set(group)
+        ]
+        if len(candidates) > 1:
+            indication = group.treatment_indication.strip().lower()
+            candidates = [
+                o
+                for o in candidates
+                if o.treatment_indication.strip().lower() == indication
+            ] or candidates
+        if not candidates:
+            logger.warning(
+                "Enriched group %r matches no input group", group.treatment_indication
+            )
+            raise HTTPException(
+                status_code=500,
+                detail="Agent run did not return the expected structured output.",
+            )
+        remaining.remove(candidates[0])
+        group.group_number = candidates[0].group_number
+    if remaining:
+        logger.warning(
+            "Enrichment dropped %d of %d medication groups",
+            len(remaining),
+            len(originals),
+        )
+        raise HTTPException(
+            status_code=500,
+            detail="Agent run did not return the expected structured output.",
+        )
+
+
+def _model_name(agent: Agent[MedicationRunContext]) -> str:
+    return str(getattr(agent.model, "model_name", agent.model))
+
+
 def extract_json_content(text: str) -> str:
     """Extract JSON content, handling optional markdown code blocks."""
     input = text.strip()
@@ -65,12 +257,7 @@ class SummariesService:
         MEDICATION = "medication"
 
     def __init__(self) -> None:
-        self._rate_limiter = AzureRateLimiter(
-            max_concurrency=settings.azure_openai_max_concurrency,
-            max_attempts=settings.azure_openai_rate_limit_max_attempts,
-            base_delay_seconds=settings.azure_openai_rate_limit_base_delay_ms / 1000,
-            jitter_seconds=settings.azure_openai_rate_limit_jitter_ms / 1000,
-        )
+        self._rate_limiter = azure_rate_limiter
 
     async def generate_summary(
         self,
@@ -82,10 +269,39 @@ class SummariesService:
         summary = await self._generate_medication_summary(request, context)
         return MedicationSummaryResponse(summary_type="medication", data=summary)
 
+    async def stream_summary(
+        self,
+        summary_type: SummaryType,
+        request: SummariesRequest,
+        context: RequestContext,
+    ) -> AsyncGenerator[SummaryStreamEvent]:
+        """Generate a summary, yielding progress and each group as it is enriched.
+
+        The final ``SummaryCompleteEvent`` carries the full summary; closing the
+        generator early cancels the run.
+        """
+        _ = summary_type  # only MEDICATION supported
+        events: asyncio.Queue[SummaryStreamEvent | None] = asyncio.Queue()
+        task = asyncio.ensure_future(
+            self._generate_medication_summary(request, context, on_event=events.put)
+        )
+        task.add_done_callback(lambda _task: events.put_nowait(None))
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+            summary = await task
+        finally:
+            _ = task.cancel()
+        yield SummaryCompleteEvent(
+            summary=MedicationSummaryResponse(summary_type="medication", data=summary)
+        )
+
     async def _generate_medication_summary(
         self,
         request: SummariesRequest,
         context: RequestContext,
+        *,
+        on_event: SummaryEventHandler | None = None,
     ) -> MedicationSummary:
         patient = request.patient
 
@@ -105,99 +321,403 @@ class SummariesService:
         user_duz = vista_context.duz
         station_from_context = vista_context.station
 
-        azure_client = create_azure_openai_client()
         station = patient.station or station_from_context
 
-        vista_mcp = get_vista_mcp_client(
+        async with vista_mcp_pool.lease(
             jwt_token,
             user_duz=user_duz,
             station=station,
-        )
-        logger.info(
-            "Initialized Vista MCP client for summary (jwt=%s, duz=%s, station=%s)",
-            "present" if jwt_token else "missing",
-            user_duz or "missing",
-            station or "missing",
-        )
-        await vista_mcp.connect()
+        ) as vista_mcp:
+            logger.info(
+                "Leased Vista MCP session for summary (jwt=%s, duz=%s, station=%s)",
+                "present" if jwt_token else "missing",
+                user_duz or "missing",
+                station or "missing",
+            )
+            return await self._run_medication_agents(
+                vista_mcp=vista_mcp,
+                patient_icn=patient.icn,
+                station=station,
+                user_duz=user_duz,
+                options=request.options.model_dump(),
+                on_event=on_event,
+            )
 
+    async def _run_medication_agents(
+        self,
+        *,
+        vista_mcp: MCPServerStreamableHttp,
+        patient_icn: str,
+        station: str | None,
+        user_duz: str | None,
+        options: dict[str, object],
+        on_event: SummaryEventHandler | None = None,
+    ) -> MedicationSummary:
         tools = build_medication_tools()
         run_context = MedicationRunContext(
             vista_mcp=vista_mcp,
-            patient_icn=patient.icn,
+            patient_icn=patient_icn,
             station=station,
             user_duz=user_duz,
-            options=request.options.model_dump(),
+            options=options,
             max_pages=4,
             page_size=100,
         )
 
         metadata = {
-            "patient_icn": patient.icn,
+            "patient_icn": patient_icn,
             "patient_station": station,
             "user_duz": user_duz,
         }
 
-        try:
-            grouping_agent = build_medication_grouping_agent(
-                openai_client=azure_client,
-                tools=[
-                    tools["fetch_medications"],
-                    tools["fetch_problems"],
-                ],
+        # The summary cache is keyed by the data itself, so it needs the prefetch
+        prefetched = (
+            await self._prefetch(run_context)
+            if settings.summary_prefetch_enabled or summary_cache.enabled
+            else None
+        )
+        if prefetched is not None:
+            await _emit(on_event, SummaryProgressEvent(stage="data_fetched"))
+
+        cache_key: str | None = None
+        if summary_cache.enabled and prefetched is not None:
+            cache_key = content_key(prefetched, options, _pipeline_version())
+            cached = await _load_cached_summary(cache_key)
+            if cached is not None:
+                logger.info("Serving medication summary for %s from cache", patient_icn)
+                return cached
+
+        agent_data = prefetched if settings.summary_prefetch_enabled else None
+
+        summary: MedicationSummary | None = None
+        baseline_key: str | None = None
+        if (
+            settings.summary_incremental_enabled
+            and cache_key is not None
+            and prefetched is not None
+        ):
+            baseline_key = content_key(
+                "baseline", patient_icn, station, user_duz, options, _pipeline_version()
+            )
+            summary = await self._update_from_baseline(
+                baseline_key=baseline_key,
+                prefetched=prefetched,
+                tools=tools,
+                run_context=run_context,
+                metadata=metadata,
+                on_event=on_event,
             )
 
-            grouping_result = await self._run_agent(
-                agent=grouping_agent,
-                input_payload=json.dumps(
+        if summary is None:
+            grouping_output = await self._run_grouping(
+                tools=tools,
+                prefetched_data=(
                     {
-                        "task": "group_medications",
-                        "patient_icn": patient.icn,
-                        "patient_station": station,
+                        "medications": agent_data["medications"],
+                        "problems": agent_data["problems"],
                     }
+                    if agent_data is not None
+                    else None
                 ),
                 run_context=run_context,
                 metadata=metadata,
-                workflow_name="medication_summary.grouping",
-            )
-
-            grouping_output = self._require_output(
-                grouping_result, MedicationGroupingOutput
             )
             run_context.grouping_output = grouping_output
+            await _emit(
+                on_event,
+                SummaryProgressEvent(
+                    stage="grouping_complete", group_count=len(grouping_output.groups)
+                ),
+            )
 
-            enrichment_agent = build_medication_enrichment_agent(
-                openai_client=azure_client,
-                tools=[
-                    tools["fetch_labs"],
-                    tools["fetch_vitals"],
-                ],
+            summary = await self._enrich_summary(
+                agents=_enrichment_agents(tools),
+                groups=grouping_output.groups,
+                prefetched_data=(
+                    {"labs": agent_data["labs"], "vitals": agent_data["vitals"]}
+                    if agent_data is not None
+                    else None
+                ),
+                run_context=run_context,
+                metadata=metadata,
+                on_event=on_event,
             )
 
-            grouping_output_dict = cast(
-                "dict[str, object]", grouping_output.model_dump()
+        if cache_key is not None:
+            await summary_cache.set(cache_key, {"summary": summary.model_dump()})
+        if baseline_key is not None:
+            await summary_cache.set(
+                baseline_key, {"data": prefetched, "summary": summary.model_dump()}
             )
+        return summary
 
-            enrichment_result = await self._run_agent(
-                agent=enrichment_agent,
-                input_payload=json.dumps(
-                    {
-                        "task": "enrich_medication_summary",
-                        "medication_groups": grouping_output_dict,
-                    }
-                ),
+    async def _run_grouping(
+        self,
+        *,
+        tools: dict[str, FunctionTool],
+        prefetched_data: dict[str, object] | None,
+        run_context: MedicationRunContext,
+        metadata: dict[str, str | None],
+        existing_groups: list[MedicationGroup] | None = None,
+    ) -> MedicationGroupingOutput:
+        grouping_input: dict[str, object] = {
+            "task": "group_medications",
+            "patient_icn": run_context.patient_icn,
+            "patient_station": run_context.station,
+        }
+        if prefetched_data is not None:
+            grouping_input["prefetched_data"] = prefetched_data
+        if existing_groups is not None:
+            grouping_input["existing_groups"] = [
+                {
+                    "group_number": group.group_number,
+                    "treatment_indication": group.treatment_indication,
+                }
+                for group in existing_groups
+            ]
+
+        return await self._run_stage(
+            agents=_grouping_agents(tools),
+            output_type=MedicationGroupingOutput,
+            input_payload=json.dumps(grouping_input),
+            run_context=run_context,
+            metadata=metadata,
+            workflow_name="medication_summary.grouping",
+        )
+
+    async def _update_from_baseline(
+        self,
+        *,
+        baseline_key: str,
+        prefetched: MedicationPrefetch,
+        tools: dict[str, FunctionTool],
+        run_context: MedicationRunContext,
+        metadata: dict[str, str | None],
+        on_event: SummaryEventHandler | None = None,
+    ) -> MedicationSummary | None:
+        """Update the patient's last summary for changed data; None means redo all.
+
+        Only medications in changed groups (plus new ones) are regrouped, and only
+        groups whose medications or linked lab/vital series changed are
+        re-enriched. Every other group is reused verbatim.
+        """
+        baseline = await _load_baseline(baseline_key)
+        if baseline is None:
+            return None
+        previous_data, previous_summary = baseline
+
+        # Compare like with like: the stored data has been through JSON
+        current_data = cast(
+            "MedicationPrefetch", json.loads(json.dumps(prefetched, default=str))
+        )
+        plan = plan_incremental_update(
+            previous_data, current_data, previous_summary.groups
+        )
+        if plan is None:
+            return None
+        if plan.unchanged:
+            logger.info(
+                "Reusing every medication group for %s", run_context.patient_icn
+            )
+            return previous_summary
+
+        to_enrich = plan.reenrich
+        if plan.regroup_medications:
+            regrouped = await self._run_grouping(
+                tools=tools,
+                prefetched_data={
+                    "medications": plan.regroup_medications,
+                    "problems": prefetched["problems"],
+                },
                 run_context=run_context,
                 metadata=metadata,
-                workflow_name="medication_summary.enrichment",
+                existing_groups=plan.existing_groups(),
             )
+            to_enrich = merge_regrouped_groups(plan, regrouped.groups)
+
+        await _emit(
+            on_event,
+            SummaryProgressEvent(
+                stage="grouping_complete",
+                group_count=len(plan.reused) + len(to_enrich),
+            ),
+        )
+        await _emit_groups(on_event, plan.reused)
+
+        logger.info(
+            "Incremental medication summary for %s: reusing %d groups, "
+            "regrouped %d medications, enriching %d groups",
+            run_context.patient_icn,
+            len(plan.reused),
+            len(plan.regroup_medications),
+            len(to_enrich),
+        )
+        enriched: list[MedicationGroup] = []
+        if to_enrich:
+            enriched = (
+                await self._enrich_summary(
+                    agents=_enrichment_agents(tools),
+                    groups=to_enrich,
+                    prefetched_data={
+                        "labs": prefetched["labs"],
+                        "vitals": prefetched["vitals"],
+                    },
+                    run_context=run_context,
+                    metadata=metadata,
+                    on_event=on_event,
+                )
+            ).groups
+        return MedicationSummary(groups=renumber_groups([*plan.reused, *enriched]))
 
-            summary = self._require_output(enrichment_result, MedicationSummary)
+    async def _enrich_summary(
+        self,
+        *,
+        agents: Sequence[Agent[MedicationRunContext]],
+        groups: list[MedicationGroup],
+        prefetched_data: dict[str, object] | None,
+        run_context: MedicationRunContext,
+        metadata: dict[str, str | None],
+        on_event: SummaryEventHandler | None = None,
+    ) -> MedicationSummary:
+        """Enrich all groups in one run, or in concurrent batches when configured.
+
+        When streaming, each batch's groups are emitted as soon as it finishes.
+        """
+        batch_size = settings.summary_enrichment_batch_size
+        if on_event is not None and settings.summary_stream_batch_size > 0:
+            batch_size = settings.summary_stream_batch_size
+        if batch_size < 1 or len(groups) <= batch_size:
+            summary = await self._enrich_groups(
+                agents=agents,
+                groups=groups,
+                prefetched_data=prefetched_data,
+                run_context=run_context,
+                metadata=metadata,
+            )
+            await _emit_groups(on_event, summary.groups)
             return summary
-        finally:
-            with contextlib.suppress(Exception):
-                await vista_mcp.cleanup()
 
-    async def _run_agent(
+        batches = [
+            groups[start : start + batch_size]
+            for start in range(0, len(groups), batch_size)
+        ]
+        logger.info(
+            "Enriching %d medication groups in %d concurrent batches",
+            len(groups),
+            len(batches),
+        )
+        tasks = [
+            asyncio.ensure_future(
+                self._enrich_groups(
+                    agents=agents,
+                    groups=batch,
+                    prefetched_data=prefetched_data,
+                    run_context=run_context,
+                    metadata=metadata,
+                )
+            )
+            for batch in batches
+        ]
+        merged: list[MedicationGroup] = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                await _emit_groups(on_event, result.groups)
+                merged.extend(result.groups)
+        except BaseException:
+            for task in tasks:
+                _ = task.cancel()
+            raise
+
+        return MedicationSummary(
+            groups=sorted(merged, key=lambda group: group.group_number)
+        )
+
+    async def _enrich_groups(
+        self,
+        *,
+        agents: Sequence[Agent[MedicationRunContext]],
+        groups: list[MedicationGroup],
+        prefetched_data: dict[str, object] | None,
+        run_context: MedicationRunContext,
+        metadata: dict[str, str | None],
+    ) -> MedicationSummary:
+        """Run the enrichment agent over ``groups`` (all groups or one batch)."""
+        enrichment_input: dict[str, object] = {
+            "task": "enrich_medication_summary",
+            "medication_groups": MedicationGroupingOutput(groups=groups).model_dump(),
+        }
+        if prefetched_data is not None:
+            enrichment_input["prefetched_data"] = prefetched_data
+
+        summary = await self._run_stage(
+            agents=agents,
+            output_type=MedicationSummary,
+            input_payload=json.dumps(enrichment_input),
+            run_context=run_context,
+            metadata=metadata,
+            workflow_name="medication_summary.enrichment",
+            validate=lambda summary: _restore_group_numbers(summary.groups, groups),
+        )
+        return summary
+
+    async def _prefetch(
+        self, run_context: MedicationRunContext
+    ) -> MedicationPrefetch | None:
+        """Load all agent datasets up front; None falls back to tool calls."""
+        try:
+            return await prefetch_medication_data(run_context)
+        except Exception as exc:
+            logger.warning(
+                "Medication prefetch failed for %s, falling back to agent tools: %s",
+                run_context.patient_icn,
+                exc,
+            )
+            return None
+
+    async def _run_stage(
+        self,
+        *,
+        agents: Sequence[Agent[MedicationRunContext]],
+        output_type: type[T],
+        input_payload: str,
+        run_context: MedicationRunContext,
+        metadata: dict[str, str | None],
+        workflow_name: str,
+        validate: Callable[[T], None] | None = None,
+    ) -> T:
+        """Run a pipeline stage, escalating along ``agents`` on invalid output.
+
+        ``agents`` is the stage's model cascade: a fast model first (if one is
+        configured) and the full model last. ``validate`` may reject (by raising
+        HTTPException) or adjust output that parsed but is unusable.
+        """
+        for index, agent in enumerate(agents):
+            try:
+                # Includes output that still breaks the schema after repairs
+                result = await self._run_agent_with_repair(
+                    agent=agent,
+                    input_payload=input_payload,
+                    run_context=run_context,
+                    metadata=metadata,
+                    workflow_name=workflow_name,
+                )
+                output = self._require_output(result, output_type)
+                if validate is not None:
+                    validate(output)
+                return output
+            except HTTPException:
+                if index == len(agents) - 1:
+                    raise
+                logger.warning(
+                    "%s output from %s failed validation, escalating to %s",
+                    workflow_name,
+                    _model_name(agent),
+                    _model_name(agents[index + 1]),
+                )
+        raise ValueError("At least one agent is required per stage")
+
+    async def _run_agent_with_repair(
         self,
         *,
         agent: Agent[MedicationRunContext],
@@ -205,13 +725,81 @@ class SummariesService:
         run_context: MedicationRunContext,
         metadata: dict[str, str | None],
         workflow_name: str,
+    ) -> RunResult:
+        """Run ``agent``; if its final output breaks the schema, redo only that turn.
+
+        A repair run replays the failed run's conversation (tool results included)
+        plus the validation error, with tools removed and a single turn allowed, so
+        no Vista data is fetched again.
+        """
+        try:
+            return await self._run_agent(
+                agent=agent,
+                input_payload=input_payload,
+                run_context=run_context,
+                metadata=metadata,
+                workflow_name=workflow_name,
+            )
+        except ModelBehaviorError as exc:
+            error = exc
+
+        repair_agent = agent.clone(
+            tools=[],
+            model_settings=replace(agent.model_settings, parallel_tool_calls=None),
+        )
+        for attempt in range(1, settings.summary_output_repair_attempts + 1):
+            if error.run_data is None:
+                break
+            logger.warning(
+                "%s returned invalid structured output, repair attempt %d/%d",
+                workflow_name,
+                attempt,
+                settings.summary_output_repair_attempts,
+            )
+            repair_input: list[TResponseInputItem] = [
+                *ItemHelpers.input_to_new_input_list(error.run_data.input),
+                *(item.to_input_item() for item in error.run_data.new_items),
+                {
+                    "role": "user",
+                    "content": OUTPUT_REPAIR_PROMPT.format(
+                        error=error.message[:OUTPUT_REPAIR_ERROR_MAX_CHARS]
+                    ),
+                },
+            ]
+            try:
+                return await self._run_agent(
+                    agent=repair_agent,
+                    input_payload=repair_input,
+                    run_context=run_context,
+                    metadata=metadata,
+                    workflow_name=f"{workflow_name}.repair",
+                    max_turns=1,
+                )
+            except ModelBehaviorError as exc:
+                error = exc
+
+        logger.error(f"{workflow_name} output failed validation: {error.message}")
+        raise HTTPException(
+            status_code=500,
+            detail="Agent run did not return the expected structured output.",
+        ) from error
+
+    async def _run_agent(
+        self,
+        *,
+        agent: Agent[MedicationRunContext],
+        input_payload: str | list[TResponseInputItem],
+        run_context: MedicationRunContext,
+        metadata: dict[str, str | None],
+        workflow_name: str,
+        max_turns: int = 10,
     ) -> RunResult:
         async def _execute() -> RunResult:
             return await Runner.run(
                 agent,
                 input=input_payload,
                 context=run_context,
-                max_turns=10,
+                max_turns=max_turns,
                 run_config=RunConfig(
                     workflow_name=workflow_name,
                     trace_include_sensitive_data=settings.trace_include_sensitive_data,
@@ -219,10 +807,24 @@ class SummariesService:
                 ),
             )
 
-        return await self._rate_limiter.run(_execute)
+        return await self._rate_limiter.run(
+            _execute,
+            priority=RequestPriority.ON_DEMAND,
+            user_key=run_context.user_duz,
+            # Only wait out throttling of the deployments this agent's model uses
+            cooldown=(
+                agent.model.cooldown
+                if isinstance(agent.model, RoutedChatCompletionsModel)
+                else None
+            ),
+        )
 
     @staticmethod
     def _require_output(result: RunResult, model_type: type[T]) -> T:
+        if isinstance(result.final_output, model_type):
+            # Structured output, already validated by the Agents SDK
+            return result.final_output
+
         final_output = extract_json_content(result.final_output)
 
         try:
@@ -0,0 +1,152 @@
+"""Disk-backed, content-addressed cache for generated summaries."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import cast
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(*parts: object) -> str:
+    """Stable SHA-256 over JSON-serializable ``parts`` (dict key order ignored)."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SummaryCacheStats:
+    """Counters exposed for monitoring cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class SummaryCache:
+    """Store JSON payloads as one file per key, evicting least recently used.
+
+    Reads refresh the file's modification time, which doubles as the LRU clock,
+    so entries survive restarts and the eviction order does too. Blocking file
+    I/O runs in a worker thread.
+    """
+
+    def __init__(self, directory: Path, *, max_bytes: int) -> None:
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._stats = SummaryCacheStats()
+        self._write_lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    async def get(self, key: str) -> dict[str, object] | None:
+        """Return the payload stored under ``key`` or None on a miss."""
+        if not self.enabled:
+            return None
+        try:
+            payload = await asyncio.to_thread(self._read, key)
+        except (OSError, ValueError) as e:
+            self._stats.errors += 1
+            logger.warning(f"Summary cache read failed for {key}: {e}")
+            payload = None
+
+        if payload is None:
+            self._stats.misses += 1
+        else:
+            self._stats.hits += 1
+        return payload
+
+    async def set(self, key: str, payload: dict[str, object]) -> None:
+        """Store ``payload`` under ``key`` and evict old entries over the budget."""
+        if not self.enabled:
+            return
+        data = json.dumps(payload, default=str).encode("utf-8")
+        if len(data) > self._max_bytes:
+            return
+        try:
+            async with self._write_lock:
+                evicted = await asyncio.to_thread(self._write, key, data)
+        except OSError as e:
+            self._stats.errors += 1
+            logger.warning(f"Summary cache write failed for {key}: {e}")
+            return
+        self._stats.writes += 1
+        self._stats.evictions += evicted
+
+    def stats(self) -> SummaryCacheStats:
+        """Return a snapshot of the cache counters."""
+        return SummaryCacheStats(**self._stats.as_dict())
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"{key}.json"
+
+    def _read(self, key: str) -> dict[str, object] | None:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        payload: object = json.loads(data)
+        if not isinstance(payload, dict):
+            return None
+        return cast("dict[str, object]", payload)
+
+    def _write(self, key: str, data: bytes) -> int:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers never see a partial file
+        fd, tmp_name = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                _ = tmp.write(data)
+            _ = tmp_path.replace(self._path(key))
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return self._evict()
+
+    def _evict(self) -> int:
+        entries: list[tuple[float, int, Path]] = []
+        for entry in os.scandir(self._directory):
+            if not entry.name.endswith(".json"):
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+                evicted += 1
+            total -= size
+        return evicted
+
+
+# Process-wide cache; entries are shared across workers using the same directory
+summary_cache = SummaryCache(
+    Path(settings.summary_cache_dir),
+    max_bytes=settings.summary_cache_max_bytes if settings.summary_cache_enabled else 0,
+)
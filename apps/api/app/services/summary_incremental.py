@@ -0,0 +1,181 @@
+"""Plan incremental medication summary updates from a diff of Vista data."""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from ..agents import MedicationPrefetch
+    from ..models.summaries import MeasurementSeries, MedicationGroup
+    from .vista_tools import MedicationRecord
+
+logger = logging.getLogger(__name__)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _normalize(name: str | None) -> str:
+    return _NON_ALNUM.sub(" ", (name or "").lower()).strip()
+
+
+@dataclass
+class IncrementalPlan:
+    """Work needed to bring a stored summary up to date with new Vista data.
+
+    ``reused`` groups are returned verbatim, ``reenrich`` groups keep their
+    medications but need fresh labs and vitals, and ``regroup_medications`` must
+    go back through the grouping agent.
+    """
+
+    reused: list[MedicationGroup] = field(default_factory=list)
+    reenrich: list[MedicationGroup] = field(default_factory=list)
+    regroup_medications: list[MedicationRecord] = field(default_factory=list)
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.reenrich and not self.regroup_medications
+
+    def existing_groups(self) -> list[MedicationGroup]:
+        return sorted([*self.reused, *self.reenrich], key=lambda g: g.group_number)
+
+
+def plan_incremental_update(
+    previous: MedicationPrefetch,
+    current: MedicationPrefetch,
+    groups: Sequence[MedicationGroup],
+) -> IncrementalPlan | None:
+    """Diff ``previous`` against ``current`` and decide which groups to redo.
+
+    Returns None when the change cannot be localized to some groups, in which
+    case the caller should regenerate the whole summary: the problem list
+    changed (every indication match may shift), a changed medication cannot be
+    found in any group, or a new lab or vital series appeared.
+    """
+    if previous["problems"] != current["problems"]:
+        logger.info("Problem list changed; incremental summary not possible")
+        return None
+
+    previous_meds = _index_medications(previous["medications"])
+    current_meds = _index_medications(current["medications"])
+    changed_meds = {
+        name
+        for name in previous_meds.keys() | current_meds.keys()
+        if previous_meds.get(name) != current_meds.get(name)
+    }
+
+    changed_labs = _changed_series(previous["labs"], current["labs"])
+    changed_vitals = _changed_series(previous["vitals"], current["vitals"])
+    if changed_labs is None or changed_vitals is None:
+        logger.info("New lab or vital series; incremental summary not possible")
+        return None
+    # Series no group linked to were judged irrelevant and stay that way
+    changed_series = changed_labs | changed_vitals
+
+    grouped_meds = {
+        _normalize(item.name) for group in groups for item in group.medications
+    }
+    if any(name in previous_meds and name not in grouped_meds for name in changed_meds):
+        logger.info("Changed medication missing from stored groups; regenerating")
+        return None
+
+    plan = IncrementalPlan()
+    regroup_names = {name for name in changed_meds if name not in previous_meds}
+    for group in groups:
+        names = {_normalize(item.name) for item in group.medications}
+        if names & changed_meds:
+            regroup_names |= names
+        elif _series_names(group) & changed_series:
+            plan.reenrich.append(
+                group.model_copy(update={"relevant_labs": [], "relevant_vitals": []})
+            )
+        else:
+            plan.reused.append(group)
+
+    plan.regroup_medications = [
+        record
+        for name in sorted(regroup_names)
+        for record in current_meds.get(name, [])
+    ]
+    if plan.regroup_medications and not plan.reused and not plan.reenrich:
+        # Every group changed, so an incremental pass saves nothing
+        return None
+    return plan
+
+
+def merge_regrouped_groups(
+    plan: IncrementalPlan, regrouped: Iterable[MedicationGroup]
+) -> list[MedicationGroup]:
+    """Fold the grouping agent's output into the plan's existing groups.
+
+    A regrouped group whose indication matches a kept group is merged into it
+    (that group then needs re-enrichment); the rest are numbered after the kept
+    groups. Returns every group that needs enrichment.
+    """
+    by_indication = {
+        _normalize(group.treatment_indication): group for group in plan.reused
+    }
+    pending = {_normalize(group.treatment_indication): group for group in plan.reenrich}
+    next_number = max(
+        (group.group_number for group in plan.existing_groups()), default=0
+    )
+
+    for group in regrouped:
+        indication = _normalize(group.treatment_indication)
+        existing = pending.get(indication) or by_indication.pop(indication, None)
+        if existing is None:
+            next_number += 1
+            pending[indication] = group.model_copy(update={"group_number": next_number})
+            continue
+        pending[indication] = existing.model_copy(
+            update={
+                "medications": [*existing.medications, *group.medications],
+                "relevant_labs": [],
+                "relevant_vitals": [],
+            }
+        )
+
+    plan.reused = list(by_indication.values())
+    return sorted(pending.values(), key=lambda g: g.group_number)
+
+
+def renumber_groups(groups: Iterable[MedicationGroup]) -> list[MedicationGroup]:
+    """Sort groups by number and renumber them from 1 without gaps."""
+    return [
+        group.model_copy(update={"group_number": number})
+        for number, group in enumerate(
+            sorted(groups, key=lambda g: g.group_number), start=1
+        )
+    ]
+
+
+def _index_medications(
+    records: Sequence[MedicationRecord],
+) -> dict[str, list[MedicationRecord]]:
+    index: defaultdict[str, list[MedicationRecord]] = defaultdict(list)
+    for record in records:
+        index[_normalize(record.get("name"))].append(record)
+    return dict(index)
+
+
+def _changed_series[ObservationT](
+    previous: Mapping[str, list[ObservationT]],
+    current: Mapping[str, list[ObservationT]],
+) -> set[str] | None:
+    if current.keys() - previous.keys():
+        return None
+    return {
+        _normalize(name)
+        for name in previous.keys() | current.keys()
+        if previous.get(name) != current.get(name)
+    }
+
+
+def _series_names(group: MedicationGroup) -> set[str]:
+    series: list[MeasurementSeries] = [*group.relevant_labs, *group.relevant_vitals]
+    return {_normalize(item.name) for item in series}
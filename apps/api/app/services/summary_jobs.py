@@ -0,0 +1,277 @@
+"""Background job queue for summary generation."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException
+
+from ..config import settings
+from .summaries import SummariesService
+from .summary_cache import content_key
+
+if TYPE_CHECKING:
+    from ..dependencies.context import RequestContext
+    from ..models.summaries import (
+        MedicationSummaryResponse,
+        SummariesRequest,
+        SummaryJobStatus,
+    )
+
+logger = logging.getLogger(__name__)
+
+JOB_FAILED_MESSAGE = "Failed to generate the summary. Please try again later."
+
+
+@dataclass
+class SummaryJob:
+    """One queued summary request and, once finished, its outcome."""
+
+    id: str
+    dedup_key: str
+    owner: str | None
+    summary_type: SummariesService.SummaryType
+    request: SummariesRequest
+    context: RequestContext
+    status: SummaryJobStatus = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: MedicationSummaryResponse | None = None
+    error: str | None = None
+    error_status: int | None = None
+
+
+class SummaryJobBackend(ABC):
+    """Storage and hand-off for summary jobs.
+
+    The in-memory backend keeps everything in this process; a shared backend
+    lets several API instances see each other's jobs.
+    """
+
+    @abstractmethod
+    async def put(self, job: SummaryJob) -> None:
+        """Store a new job and queue it for a worker."""
+
+    @abstractmethod
+    async def take(self) -> SummaryJob:
+        """Wait for the next queued job."""
+
+    @abstractmethod
+    async def update(self, job: SummaryJob) -> None:
+        """Persist a job's status change."""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> SummaryJob | None:
+        """Return a job by ID."""
+
+    @abstractmethod
+    async def find(self, dedup_key: str) -> SummaryJob | None:
+        """Return the latest job submitted with ``dedup_key``."""
+
+    @abstractmethod
+    async def purge(self, finished_before: float) -> int:
+        """Delete jobs that finished before ``finished_before``."""
+
+    @abstractmethod
+    async def queued_count(self) -> int:
+        """Number of jobs waiting for a worker."""
+
+
+class InMemorySummaryJobBackend(SummaryJobBackend):
+    """Keep jobs in process memory; they are lost on restart."""
+
+    _jobs: dict[str, SummaryJob]
+    _latest: dict[str, str]
+    _queue: asyncio.Queue[str]
+
+    def __init__(self) -> None:
+        self._jobs = {}
+        self._latest = {}
+        self._queue = asyncio.Queue()
+
+    async def put(self, job: SummaryJob) -> None:
+        self._jobs[job.id] = job
+        self._latest[job.dedup_key] = job.id
+        self._queue.put_nowait(job.id)
+
+    async def take(self) -> SummaryJob:
+        while True:
+            job = self._jobs.get(await self._queue.get())
+            if job is not None:
+                return job
+
+    async def update(self, job: SummaryJob) -> None:
+        self._jobs[job.id] = job
+
+    async def get(self, job_id: str) -> SummaryJob | None:
+        return self._jobs.get(job_id)
+
+    async def find(self, dedup_key: str) -> SummaryJob | None:
+        job_id = self._latest.get(dedup_key)
+        return self._jobs.get(job_id) if job_id else None
+
+    async def purge(self, finished_before: float) -> int:
+        expired = [
+            job
+            for job in self._jobs.values()
+            if job.finished_at is not None and job.finished_at < finished_before
+        ]
+        for job in expired:
+            del self._jobs[job.id]
+            if self._latest.get(job.dedup_key) == job.id:
+                del self._latest[job.dedup_key]
+        return len(expired)
+
+    async def queued_count(self) -> int:
+        return self._queue.qsize()
+
+
+class SummaryJobQueue:
+    """Run summary jobs on a bounded pool of worker tasks.
+
+    Submitting the same request (same user, summary type and payload) while a
+    job is queued, running or its result is still kept returns that job instead
+    of starting another. Finished jobs are kept for ``result_ttl_seconds``.
+    Workers start on the first submission.
+    """
+
+    _workers: list[asyncio.Task[None]]
+
+    def __init__(
+        self,
+        service: SummariesService,
+        *,
+        backend: SummaryJobBackend,
+        workers: int,
+        result_ttl_seconds: float,
+        max_pending: int,
+    ) -> None:
+        self._service = service
+        self._backend = backend
+        self._worker_count = max(1, workers)
+        self._result_ttl_seconds = result_ttl_seconds
+        self._max_pending = max_pending
+        self._workers = []
+        self.submitted = 0
+        self.deduplicated = 0
+        self.completed = 0
+        self.failed = 0
+
+    async def submit(
+        self,
+        summary_type: SummariesService.SummaryType,
+        request: SummariesRequest,
+        context: RequestContext,
+    ) -> SummaryJob:
+        """Queue a summary job, or return an identical one already known."""
+        _ = await self._purge_expired()
+        owner = context.user.sub if context.user else None
+        dedup_key = content_key(
+            owner, summary_type.value, request.model_dump(mode="json")
+        )
+
+        existing = await self._backend.find(dedup_key)
+        if existing is not None and existing.status != "failed":
+            self.deduplicated += 1
+            return existing
+
+        if await self._backend.queued_count() >= self._max_pending:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many summary jobs are queued. Please try again later.",
+            )
+
+        job = SummaryJob(
+            id=uuid.uuid4().hex,
+            dedup_key=dedup_key,
+            owner=owner,
+            summary_type=summary_type,
+            request=request,
+            context=context,
+        )
+        await self._backend.put(job)
+        self.submitted += 1
+        self._ensure_workers()
+        return job
+
+    async def get(self, job_id: str, *, owner: str | None) -> SummaryJob | None:
+        """Return a job if it exists, has not expired and belongs to ``owner``."""
+        _ = await self._purge_expired()
+        job = await self._backend.get(job_id)
+        if job is None or job.owner != owner:
+            return None
+        return job
+
+    async def close(self) -> None:
+        """Stop the workers; queued and running jobs are abandoned."""
+        for worker in self._workers:
+            _ = worker.cancel()
+        for worker in self._workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
+        self._workers = []
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": len(self._workers),
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def _ensure_workers(self) -> None:
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self._worker_count:
+            self._workers.append(asyncio.create_task(self._work()))
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._backend.take()
+            await self._run(job)
+
+    async def _run(self, job: SummaryJob) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        await self._backend.update(job)
+        try:
+            job.result = await self._service.generate_summary(
+                job.summary_type, job.request, job.context
+            )
+            job.status = "succeeded"
+            self.completed += 1
+        except HTTPException as e:
+            logger.error(f"Summary job {job.id} failed: {e.detail}")
+            job.status = "failed"
+            job.error = str(e.detail) if e.status_code < 500 else JOB_FAILED_MESSAGE
+            job.error_status = e.status_code
+            self.failed += 1
+        except Exception as e:
+            logger.error(f"Summary job {job.id} failed: {e!s}", exc_info=True)
+            job.status = "failed"
+            job.error = JOB_FAILED_MESSAGE
+            job.error_status = 500
+            self.failed += 1
+        job.finished_at = time.time()
+        await self._backend.update(job)
+
+    async def _purge_expired(self) -> int:
+        return await self._backend.purge(time.time() - self._result_ttl_seconds)
+
+
+# Process-wide job queue used by the summaries router
+summary_job_queue = SummaryJobQueue(
+    SummariesService(),
+    backend=InMemorySummaryJobBackend(),
+    workers=settings.summary_job_workers,
+    result_ttl_seconds=settings.summary_job_result_ttl_seconds,
+    max_pending=settings.summary_job_max_pending,
+)
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
 import logging
-from collections.abc import Iterable, Mapping
-from datetime import datetime
+from collections.abc import AsyncGenerator, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from typing import TYPE_CHECKING, TypedDict, cast
 
+from .single_flight import SingleFlight
+
 if TYPE_CHECKING:
     from agents.mcp import MCPServerStreamableHttp
     from mcp.types import CallToolResult
@@ -64,8 +69,23 @@ __all__ = [
     "fetch_medications",
     "fetch_problems",
     "fetch_vitals",
+    "iter_paginated",
+    "narrow_series",
 ]
 
+# Maximum number of pages requested concurrently by a single collect_paginated call
+DEFAULT_PAGE_CONCURRENCY = 4
+
+# Default windows and paging for patient data, shared by the agent tools and the
+# chat fast path so both hit the same patient_data_cache entries
+DEFAULT_MEDICATION_DAYS_BACK = 183
+DEFAULT_PROBLEMS_DAYS_BACK = 365
+DEFAULT_LABS_DAYS_BACK = 1825
+DEFAULT_VITALS_DAYS_BACK = 365
+DEFAULT_N_MOST_RECENT = 3
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_MAX_PAGES = 4
+
 ISO_FORMATS: tuple[str, ...] = (
     "%Y-%m-%dT%H:%M:%S%z",
     "%Y-%m-%dT%H:%M:%S.%f%z",
@@ -78,6 +98,10 @@ class VistaToolError(RuntimeError):
     """Raised when the Vista MCP server cannot fulfil a tool request."""
 
 
+# Identical Vista RPCs currently in flight, keyed by (client, tool, arguments)
+_in_flight_calls: SingleFlight[tuple[object, str, str], JsonDict] = SingleFlight()
+
+
 def _ensure_dict(value: object) -> JsonDict:
     if isinstance(value, dict):
         typed_value = cast("dict[object, JSONValue]", value)
@@ -104,8 +128,24 @@ async def call_vista_tool(
     tool_name: str,
     arguments: Mapping[str, JSONValue],
 ) -> JsonDict:
-    """Call a Vista MCP tool and return the JSON payload."""
+    """Call a Vista MCP tool and return the JSON payload.
+
+    Identical concurrent calls on the same MCP client (and therefore the same Vista
+    credentials) share a single request; the returned payload must be treated as
+    read-only.
+    """
+
+    key = (vista_mcp, tool_name, json.dumps(arguments, sort_keys=True, default=str))
+    return await _in_flight_calls.do(
+        key, lambda: _call_vista_tool(vista_mcp, tool_name, arguments)
+    )
 
+
+async def _call_vista_tool(
+    vista_mcp: MCPServerStreamableHttp,
+    tool_name: str,
+    arguments: Mapping[str, JSONValue],
+) -> JsonDict:
     logger.debug("Calling Vista MCP tool %s with arguments: %s", tool_name, arguments)
     args_for_call: dict[str, object] = {str(k): v for k, v in arguments.items()}
     result: CallToolResult = await vista_mcp.call_tool(tool_name, args_for_call)
@@ -275,41 +315,44 @@ async def fetch_labs(
     n_most_recent: int,
     limit: int,
     max_pages: int,
+    stop_when_complete: bool = False,
 ) -> dict[str, list[LabObservation]]:
-    """Return lab results grouped by test type."""
+    """Return lab results grouped by test type.
 
-    labs = await collect_paginated(
-        vista_mcp,
-        tool_name="get_patient_labs",
-        arguments={
-            "patient_icn": patient_icn,
-            "station": station,
-            "days_back": days_back,
-            "n_most_recent": n_most_recent,
-        },
-        item_key="labs",
-        limit=limit,
-        max_pages=max_pages,
-    )
+    Pages are normalized as they arrive and each series is trimmed to
+    ``n_most_recent`` along the way. With ``stop_when_complete`` the remaining
+    pages are abandoned once every series seen so far is full; a test type that
+    first appears on a later page is then not returned, so only opt in when the
+    caller can tolerate that.
+    """
 
     grouped: dict[str, list[LabObservation]] = {}
-    for lab in labs:
-        key = (
-            _string_or_none(_get_value(lab, "type_name", "typeName"))
-            or _string_or_none(_get_value(lab, "display_name", "displayName"))
-            or "Unknown"
-        )
-        grouped.setdefault(key, []).append(
-            LabObservation(
-                value=_string_or_none(_get_value(lab, "result")),
-                units=_string_or_none(_get_value(lab, "units")),
-                date=_to_iso_date(_get_value(lab, "observed")),
-            )
+    async with contextlib.aclosing(
+        iter_paginated(
+            vista_mcp,
+            tool_name="get_patient_labs",
+            arguments={
+                "patient_icn": patient_icn,
+                "station": station,
+                "days_back": days_back,
+                "n_most_recent": n_most_recent,
+            },
+            item_key="labs",
+            limit=limit,
+            max_pages=max_pages,
         )
-
-    for series in grouped.values():
-        series.sort(key=_observation_date, reverse=True)
-        del series[n_most_recent:]
+    ) as pages:
+        async for page in pages:
+            for lab in page:
+                grouped.setdefault(_series_name(lab), []).append(
+                    LabObservation(
+                        value=_string_or_none(_get_value(lab, "result")),
+                        units=_string_or_none(_get_value(lab, "units")),
+                        date=_to_iso_date(_get_value(lab, "observed")),
+                    )
+                )
+            if _trim_series(grouped, n_most_recent) and stop_when_complete:
+                break
 
     return grouped
 
@@ -323,42 +366,93 @@ async def fetch_vitals(
     n_most_recent: int,
     limit: int,
     max_pages: int,
+    stop_when_complete: bool = False,
 ) -> dict[str, list[VitalObservation]]:
-    """Return vital sign readings grouped by type."""
+    """Return vital sign readings grouped by type.
 
-    vitals = await collect_paginated(
-        vista_mcp,
-        tool_name="get_patient_vitals",
-        arguments={
-            "patient_icn": patient_icn,
-            "station": station,
-            "days_back": days_back,
-            "n_most_recent": n_most_recent,
-        },
-        item_key="vital_signs",
-        limit=limit,
-        max_pages=max_pages,
-    )
+    Streams pages the same way as ``fetch_labs``, including the optional
+    ``stop_when_complete`` early exit.
+    """
 
     grouped: dict[str, list[VitalObservation]] = {}
-    for vital in vitals:
-        key = (
-            _string_or_none(_get_value(vital, "type_name", "typeName"))
-            or _string_or_none(_get_value(vital, "display_name", "displayName"))
-            or "Unknown"
-        )
-        grouped.setdefault(key, []).append(
-            VitalObservation(
-                value=_string_or_none(_get_value(vital, "result")),
-                date=_to_iso_date(_get_value(vital, "observed")),
-            )
+    async with contextlib.aclosing(
+        iter_paginated(
+            vista_mcp,
+            tool_name="get_patient_vitals",
+            arguments={
+                "patient_icn": patient_icn,
+                "station": station,
+                "days_back": days_back,
+                "n_most_recent": n_most_recent,
+            },
+            item_key="vital_signs",
+            limit=limit,
+            max_pages=max_pages,
         )
+    ) as pages:
+        async for page in pages:
+            for vital in page:
+                grouped.setdefault(_series_name(vital), []).append(
+                    VitalObservation(
+                        value=_string_or_none(_get_value(vital, "result")),
+                        date=_to_iso_date(_get_value(vital, "observed")),
+                    )
+                )
+            if _trim_series(grouped, n_most_recent) and stop_when_complete:
+                break
+
+    return grouped
+
+
+def narrow_series[ObservationT: (LabObservation, VitalObservation)](
+    grouped: Mapping[str, list[ObservationT]],
+    *,
+    days_back: int,
+    n_most_recent: int,
+    today: date | None = None,
+) -> dict[str, list[ObservationT]]:
+    """Derive a narrower ``fetch_labs``/``fetch_vitals`` result from a wider one.
+
+    ``grouped`` must come from a call with at least ``days_back`` days and
+    ``n_most_recent`` entries per series. Each series is newest-first, so the
+    newest readings inside the narrower window are always among the cached ones.
+    Readings without a date are kept, since the server placed them in the window.
+    """
+    cutoff = ((today or date.today()) - timedelta(days=days_back)).isoformat()
+    narrowed: dict[str, list[ObservationT]] = {}
+    for name, series in grouped.items():
+        kept = [
+            observation
+            for observation in series
+            if (observation_date := observation.get("date")) is None
+            or observation_date >= cutoff
+        ][:n_most_recent]
+        if kept:
+            narrowed[name] = kept
+    return narrowed
+
+
+def _series_name(observation: JsonDict) -> str:
+    return (
+        _string_or_none(_get_value(observation, "type_name", "typeName"))
+        or _string_or_none(_get_value(observation, "display_name", "displayName"))
+        or "Unknown"
+    )
 
+
+def _trim_series[ObservationT: (LabObservation, VitalObservation)](
+    grouped: dict[str, list[ObservationT]], n_most_recent: int
+) -> bool:
+    """Keep the newest ``n_most_recent`` entries per series.
+
+    Returns True when every series already holds ``n_most_recent`` entries.
+    """
+    complete = True
     for series in grouped.values():
         series.sort(key=_observation_date, reverse=True)
         del series[n_most_recent:]
-
-    return grouped
+        complete = complete and len(series) >= n_most_recent
+    return complete
 
 
 async def collect_paginated(
@@ -369,46 +463,174 @@ async def collect_paginated(
     item_key: str,
     limit: int,
     max_pages: int,
+    max_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
 ) -> list[JsonDict]:
     """Fetch records from a paginated Vista MCP tool.
 
+    Collects every page yielded by ``iter_paginated`` into a single list.
+
     Exposed so additional agent workflows can reuse the pagination contract while
     supplying their own post-processing logic.
     """
-    offset = 0
     items: list[JsonDict] = []
-
-    for page_index in range(max_pages):
-        payload = await call_vista_tool(
+    async with contextlib.aclosing(
+        iter_paginated(
             vista_mcp,
-            tool_name,
-            {
-                **arguments,
-                "offset": offset,
-                "limit": limit,
-            },
+            tool_name=tool_name,
+            arguments=arguments,
+            item_key=item_key,
+            limit=limit,
+            max_pages=max_pages,
+            max_concurrency=max_concurrency,
         )
+    ) as pages:
+        async for page in pages:
+            items.extend(page)
+    return items
 
-        data = _ensure_dict(payload.get("data"))
-        page_items = _ensure_list_of_dicts(data.get(item_key))
-        items.extend(page_items)
 
-        metadata = _ensure_dict(payload.get("metadata"))
-        pagination = _ensure_dict(metadata.get("pagination"))
-        total_available = _to_int(pagination.get("total_available_items"))
-        returned = _to_int(pagination.get("returned")) or len(page_items)
+async def iter_paginated(
+    vista_mcp: MCPServerStreamableHttp,
+    *,
+    tool_name: str,
+    arguments: Mapping[str, JSONValue],
+    item_key: str,
+    limit: int,
+    max_pages: int,
+    max_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+) -> AsyncGenerator[list[JsonDict]]:
+    """Yield pages of records from a paginated Vista MCP tool as they arrive.
+
+    The first page is fetched on its own to learn ``total_available_items``; the
+    remaining offsets (up to ``max_pages``) are then requested concurrently, at most
+    ``max_concurrency`` at a time, and yielded in offset order. When the server
+    does not report a total, pages are fetched sequentially until one comes back
+    empty or a later page reports a total that has been reached.
+
+    Consumers that may stop early should wrap the generator in
+    ``contextlib.aclosing`` so requests still in flight are cancelled promptly.
+    """
+    if max_pages < 1:
+        return
 
-        if not page_items:
-            logger.debug(
-                "Vista MCP tool %s returned no items on page %s", tool_name, page_index
+    first_page = await _fetch_page(
+        vista_mcp,
+        tool_name=tool_name,
+        arguments=arguments,
+        item_key=item_key,
+        offset=0,
+        limit=limit,
+    )
+    if not first_page.items:
+        logger.debug("Vista MCP tool %s returned no items on page 0", tool_name)
+        return
+    yield first_page.items
+
+    page_size = first_page.returned
+    total_available = first_page.total_available
+    if total_available is None:
+        offset = page_size
+        for page_index in range(1, max_pages):
+            page = await _fetch_page(
+                vista_mcp,
+                tool_name=tool_name,
+                arguments=arguments,
+                item_key=item_key,
+                offset=offset,
+                limit=limit,
+            )
+            if not page.items:
+                logger.debug(
+                    "Vista MCP tool %s returned no items on page %s",
+                    tool_name,
+                    page_index,
+                )
+                return
+            yield page.items
+
+            offset += page.returned
+            if page.total_available is not None and offset >= page.total_available:
+                return
+        return
+
+    offsets = list(range(page_size, total_available, page_size))[: max_pages - 1]
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _fetch_limited(offset: int) -> _Page:
+        async with semaphore:
+            return await _fetch_page(
+                vista_mcp,
+                tool_name=tool_name,
+                arguments=arguments,
+                item_key=item_key,
+                offset=offset,
+                limit=limit,
             )
-            break
 
-        offset += returned
-        if total_available is not None and offset >= total_available:
-            break
+    tasks = [asyncio.create_task(_fetch_limited(offset)) for offset in offsets]
+    try:
+        for page_index, task in enumerate(tasks, start=1):
+            page = await task
+            if not page.items:
+                logger.debug(
+                    "Vista MCP tool %s returned no items on page %s",
+                    tool_name,
+                    page_index,
+                )
+                return
+            yield page.items
+    finally:
+        await _cancel_pending(tasks)
+
+
+async def _cancel_pending(tasks: list[asyncio.Task[_Page]]) -> None:
+    for task in tasks:
+        if not task.done():
+            _ = task.cancel()
+    if tasks:
+        _ = await asyncio.wait(tasks)
+    for task in tasks:
+        if not task.cancelled():
+            # Retrieve so abandoned failures are not reported as unhandled
+            _ = task.exception()
+
+
+@dataclass(frozen=True)
+class _Page:
+    items: list[JsonDict]
+    returned: int
+    total_available: int | None
+
+
+async def _fetch_page(
+    vista_mcp: MCPServerStreamableHttp,
+    *,
+    tool_name: str,
+    arguments: Mapping[str, JSONValue],
+    item_key: str,
+    offset: int,
+    limit: int,
+) -> _Page:
+    payload = await call_vista_tool(
+        vista_mcp,
+        tool_name,
+        {
+            **arguments,
+            "offset": offset,
+            "limit": limit,
+        },
+    )
 
-    return items
+    data = _ensure_dict(payload.get("data"))
+    page_items = _ensure_list_of_dicts(data.get(item_key))
+
+    metadata = _ensure_dict(payload.get("metadata"))
+    pagination = _ensure_dict(metadata.get("pagination"))
+    return _Page(
+        items=page_items,
+        returned=_to_int(pagination.get("returned")) or len(page_items),
+        total_available=_to_int(pagination.get("total_available_items")),
+    )
 
 
 def _simplify_medications(medications: list[JsonDict]) -> list[MedicationRecord]:
@@ -0,0 +1,111 @@
+"""Tests for the Azure OpenAI RPM/TPM quota."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.services.azure_rate_limiter import (
+    AzureOpenAICooldown,
+    AzureOpenAIQuota,
+    TokenBucket,
+    estimate_request_tokens,
+    parse_retry_after,
+)
+
+MONOTONIC = "app.services.azure_rate_limiter.time.monotonic"
+
+
+def make_quota(*, rpm: int = 0, tpm: int = 0) -> AzureOpenAIQuota:
+    return AzureOpenAIQuota(
+        requests_per_minute=rpm, tokens_per_minute=tpm, cooldown=AzureOpenAICooldown()
+    )
+
+
+def test_bucket_refills_over_time():
+    with patch(MONOTONIC, return_value=0.0):
+        bucket = TokenBucket(60)
+        assert bucket.take(60) == 0.0
+        assert bucket.take(1) == pytest.approx(1.0)
+    with patch(MONOTONIC, return_value=30.0):
+        assert bucket.level == pytest.approx(30.0)
+
+
+def test_bucket_calibrates_down_to_server_remaining():
+    bucket = TokenBucket(1000)
+    bucket.calibrate(100)
+
+    assert bucket.level < 200
+
+
+def test_estimate_includes_max_tokens():
+    body = json.dumps({"messages": [{"content": "x" * 400}], "max_tokens": 500})
+
+    assert estimate_request_tokens(body.encode()) == len(body) // 4 + 500
+
+
+def test_parse_retry_after_prefers_milliseconds():
+    assert parse_retry_after({"retry-after-ms": "1500", "retry-after": "2"}) == 1.5
+    assert parse_retry_after({"retry-after": "2"}) == 2.0
+    assert parse_retry_after({}) is None
+
+
+@pytest.mark.asyncio
+class TestAzureOpenAIQuota:
+    """Test pacing and header-driven recalibration."""
+
+    async def test_acquire_waits_when_tokens_exhausted(self):
+        quota = make_quota(tpm=600)
+        sleeps: list[float] = []
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+            # Let the bucket fully refill
+            quota._tokens._level = quota._tokens.capacity
+
+        with patch("app.services.azure_rate_limiter.asyncio.sleep", fake_sleep):
+            await quota.acquire(600)
+            await quota.acquire(300)
+
+        assert len(sleeps) == 1
+        assert sleeps[0] > 0
+
+    async def test_small_request_is_not_queued_behind_a_refill_wait(self):
+        quota = make_quota(tpm=600)
+        quota._tokens._level = 100
+        refilled = asyncio.Event()
+
+        async def fake_sleep(_delay: float) -> None:
+            await refilled.wait()
+            quota._tokens._level = quota._tokens.capacity
+
+        with patch("app.services.azure_rate_limiter.asyncio.sleep", fake_sleep):
+            large = asyncio.create_task(quota.acquire(500))
+            # asyncio.sleep is patched; wait() yields to the task without it
+            _ = await asyncio.wait({large}, timeout=0.01)
+            # Fits in what is left while the large request waits for tokens
+            await asyncio.wait_for(quota.acquire(50), timeout=1)
+            assert not large.done()
+            refilled.set()
+            await large
+
+    async def test_retry_after_pauses_new_requests(self):
+        quota = make_quota(rpm=100)
+        sleeps: list[float] = []
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+            quota._cooldown._until = 0.0
+
+        quota.observe(429, {"retry-after": "5", "x-ratelimit-remaining-requests": "0"})
+        with patch("app.services.azure_rate_limiter.asyncio.sleep", fake_sleep):
+            quota._requests._level = 100
+            await quota.acquire(10)
+
+        assert sleeps and sleeps[0] == pytest.approx(5.0, abs=0.5)
+
+    async def test_disabled_quota_never_waits(self):
+        quota = make_quota()
+
+        await quota.acquire(1_000_000)
@@ -0,0 +1,192 @@
+"""Tests for health-weighted routing and failover across Azure deployments."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.config import settings
+from app.services.azure_openai_router import AzureOpenAIRouter, DeploymentTarget
+from app.services.azure_rate_limiter import (
+    AzureOpenAICooldown,
+    AzureOpenAIQuota,
+    AzureRateLimiter,
+    RequestPriority,
+    azure_openai_cooldown,
+)
+
+
+class Throttled(Exception):
+    status_code = 429
+
+    def __init__(self) -> None:
+        super().__init__("429 Too Many Requests")
+        self.response = MagicMock(headers={"retry-after": "20"})
+
+
+def make_target(name: str, *, model: str = "gpt-4o", weight: float = 1.0):
+    target = DeploymentTarget(
+        name=name,
+        deployment=model,
+        model=model,
+        weight=weight,
+        client=MagicMock(),
+        quota=AzureOpenAIQuota(
+            requests_per_minute=0, tokens_per_minute=0, cooldown=AzureOpenAICooldown()
+        ),
+    )
+    chat_model = MagicMock()
+    chat_model.get_response = AsyncMock(return_value=f"response from {name}")
+    target.chat_model = MagicMock(return_value=chat_model)
+    return target, chat_model
+
+
+async def get_response(router: AzureOpenAIRouter, model_name: str = "gpt-4o"):
+    return await router.model(model_name).get_response(
+        None,
+        "ping",
+        MagicMock(),
+        [],
+        None,
+        [],
+        MagicMock(),
+        previous_response_id=None,
+        prompt=None,
+    )
+
+
+class TestCandidates:
+    """Test ordering of deployments for a call."""
+
+    def test_paused_deployments_are_tried_last(self):
+        east, _ = make_target("east")
+        west, _ = make_target("west")
+        east.cooldown.trip(30)
+
+        candidates = AzureOpenAIRouter([east, west]).candidates("gpt-4o")
+
+        assert [t.name for t in candidates] == ["west", "east"]
+
+    def test_only_matching_model_is_considered(self):
+        large, _ = make_target("large", model="gpt-4o")
+        small, _ = make_target("small", model="gpt-4o-mini")
+
+        candidates = AzureOpenAIRouter([large, small]).candidates("gpt-4o-mini")
+
+        assert [t.name for t in candidates] == ["small"]
+
+    def test_unhealthy_deployment_scores_lower(self):
+        healthy, _ = make_target("healthy")
+        flaky, _ = make_target("flaky")
+        healthy.record_success(1.0)
+        flaky.record_success(4.0)
+        flaky.record_failure(Exception("boom"), failover=False)
+
+        assert healthy.score() > flaky.score()
+
+
+@pytest.mark.asyncio
+class TestTargets:
+    """Test per-model cooldowns, implicit primary targets and client cleanup."""
+
+    async def test_cooldown_only_covers_the_models_deployments(self):
+        large, _ = make_target("large", model="gpt-4o")
+        small, _ = make_target("small", model="gpt-4o-mini")
+        large.cooldown.trip(30)
+        router = AzureOpenAIRouter([large, small])
+
+        assert router.cooldown_for("gpt-4o").remaining() > 0
+        assert router.cooldown_for("gpt-4o-mini").remaining() == 0
+
+    async def test_unconfigured_model_gets_primary_limits_and_cooldown(self):
+        with (
+            patch.object(settings, "azure_openai_requests_per_minute", 60),
+            patch(
+                "app.services.azure_openai_router.build_azure_openai_client",
+                return_value=MagicMock(),
+            ),
+        ):
+            router = AzureOpenAIRouter([make_target("primary")[0]])
+            [target] = router.targets_for("gpt-4o-mini")
+
+        await target.quota.acquire(100)
+
+        assert target.cooldown is azure_openai_cooldown
+        assert target.quota.remaining_fraction() < 1.0
+
+    async def test_close_skips_the_shared_client(self):
+        owned, _ = make_target("owned")
+        shared, _ = make_target("shared")
+        owned.client.close = AsyncMock()
+        shared.client.close = AsyncMock()
+        shared.owns_client = False
+
+        await AzureOpenAIRouter([owned, shared]).close()
+
+        owned.client.close.assert_awaited_once()
+        shared.client.close.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestFailover:
+    """Test that throttled calls move to the next deployment."""
+
+    async def test_throttled_call_fails_over(self):
+        east, east_model = make_target("east", weight=1000)
+        west, _ = make_target("west", weight=0.001)
+        east_model.get_response.side_effect = Throttled()
+        router = AzureOpenAIRouter([east, west])
+
+        response = await get_response(router)
+
+        assert response == "response from west"
+        assert east.cooldown.remaining() == pytest.approx(20, abs=1)
+        assert east.failures == 1
+
+    async def test_non_retryable_error_is_raised(self):
+        east, east_model = make_target("east", weight=1000)
+        west, west_model = make_target("west", weight=0.001)
+        east_model.get_response.side_effect = ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            _ = await get_response(AzureOpenAIRouter([east, west]))
+
+        west_model.get_response.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestPerCallSlots:
+    """Test that prioritized models hold a limiter slot only while calling."""
+
+    async def test_slot_is_held_for_the_call_only(self):
+        limiter = AzureRateLimiter(
+            max_concurrency=1, max_attempts=1, base_delay_seconds=0, jitter_seconds=0
+        )
+        target, chat_model = make_target("east")
+        active_during_call: list[object] = []
+
+        async def respond(*_args, **_kwargs):
+            active_during_call.append(limiter.stats()["active"])
+            return "response"
+
+        chat_model.get_response.side_effect = respond
+        router = AzureOpenAIRouter([target])
+
+        with patch("app.services.azure_openai_router.azure_rate_limiter", limiter):
+            _ = await router.model(
+                "gpt-4o", priority=RequestPriority.INTERACTIVE, user_key="1"
+            ).get_response(
+                None,
+                "ping",
+                MagicMock(),
+                [],
+                None,
+                [],
+                MagicMock(),
+                previous_response_id=None,
+                prompt=None,
+            )
+            unprioritized = await get_response(router)
+
+        assert unprioritized == "response"
+        assert active_during_call == [1, 0]
+        assert limiter.stats()["active"] == 0
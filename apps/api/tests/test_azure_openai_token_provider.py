@@ -0,0 +1,53 @@
+"""Tests for the managed identity token provider used by the shared client."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from azure.core.credentials import AccessToken
+
+from app.services.azure_openai import ManagedIdentityTokenProvider
+
+
+def make_credential(*tokens: AccessToken) -> AsyncMock:
+    credential = AsyncMock()
+    credential.get_token.side_effect = list(tokens)
+    return credential
+
+
+@pytest.mark.asyncio
+class TestManagedIdentityTokenProvider:
+    """Test token caching and ahead-of-expiry refresh."""
+
+    async def test_caches_token_until_refresh_margin(self):
+        credential = make_credential(AccessToken("first", int(time.time()) + 3600))
+        provider = ManagedIdentityTokenProvider(credential, refresh_margin_seconds=300)
+
+        assert await provider() == "first"
+        assert await provider() == "first"
+        assert credential.get_token.await_count == 1
+
+    async def test_refreshes_in_background_near_expiry(self):
+        credential = make_credential(
+            AccessToken("old", int(time.time()) + 60),
+            AccessToken("new", int(time.time()) + 3600),
+        )
+        provider = ManagedIdentityTokenProvider(credential, refresh_margin_seconds=300)
+
+        assert await provider() == "old"
+        # Within the margin: the current token is still served while refreshing
+        assert await provider() == "old"
+        await asyncio.sleep(0)
+
+        assert await provider() == "new"
+        assert credential.get_token.await_count == 2
+
+    async def test_concurrent_callers_share_one_fetch(self):
+        credential = make_credential(AccessToken("token", int(time.time()) + 3600))
+        provider = ManagedIdentityTokenProvider(credential, refresh_margin_seconds=300)
+
+        tokens = await asyncio.gather(*(provider() for _ in range(5)))
+
+        assert tokens == ["token"] * 5
+        assert credential.get_token.await_count == 1
@@ -0,0 +1,266 @@
+"""Tests for scheduling and adaptive concurrency in AzureRateLimiter."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.services.azure_rate_limiter import (
+    AzureOpenAICooldown,
+    AzureRateLimiter,
+    RequestPriority,
+)
+
+
+def make_limiter(max_concurrency: int = 1) -> AzureRateLimiter:
+    return AzureRateLimiter(
+        max_concurrency=max_concurrency,
+        max_attempts=1,
+        base_delay_seconds=0,
+        jitter_seconds=0,
+    )
+
+
+MONOTONIC = "app.services.azure_rate_limiter.time.monotonic"
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+class TestAzureRateLimiterScheduling:
+    """Test slot ordering across priorities and users."""
+
+    async def queue_and_release(
+        self, limiter: AzureRateLimiter, waiters: list[tuple[str, RequestPriority]]
+    ) -> list[str]:
+        order: list[str] = []
+        blocker = asyncio.Event()
+
+        async def hold() -> None:
+            async with limiter.slot():
+                await blocker.wait()
+
+        async def wait(name: str, priority: RequestPriority) -> None:
+            async with limiter.slot(priority=priority, user_key=name.split("-")[0]):
+                order.append(name)
+
+        holder = asyncio.create_task(hold())
+        await settle()
+        tasks = []
+        for name, priority in waiters:
+            tasks.append(asyncio.create_task(wait(name, priority)))
+            await settle()
+        blocker.set()
+        await asyncio.gather(holder, *tasks)
+        return order
+
+    async def test_interactive_requests_jump_the_queue(self):
+        order = await self.queue_and_release(
+            make_limiter(),
+            [
+                ("a-1", RequestPriority.BACKGROUND),
+                ("b-1", RequestPriority.ON_DEMAND),
+                ("c-1", RequestPriority.INTERACTIVE),
+            ],
+        )
+
+        assert order == ["c-1", "b-1", "a-1"]
+
+    async def test_users_are_served_round_robin(self):
+        order = await self.queue_and_release(
+            make_limiter(),
+            [
+                ("a-1", RequestPriority.ON_DEMAND),
+                ("a-2", RequestPriority.ON_DEMAND),
+                ("a-3", RequestPriority.ON_DEMAND),
+                ("b-1", RequestPriority.ON_DEMAND),
+            ],
+        )
+
+        assert order == ["a-1", "b-1", "a-2", "a-3"]
+
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        limiter = make_limiter()
+        blocker = asyncio.Event()
+
+        async def hold() -> None:
+            async with limiter.slot():
+                await blocker.wait()
+
+        holder = asyncio.create_task(hold())
+        await settle()
+        waiter = asyncio.create_task(limiter.run(lambda: asyncio.sleep(0)))
+        await settle()
+        _ = waiter.cancel()
+        blocker.set()
+        await holder
+
+        assert await limiter.run(lambda: asyncio.sleep(0, result="ok")) == "ok"
+        stats = limiter.stats()
+        assert stats["active"] == 0
+        assert stats["queue_wait"]["on_demand"]["queued"] == 0
+
+    async def test_reserved_slots_are_only_for_interactive_requests(self):
+        limiter = AzureRateLimiter(
+            max_concurrency=1,
+            max_attempts=1,
+            base_delay_seconds=0,
+            jitter_seconds=0,
+            interactive_reserved=1,
+        )
+        blocker = asyncio.Event()
+
+        async def hold(priority: RequestPriority) -> None:
+            async with limiter.slot(priority=priority):
+                await blocker.wait()
+
+        summary = asyncio.create_task(hold(RequestPriority.ON_DEMAND))
+        await settle()
+        queued = asyncio.create_task(hold(RequestPriority.ON_DEMAND))
+        chat = asyncio.create_task(hold(RequestPriority.INTERACTIVE))
+        await settle()
+
+        stats = limiter.stats()
+        assert stats["active"] == 2
+        assert stats["queue_wait"]["on_demand"]["queued"] == 1
+        blocker.set()
+        await asyncio.gather(summary, queued, chat)
+
+
+def make_adaptive_limiter() -> AzureRateLimiter:
+    return AzureRateLimiter(
+        max_concurrency=2,
+        max_attempts=1,
+        base_delay_seconds=0,
+        jitter_seconds=0,
+        adaptive=True,
+        min_concurrency=1,
+        max_concurrency_ceiling=4,
+    )
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, message: str, response: object = None) -> None:
+        super().__init__(message)
+        self.response = response
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def model_call(
+    limiter: AzureRateLimiter,
+    clock: FakeClock,
+    *,
+    status_code: int = 200,
+    latency: float = 1.0,
+    stream: bool = False,
+) -> None:
+    """Drive the limiter's httpx hooks for one Azure OpenAI call."""
+    request = httpx.Request(
+        "POST",
+        "https://east.openai.azure.com/openai/deployments/gpt-4o/chat/completions",
+    )
+    content_type = "text/event-stream" if stream else "application/json"
+    response = httpx.Response(
+        status_code, headers={"content-type": content_type}, request=request
+    )
+    with patch(MONOTONIC, clock):
+        await limiter.mark_request(request)
+        clock.now += latency
+        await limiter.record_response(response)
+    clock.now += 1
+
+
+@pytest.mark.asyncio
+class TestAdaptiveConcurrency:
+    """Test AIMD growth and backoff within floor and ceiling."""
+
+    async def test_successes_grow_limit_up_to_ceiling(self):
+        limiter, clock = make_adaptive_limiter(), FakeClock()
+
+        for _ in range(20):
+            await model_call(limiter, clock)
+
+        assert limiter.stats()["max_concurrency"] == 4
+
+    async def test_throttling_halves_limit_down_to_floor(self):
+        limiter, clock = make_adaptive_limiter(), FakeClock()
+
+        for _ in range(3):
+            await model_call(limiter, clock, status_code=429)
+
+        assert limiter.stats()["max_concurrency"] == 1
+
+    async def test_latency_is_compared_per_response_kind(self):
+        limiter, clock = make_adaptive_limiter(), FakeClock()
+        for _ in range(5):
+            await model_call(limiter, clock, latency=0.5, stream=True)
+        grown = limiter.stats()["concurrency_limit"]
+
+        # A full completion takes longer than a stream's first token: not a spike
+        await model_call(limiter, clock, latency=8.0)
+        assert limiter.stats()["concurrency_limit"] > grown
+
+        await model_call(limiter, clock, latency=30.0)
+        assert limiter.stats()["concurrency_limit"] < grown
+
+    async def test_whole_runs_do_not_feed_the_limit(self):
+        limiter = make_adaptive_limiter()
+
+        async def throttled() -> None:
+            raise RateLimited("429 Too Many Requests")
+
+        with pytest.raises(RateLimited):
+            _ = await limiter.run(throttled)
+
+        assert limiter.stats()["max_concurrency"] == 2
+
+    async def test_fixed_limit_without_adaptive_mode(self):
+        limiter = make_limiter(max_concurrency=2)
+
+        for _ in range(10):
+            _ = await limiter.run(lambda: asyncio.sleep(0))
+
+        assert limiter.stats()["max_concurrency"] == 2
+
+
+@pytest.mark.asyncio
+class TestSharedCooldown:
+    """Test that a Retry-After pauses other callers sharing the cooldown."""
+
+    async def test_retry_after_pauses_other_runs(self):
+        cooldown = AzureOpenAICooldown()
+        limiter = AzureRateLimiter(
+            max_concurrency=2,
+            max_attempts=1,
+            base_delay_seconds=0,
+            jitter_seconds=0,
+            cooldown=cooldown,
+        )
+        response = MagicMock(headers={"retry-after-ms": "200"})
+
+        async def throttled() -> None:
+            raise RateLimited("429 Too Many Requests", response)
+
+        with pytest.raises(RateLimited):
+            _ = await limiter.run(throttled)
+
+        assert 0 < cooldown.remaining() <= 0.2
+        other = asyncio.create_task(limiter.run(lambda: asyncio.sleep(0, "done")))
+        await settle()
+        assert not other.done()
+
+        assert await other == "done"
+        assert cooldown.trips == 1
@@ -0,0 +1,119 @@
+"""Tests for the deterministic chat fast path."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.agents.context import MedicationRunContext
+from app.agents.tools import _load_medications
+from app.services.chat_fast_path import (
+    ChatIntent,
+    answer_chat_intent,
+    classify_chat_intent,
+)
+from app.services.patient_data_cache import PatientDataCache
+
+
+@pytest.fixture
+def fresh_cache():
+    cache = PatientDataCache(ttl_seconds=300, max_entries=10, max_bytes=10_000)
+    with patch("app.services.patient_data_cache.patient_data_cache", cache):
+        yield cache
+
+
+@pytest.mark.parametrize(
+    ("message", "intent"),
+    [
+        ("What are the current vitals?", ChatIntent.VITALS),
+        ("Show me recent labs", ChatIntent.LABS),
+        ("What medications is the patient on?", ChatIntent.MEDICATIONS),
+        ("List current diagnoses", ChatIntent.PROBLEMS),
+        ("patient's meds", ChatIntent.MEDICATIONS),
+    ],
+)
+def test_simple_requests_are_classified(message, intent):
+    assert classify_chat_intent(message) is intent
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "Show recent consultations",
+        "What was the A1C trend in labs?",
+        "Are the vitals and labs stable?",
+        "Which medications could explain the low potassium?",
+        "",
+    ],
+)
+def test_qualified_requests_go_to_the_agent(message):
+    assert classify_chat_intent(message) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("fresh_cache")
+class TestAnswerChatIntent:
+    """Test rendering of Vista data loaded through the patient data cache."""
+
+    async def test_labs_are_rendered_per_series(self):
+        labs = {
+            "POTASSIUM": [
+                {"value": "4.1", "units": "mmol/L", "date": "2026-05-01"},
+                {"value": "3.9", "units": "mmol/L", "date": "2026-01-01"},
+            ]
+        }
+        with patch(
+            "app.services.patient_data_cache.vista_tools.fetch_labs",
+            AsyncMock(return_value=labs),
+        ) as fetch_labs:
+            lines = await answer_chat_intent(
+                ChatIntent.LABS,
+                MagicMock(),
+                user_duz="111",
+                patient_icn="123V456",
+                station="500",
+            )
+
+        assert fetch_labs.await_args.kwargs["patient_icn"] == "123V456"
+        assert lines[1] == (
+            "- **POTASSIUM**: 4.1 mmol/L (2026-05-01); 3.9 mmol/L (2026-01-01)\n"
+        )
+
+    async def test_empty_medication_list_says_so(self):
+        with patch(
+            "app.services.patient_data_cache.vista_tools.fetch_medications",
+            AsyncMock(return_value=[]),
+        ):
+            lines = await answer_chat_intent(
+                ChatIntent.MEDICATIONS,
+                MagicMock(),
+                user_duz="111",
+                patient_icn="1",
+                station=None,
+            )
+
+        assert lines == ["No medications found in Vista for the last 183 days."]
+
+    async def test_agent_tools_reuse_the_fast_path_fetch(self):
+        with patch(
+            "app.services.patient_data_cache.vista_tools.fetch_medications",
+            AsyncMock(return_value=[]),
+        ) as fetch_medications:
+            _ = await answer_chat_intent(
+                ChatIntent.MEDICATIONS,
+                MagicMock(),
+                user_duz="111",
+                patient_icn="1",
+                station="500",
+            )
+            _ = await _load_medications(
+                MedicationRunContext(
+                    vista_mcp=MagicMock(),
+                    patient_icn="1",
+                    station="500",
+                    user_duz="111",
+                ),
+                include_pending=True,
+                days_back=None,
+            )
+
+        fetch_medications.assert_awaited_once()
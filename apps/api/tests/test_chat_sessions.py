@@ -0,0 +1,107 @@
+"""Tests for the server-side chat session store."""
+
+from unittest.mock import patch
+
+from app.services.chat_sessions import ChatSessionKey, ChatSessionStore
+
+
+def make_store(**overrides) -> ChatSessionStore:
+    options = {"max_sessions": 10, "ttl_seconds": 60.0, "max_history_tokens": 10_000}
+    options.update(overrides)
+    return ChatSessionStore(**options)
+
+
+def make_turn(question: str, answer: str, tool_output: str = "") -> list:
+    items = [{"role": "user", "content": f"Patient ICN: 1\n\n{question}"}]
+    if tool_output:
+        items.append(
+            {"type": "function_call_output", "call_id": "c1", "output": tool_output}
+        )
+    items.append(
+        {
+            "type": "message",
+            "role": "assistant",
+            "content": [{"type": "output_text", "text": answer}],
+        }
+    )
+    return items
+
+
+KEY = ChatSessionKey(owner="user-1", conversation_id="abc")
+
+
+def test_follow_up_sees_previous_turn_with_tool_output():
+    store = make_store()
+    session = store.get_or_create(KEY, patient_icn="1")
+    store.save(session, make_turn("Show labs", "Potassium 4.1", tool_output="{}"))
+
+    history = store.get_or_create(KEY, patient_icn="1").history()
+
+    assert len(history) == 3
+    assert history[1]["type"] == "function_call_output"
+    assert store.stats().hits == 1
+
+
+def test_regenerated_answer_replaces_the_last_turn():
+    store = make_store()
+    session = store.get_or_create(KEY, patient_icn="1")
+    store.save(session, make_turn("Show labs", "Potassium 4.1"))
+    store.save(session, make_turn("And vitals?", "BP 120/80"))
+    repeated = make_turn("And vitals?", "BP 118/76")
+
+    regenerate = session.repeats_last_turn(repeated[0])
+    history = session.history(exclude_last=regenerate)
+    store.save(session, repeated, replace_last=regenerate)
+
+    assert regenerate
+    assert len(history) == 2
+    assert [turn[-1]["content"][0]["text"] for turn in session.turns] == [
+        "Potassium 4.1",
+        "BP 118/76",
+    ]
+    assert not session.repeats_last_turn(make_turn("Show labs", "")[0])
+
+
+def test_old_turns_are_compacted_into_a_summary():
+    store = make_store(max_history_tokens=300)
+    session = store.get_or_create(KEY, patient_icn="1")
+    store.save(session, make_turn("Show labs", "Potassium 4.1", "x" * 2000))
+    store.save(session, make_turn("And vitals?", "BP 120/80"))
+
+    history = session.history()
+
+    assert history[0]["role"] == "system"
+    assert "User: Show labs" in history[0]["content"]
+    assert "Assistant: Potassium 4.1" in history[0]["content"]
+    assert "x" * 100 not in str(history)
+    assert len(session.turns) == 1
+    assert store.stats().compacted_turns == 1
+
+
+def test_sessions_are_per_owner_and_per_patient():
+    store = make_store()
+    session = store.get_or_create(KEY, patient_icn="1")
+    store.save(session, make_turn("Show labs", "Potassium 4.1"))
+
+    other_user = ChatSessionKey(owner="user-2", conversation_id="abc")
+    assert store.get_or_create(other_user, patient_icn="1").turns == []
+    assert store.get_or_create(KEY, patient_icn="2").turns == []
+    assert store.get_or_create(KEY, patient_icn="1").turns == []
+    assert store.stats().resets == 1
+
+
+def test_idle_and_least_recently_used_sessions_are_dropped():
+    store = make_store(max_sessions=1, ttl_seconds=10.0)
+    first = store.get_or_create(KEY, patient_icn="1")
+    store.save(first, make_turn("Show labs", "Potassium 4.1"))
+    second_key = ChatSessionKey(owner="user-1", conversation_id="def")
+    second = store.get_or_create(second_key, patient_icn="1")
+    store.save(second, make_turn("Show meds", "Metformin"))
+
+    assert store.stats().evictions == 1
+    assert store.get_or_create(KEY, patient_icn="1").turns == []
+
+    with patch("app.services.chat_sessions.time.monotonic") as now:
+        now.return_value = second.last_used + 11
+        assert store.get_or_create(second_key, patient_icn="1").turns == []
+    assert store.stats().expirations == 1
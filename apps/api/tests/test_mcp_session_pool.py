@@ -0,0 +1,150 @@
+"""Tests for the pooled Vista MCP session leasing."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.mcp_client import VistaMCPSessionPool
+
+
+class FakeVistaServer:
+    """Stand-in for MCPServerStreamableHttp that records connect/cleanup calls."""
+
+    def __init__(self):
+        self.session: AsyncMock | None = None
+        self.connect_calls = 0
+        self.cleanup_calls = 0
+
+    async def connect(self):
+        self.connect_calls += 1
+        await asyncio.sleep(0)
+        self.session = AsyncMock()
+
+    async def cleanup(self):
+        self.cleanup_calls += 1
+        self.session = None
+
+
+def make_pool(**overrides) -> VistaMCPSessionPool:
+    options = {
+        "max_size": 4,
+        "idle_timeout_seconds": 300,
+        "health_check_interval_seconds": 30,
+    }
+    options.update(overrides)
+    return VistaMCPSessionPool(**options)
+
+
+@pytest.fixture
+def built_servers():
+    servers: list[FakeVistaServer] = []
+
+    def _build(*_args, **_kwargs):
+        server = FakeVistaServer()
+        servers.append(server)
+        return server
+
+    with patch("app.services.mcp_client._build_vista_mcp_client", side_effect=_build):
+        yield servers
+
+
+@pytest.mark.asyncio
+class TestVistaMCPSessionPool:
+    """Test session reuse, isolation, and eviction."""
+
+    async def test_reuses_session_for_same_credentials(self, built_servers):
+        pool = make_pool()
+
+        async with pool.lease("jwt", user_duz="1", station="500") as first:
+            pass
+        async with pool.lease("jwt", user_duz="1", station="500") as second:
+            pass
+
+        assert first is second
+        assert len(built_servers) == 1
+        assert built_servers[0].connect_calls == 1
+        assert built_servers[0].cleanup_calls == 0
+        await pool.close()
+        assert built_servers[0].cleanup_calls == 1
+
+    @pytest.mark.usefixtures("built_servers")
+    async def test_separate_sessions_per_identity(self):
+        pool = make_pool()
+
+        async with pool.lease("jwt-a", user_duz="1", station="500") as first:
+            pass
+        async with pool.lease("jwt-b", user_duz="1", station="500") as second:
+            pass
+        async with pool.lease("jwt-a", user_duz="1", station="530") as third:
+            pass
+
+        assert len({id(first), id(second), id(third)}) == 3
+        assert pool.size == 3
+        await pool.close()
+
+    async def test_concurrent_leases_connect_once(self, built_servers):
+        pool = make_pool()
+
+        async def _lease():
+            async with pool.lease("jwt", user_duz="1", station="500") as server:
+                await asyncio.sleep(0.01)
+                return server
+
+        results = await asyncio.gather(*(_lease() for _ in range(5)))
+
+        assert all(server is results[0] for server in results)
+        assert len(built_servers) == 1
+        await pool.close()
+
+    async def test_idle_sessions_are_evicted(self, built_servers):
+        pool = make_pool(idle_timeout_seconds=0)
+
+        async with pool.lease("jwt", user_duz="1", station="500"):
+            pass
+        async with pool.lease("jwt", user_duz="1", station="500"):
+            pass
+
+        assert len(built_servers) == 2
+        assert built_servers[0].cleanup_calls == 1
+        await pool.close()
+
+    async def test_unhealthy_session_is_replaced(self, built_servers):
+        pool = make_pool(health_check_interval_seconds=0)
+
+        async with pool.lease("jwt", user_duz="1", station="500"):
+            pass
+        built_servers[0].session.send_ping.side_effect = RuntimeError("gone")
+
+        async with pool.lease("jwt", user_duz="1", station="500") as server:
+            assert server is built_servers[1]
+
+        assert built_servers[0].cleanup_calls == 1
+        await pool.close()
+
+    async def test_overflow_sessions_are_closed_on_release(self, built_servers):
+        pool = make_pool(max_size=1)
+
+        async with (
+            pool.lease("jwt-a", user_duz="1", station="500"),
+            pool.lease("jwt-b", user_duz="1", station="500") as overflow,
+        ):
+            assert pool.size == 1
+
+        assert overflow is built_servers[1]
+        assert built_servers[1].cleanup_calls == 1
+        assert built_servers[0].cleanup_calls == 0
+        await pool.close()
+
+    @pytest.mark.usefixtures("built_servers")
+    async def test_failed_connect_is_not_pooled(self):
+        pool = make_pool()
+
+        with (
+            patch.object(FakeVistaServer, "connect", side_effect=OSError("refused")),
+            pytest.raises(OSError),
+        ):
+            async with pool.lease("jwt", user_duz="1", station="500"):
+                pass
+
+        assert pool.size == 0
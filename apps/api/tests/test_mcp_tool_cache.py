@@ -0,0 +1,73 @@
+"""Tests for the conversation-scoped MCP tool result cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from mcp.types import CallToolResult, TextContent
+
+from app.services.mcp_tool_cache import CachingMCPServer, ToolResultCache
+
+
+def make_result(text: str, *, is_error: bool = False) -> CallToolResult:
+    return CallToolResult(
+        content=[TextContent(type="text", text=text)], isError=is_error
+    )
+
+
+def make_server(*results: CallToolResult) -> MagicMock:
+    server = MagicMock(use_structured_content=False)
+    server.call_tool = AsyncMock(side_effect=list(results))
+    return server
+
+
+@pytest.mark.asyncio
+class TestCachingMCPServer:
+    """Test reuse, error handling, TTL and the memory cap."""
+
+    async def test_repeat_call_with_same_arguments_is_served_from_cache(self):
+        server = make_server(make_result("labs"))
+        cache = ToolResultCache(ttl_seconds=60, max_bytes=10_000)
+        wrapped = CachingMCPServer(server, cache)
+
+        first = await wrapped.call_tool("get_patient_labs", {"icn": "1", "days": 30})
+        second = await wrapped.call_tool("get_patient_labs", {"days": 30, "icn": "1"})
+
+        assert first is second
+        assert server.call_tool.await_count == 1
+
+    async def test_errors_are_not_cached(self):
+        server = make_server(make_result("boom", is_error=True), make_result("ok"))
+        wrapped = CachingMCPServer(
+            server, ToolResultCache(ttl_seconds=60, max_bytes=10_000)
+        )
+
+        _ = await wrapped.call_tool("get_patient_labs", {})
+        result = await wrapped.call_tool("get_patient_labs", {})
+
+        assert not result.isError
+        assert server.call_tool.await_count == 2
+
+    async def test_expired_results_are_fetched_again(self):
+        server = make_server(make_result("old"), make_result("new"))
+        wrapped = CachingMCPServer(
+            server, ToolResultCache(ttl_seconds=10, max_bytes=10_000)
+        )
+
+        with patch("app.services.mcp_tool_cache.time.monotonic", return_value=0):
+            _ = await wrapped.call_tool("get_patient_vitals", {})
+        with patch("app.services.mcp_tool_cache.time.monotonic", return_value=11):
+            result = await wrapped.call_tool("get_patient_vitals", {})
+
+        assert result.content[0].text == "new"
+
+    async def test_memory_cap_evicts_least_recently_used(self):
+        size = len(make_result("a" * 100).model_dump_json())
+        cache = ToolResultCache(ttl_seconds=60, max_bytes=size * 2)
+        server = make_server(*(make_result(c * 100) for c in "abca"))
+        wrapped = CachingMCPServer(server, cache)
+
+        for tool in ("t1", "t2", "t3", "t1"):
+            _ = await wrapped.call_tool(tool, {})
+
+        assert server.call_tool.await_count == 4
+        assert cache.size_bytes <= size * 2
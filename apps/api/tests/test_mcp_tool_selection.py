@@ -0,0 +1,64 @@
+"""Tests for relevance-filtered MCP tool exposure."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from mcp.types import Tool
+
+from app.services.mcp_tool_selection import RelevantToolsMCPServer, ToolIndex
+
+
+def make_tool(name: str, description: str) -> Tool:
+    return Tool(name=name, description=description, inputSchema={"type": "object"})
+
+
+TOOLS = [
+    make_tool("get_patient_medications", "Active and pending outpatient medications"),
+    make_tool("get_patient_labs", "Laboratory results such as chemistry panels"),
+    make_tool("get_patient_vitals", "Vital signs including blood pressure"),
+    make_tool("get_patient_problems", "Problem list entries with ICD codes"),
+    make_tool("get_patient_consults", "Consult requests and their status"),
+]
+
+
+def names(tools) -> list[str]:
+    return [tool.name for tool in tools]
+
+
+def test_rank_picks_matching_tools_in_server_order():
+    index = ToolIndex(TOOLS)
+
+    assert names(index.rank("What are the recent labs and vitals?", 2)) == [
+        "get_patient_labs",
+        "get_patient_vitals",
+    ]
+
+
+def test_rank_understands_clinical_shorthand():
+    index = ToolIndex(TOOLS)
+
+    assert names(index.rank("list current meds", 1)) == ["get_patient_medications"]
+    assert names(index.rank("latest BP?", 1)) == ["get_patient_vitals"]
+    assert names(index.rank("any diagnoses?", 1)) == ["get_patient_problems"]
+
+
+def test_rank_falls_back_to_all_tools_without_a_match():
+    assert ToolIndex(TOOLS).rank("hello there", 2) == TOOLS
+
+
+@pytest.mark.asyncio
+class TestRelevantToolsMCPServer:
+    """Test the wrapper filters listings and delegates calls."""
+
+    async def test_lists_top_k_and_delegates_calls(self):
+        server = MagicMock(
+            use_structured_content=False,
+            list_tools=AsyncMock(return_value=TOOLS),
+            call_tool=AsyncMock(return_value="result"),
+        )
+        server.name = "vista-mcp"
+        wrapped = RelevantToolsMCPServer(server, query="show consults", top_k=1)
+
+        assert names(await wrapped.list_tools()) == ["get_patient_consults"]
+        assert await wrapped.call_tool("get_patient_labs", {}) == "result"
+        assert wrapped.name == "vista-mcp"
@@ -0,0 +1,66 @@
+"""Tests for the deterministic medication data prefetch stage."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.agents.context import MedicationRunContext
+from app.agents.tools import prefetch_medication_data
+
+
+def make_context(**options) -> MedicationRunContext:
+    return MedicationRunContext(
+        vista_mcp=MagicMock(),
+        patient_icn="1000000219V596118",
+        station="500",
+        user_duz="prefetch-test-duz",
+        options=options,
+    )
+
+
+@pytest.mark.asyncio
+class TestPrefetchMedicationData:
+    """Test concurrent loading with summary options."""
+
+    async def test_loads_all_datasets_with_options(self):
+        context = make_context(medication_include_pending=False, labs_days_back=90)
+        with (
+            patch(
+                "app.agents.tools.vista_tools.fetch_medications",
+                AsyncMock(return_value=[{"name": "METFORMIN"}]),
+            ) as fetch_medications,
+            patch(
+                "app.agents.tools.vista_tools.fetch_problems",
+                AsyncMock(return_value=[{"name": "DIABETES"}]),
+            ),
+            patch(
+                "app.agents.tools.vista_tools.fetch_labs",
+                AsyncMock(return_value={"A1C": []}),
+            ) as fetch_labs,
+            patch(
+                "app.agents.tools.vista_tools.fetch_vitals",
+                AsyncMock(return_value={"BP": []}),
+            ),
+        ):
+            prefetched = await prefetch_medication_data(context)
+
+        assert prefetched["medications"] == [{"name": "METFORMIN"}]
+        assert prefetched["vitals"] == {"BP": []}
+        assert fetch_medications.await_args.kwargs["include_pending"] is False
+        assert fetch_labs.await_args.kwargs["days_back"] == 90
+        # Later tool calls with the default parameters hit the run cache
+        assert context.get_cached_tool("fetch_labs", (90, 3)) == {"A1C": []}
+
+    async def test_failure_propagates(self):
+        context = make_context()
+        with (
+            patch(
+                "app.agents.tools.vista_tools.fetch_medications",
+                AsyncMock(side_effect=RuntimeError("vista down")),
+            ),
+            patch("app.agents.tools.vista_tools.fetch_problems", AsyncMock()),
+            patch("app.agents.tools.vista_tools.fetch_labs", AsyncMock()),
+            patch("app.agents.tools.vista_tools.fetch_vitals", AsyncMock()),
+            pytest.raises(RuntimeError),
+        ):
+            _ = await prefetch_medication_data(context)
@@ -0,0 +1,129 @@
+"""Tests for the cross-request patient data cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.patient_data_cache import (
+    PatientDataCache,
+    PatientDataKey,
+    load_labs,
+)
+
+
+def make_key(**overrides) -> PatientDataKey:
+    fields = {
+        "user_duz": "10000000219",
+        "station": "500",
+        "patient_icn": "1000000219V596118",
+        "tool": "fetch_medications",
+        "args": (True, 183),
+    }
+    fields.update(overrides)
+    return PatientDataKey(**fields)
+
+
+def make_cache(**overrides) -> PatientDataCache:
+    options = {"ttl_seconds": 300, "max_entries": 10, "max_bytes": 10_000}
+    options.update(overrides)
+    return PatientDataCache(**options)
+
+
+class TestPatientDataCache:
+    """Test TTL, LRU, scoping, and invalidation."""
+
+    def test_hit_and_miss_counters(self):
+        cache = make_cache()
+
+        assert cache.get(make_key()) is None
+        cache.set(make_key(), [{"name": "METFORMIN"}])
+
+        assert cache.get(make_key()) == [{"name": "METFORMIN"}]
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    def test_results_are_scoped_by_duz(self):
+        cache = make_cache()
+        cache.set(make_key(user_duz="111"), ["data"])
+
+        assert cache.get(make_key(user_duz="222")) is None
+
+    def test_entries_expire(self):
+        cache = make_cache(ttl_seconds=10)
+        with patch("app.services.patient_data_cache.time.monotonic", return_value=0):
+            cache.set(make_key(), ["data"])
+        with patch("app.services.patient_data_cache.time.monotonic", return_value=11):
+            assert cache.get(make_key()) is None
+
+        assert cache.stats().expirations == 1
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = make_cache(max_entries=2)
+        cache.set(make_key(tool="a"), ["a"])
+        cache.set(make_key(tool="b"), ["b"])
+        _ = cache.get(make_key(tool="a"))
+        cache.set(make_key(tool="c"), ["c"])
+
+        assert cache.get(make_key(tool="b")) is None
+        assert cache.get(make_key(tool="a")) == ["a"]
+        assert cache.stats().evictions == 1
+
+    def test_byte_budget_is_enforced(self):
+        cache = make_cache(max_bytes=50)
+        cache.set(make_key(tool="a"), ["x" * 30])
+        cache.set(make_key(tool="b"), ["y" * 30])
+
+        assert cache.get(make_key(tool="a")) is None
+        assert cache.stats().size_bytes <= 50
+
+    def test_invalidate_patient(self):
+        cache = make_cache()
+        cache.set(make_key(tool="a"), ["a"])
+        cache.set(make_key(tool="b", patient_icn="other"), ["b"])
+
+        assert cache.invalidate(patient_icn="1000000219V596118") == 1
+        assert cache.get(make_key(tool="a")) is None
+        assert cache.get(make_key(tool="b", patient_icn="other")) == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_only_loads_once(self):
+        cache = make_cache()
+        loader = AsyncMock(return_value=["data"])
+
+        assert await cache.get_or_load(make_key(), loader) == ["data"]
+        assert await cache.get_or_load(make_key(), loader) == ["data"]
+        assert loader.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_loads(self):
+        cache = make_cache(ttl_seconds=0)
+        loader = AsyncMock(return_value=["data"])
+
+        _ = await cache.get_or_load(make_key(), loader)
+        _ = await cache.get_or_load(make_key(), loader)
+
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_loaders_share_results_per_clinician(self):
+        cache = make_cache()
+        options = {
+            "patient_icn": "1000000219V596118",
+            "station": "500",
+            "days_back": 365,
+            "n_most_recent": 3,
+            "limit": 100,
+            "max_pages": 4,
+        }
+        with (
+            patch("app.services.patient_data_cache.patient_data_cache", cache),
+            patch(
+                "app.services.patient_data_cache.vista_tools.fetch_labs",
+                AsyncMock(return_value={"A1C": []}),
+            ) as fetch_labs,
+        ):
+            _ = await load_labs(MagicMock(), user_duz="111", **options)
+            _ = await load_labs(MagicMock(), user_duz="111", **options)
+            _ = await load_labs(MagicMock(), user_duz="222", **options)
+
+        assert fetch_labs.await_count == 2
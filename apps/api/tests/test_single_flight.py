@@ -0,0 +1,96 @@
+"""Tests for coalescing identical concurrent calls."""
+
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    """Test sharing, error propagation, and cancellation."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        flight: SingleFlight[str, int] = SingleFlight()
+        calls = 0
+
+        async def _work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(flight.do("key", _work) for _ in range(5)))
+
+        assert results == [42] * 5
+        assert calls == 1
+        assert flight.coalesced == 4
+        assert flight.in_flight == 0
+
+    async def test_different_keys_run_separately(self):
+        flight: SingleFlight[str, str] = SingleFlight()
+
+        async def _echo(value: str):
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(
+            flight.do("a", lambda: _echo("a")), flight.do("b", lambda: _echo("b"))
+        )
+
+        assert results == ["a", "b"]
+        assert flight.coalesced == 0
+
+    async def test_failure_propagates_to_every_waiter(self):
+        flight: SingleFlight[str, int] = SingleFlight()
+
+        async def _fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("vista down")
+
+        results = await asyncio.gather(
+            flight.do("key", _fail), flight.do("key", _fail), return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.in_flight == 0
+
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        flight: SingleFlight[str, int] = SingleFlight()
+
+        async def _work():
+            await asyncio.sleep(0.02)
+            return 7
+
+        first = asyncio.create_task(flight.do("key", _work))
+        second = asyncio.create_task(flight.do("key", _work))
+        await asyncio.sleep(0)
+        _ = first.cancel()
+
+        assert await second == 7
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    async def test_work_is_cancelled_when_all_waiters_leave(self):
+        flight: SingleFlight[str, int] = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def _work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return 1
+
+        waiter = asyncio.create_task(flight.do("key", _work))
+        await started.wait()
+        _ = waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert flight.in_flight == 0
@@ -0,0 +1,137 @@
+"""Tests for cancelling streams when the client disconnects."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.stream_disconnect import (
+    MAX_BUFFERED_CHUNKS,
+    StreamStats,
+    cancel_on_disconnect,
+)
+
+
+def make_request(disconnected: asyncio.Event) -> MagicMock:
+    request = MagicMock()
+
+    async def is_disconnected() -> bool:
+        return disconnected.is_set()
+
+    request.is_disconnected = is_disconnected
+    return request
+
+
+@pytest.mark.asyncio
+class TestCancelOnDisconnect:
+    """Test pass-through, cancellation of abandoned streams and the counters."""
+
+    async def test_complete_stream_passes_through(self):
+        stats = StreamStats()
+
+        async def stream():
+            yield "0:a\n"
+            yield "0:b\n"
+
+        chunks = [
+            chunk
+            async for chunk in cancel_on_disconnect(
+                make_request(asyncio.Event()),
+                stream(),
+                stats=stats,
+                poll_interval=0.01,
+            )
+        ]
+
+        assert chunks == ["0:a\n", "0:b\n"]
+        assert stats.as_dict() == {
+            "started": 1,
+            "completed": 1,
+            "abandoned": 0,
+            "active": 0,
+        }
+
+    async def test_disconnect_cancels_pending_work(self):
+        stats = StreamStats()
+        disconnected = asyncio.Event()
+        released = asyncio.Event()
+
+        async def stream():
+            try:
+                yield "0:a\n"
+                # e.g. a model call or a queued rate limiter slot
+                await asyncio.sleep(60)
+                yield "0:never\n"
+            finally:
+                released.set()
+
+        chunks: list[str] = []
+        async for chunk in cancel_on_disconnect(
+            make_request(disconnected), stream(), stats=stats, poll_interval=0.01
+        ):
+            chunks.append(chunk)
+            disconnected.set()
+
+        assert chunks == ["0:a\n"]
+        assert released.is_set()
+        assert stats.abandoned == 1
+        assert stats.completed == 0
+        assert stats.active == 0
+
+    async def test_closing_the_response_cancels_pending_work(self):
+        stats = StreamStats()
+        released = asyncio.Event()
+
+        async def stream():
+            try:
+                yield "0:a\n"
+                await asyncio.sleep(60)
+            finally:
+                released.set()
+
+        wrapped = cancel_on_disconnect(
+            make_request(asyncio.Event()), stream(), stats=stats, poll_interval=10
+        )
+        assert await anext(wrapped) == "0:a\n"
+        await wrapped.aclose()
+
+        assert released.is_set()
+        assert stats.abandoned == 1
+
+    async def test_slow_client_pauses_the_stream(self):
+        produced = 0
+
+        async def stream():
+            nonlocal produced
+            for index in range(MAX_BUFFERED_CHUNKS * 4):
+                produced += 1
+                yield f"0:{index}\n"
+
+        wrapped = cancel_on_disconnect(
+            make_request(asyncio.Event()),
+            stream(),
+            stats=StreamStats(),
+            poll_interval=10,
+        )
+        assert await anext(wrapped) == "0:0\n"
+        await asyncio.sleep(0.05)
+
+        # One chunk read, a full buffer, and one waiting to be put
+        assert produced <= MAX_BUFFERED_CHUNKS + 2
+        chunks = [chunk async for chunk in wrapped]
+        assert len(chunks) == MAX_BUFFERED_CHUNKS * 4 - 1
+
+    async def test_stream_errors_propagate(self):
+        async def stream():
+            yield "0:a\n"
+            raise RuntimeError("boom")
+
+        wrapped = cancel_on_disconnect(
+            make_request(asyncio.Event()),
+            stream(),
+            stats=StreamStats(),
+            poll_interval=0.01,
+        )
+        with pytest.raises(RuntimeError, match="boom"):
+            async for _chunk in wrapped:
+                pass
@@ -0,0 +1,247 @@
+"""Tests for enrichment batches, model cascade, output repair and cache versions."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from agents import Agent, ModelSettings
+from agents.exceptions import ModelBehaviorError
+from fastapi import HTTPException
+
+from app.config import settings
+from app.models.summaries import MedicationGroup, MedicationGroupingOutput
+from app.services.summaries import SummariesService, _pipeline_version
+
+
+def make_group(number: int) -> MedicationGroup:
+    return MedicationGroup(
+        group_number=number,
+        treatment_indication=f"Indication {number}",
+        medications=[{"name": f"DRUG {number}"}],
+        problem_list_match_type="Exact",
+        reasoning="On problem list",
+    )
+
+
+async def fake_run_agent(*, input_payload: str, **_kwargs):
+    groups = json.loads(input_payload)["medication_groups"]["groups"]
+    # The model tends to renumber each batch from 1
+    for index, group in enumerate(groups, start=1):
+        group["group_number"] = index
+        group["relevant_labs"] = [{"name": "A1C", "values": [], "trend": "stable"}]
+    return MagicMock(final_output=json.dumps({"groups": groups}))
+
+
+async def enrich(groups: list[MedicationGroup], run_agent: AsyncMock):
+    service = SummariesService()
+    with patch.object(service, "_run_agent", run_agent):
+        return await service._enrich_summary(
+            agents=[MagicMock()],
+            groups=groups,
+            prefetched_data=None,
+            run_context=MagicMock(),
+            metadata={},
+        )
+
+
+@pytest.mark.asyncio
+class TestEnrichmentBatches:
+    """Test fan-out enrichment keeps grouping order and numbering."""
+
+    async def test_batches_are_merged_in_group_number_order(self):
+        run_agent = AsyncMock(side_effect=fake_run_agent)
+
+        with patch("app.services.summaries.settings.summary_enrichment_batch_size", 2):
+            summary = await enrich([make_group(n) for n in range(1, 6)], run_agent)
+
+        assert run_agent.await_count == 3
+        assert [group.group_number for group in summary.groups] == [1, 2, 3, 4, 5]
+        assert [group.treatment_indication for group in summary.groups] == [
+            f"Indication {n}" for n in range(1, 6)
+        ]
+        assert all(group.relevant_labs for group in summary.groups)
+
+    async def test_single_run_when_batching_disabled(self):
+        run_agent = AsyncMock(side_effect=fake_run_agent)
+
+        with patch("app.services.summaries.settings.summary_enrichment_batch_size", 0):
+            summary = await enrich([make_group(n) for n in range(1, 4)], run_agent)
+
+        assert run_agent.await_count == 1
+        assert len(summary.groups) == 3
+
+    async def test_reordered_groups_keep_their_numbers(self):
+        async def reversed_run_agent(**kwargs):
+            result = await fake_run_agent(**kwargs)
+            groups = json.loads(result.final_output)["groups"]
+            return MagicMock(final_output=json.dumps({"groups": groups[::-1]}))
+
+        with patch("app.services.summaries.settings.summary_enrichment_batch_size", 2):
+            summary = await enrich(
+                [make_group(n) for n in range(1, 5)],
+                AsyncMock(side_effect=reversed_run_agent),
+            )
+
+        assert [
+            (group.group_number, group.medications[0].name) for group in summary.groups
+        ] == [(n, f"DRUG {n}") for n in range(1, 5)]
+
+    async def test_dropped_group_is_invalid_output(self):
+        async def lossy_run_agent(**kwargs):
+            result = await fake_run_agent(**kwargs)
+            groups = json.loads(result.final_output)["groups"]
+            return MagicMock(final_output=json.dumps({"groups": groups[:-1]}))
+
+        with (
+            patch("app.services.summaries.settings.summary_enrichment_batch_size", 2),
+            pytest.raises(HTTPException),
+        ):
+            _ = await enrich(
+                [make_group(n) for n in range(1, 5)],
+                AsyncMock(side_effect=lossy_run_agent),
+            )
+
+
+@pytest.mark.asyncio
+class TestModelCascade:
+    """Test escalation from the fast model when its output does not validate."""
+
+    async def test_invalid_fast_output_escalates(self):
+        service = SummariesService()
+        outputs = iter(
+            [
+                MagicMock(final_output="not json"),
+                MagicMock(final_output=json.dumps({"groups": []})),
+            ]
+        )
+        run_agent = AsyncMock(side_effect=lambda **_kwargs: next(outputs))
+        fast, full = MagicMock(), MagicMock()
+
+        with patch.object(service, "_run_agent", run_agent):
+            output = await service._run_stage(
+                agents=[fast, full],
+                output_type=MedicationGroupingOutput,
+                input_payload="{}",
+                run_context=MagicMock(),
+                metadata={},
+                workflow_name="medication_summary.grouping",
+            )
+
+        assert output.groups == []
+        assert [c.kwargs["agent"] for c in run_agent.await_args_list] == [fast, full]
+
+    async def test_unrepairable_fast_output_escalates(self):
+        service = SummariesService()
+        fast = Agent(name="FastAgent")
+        full = Agent(name="FullAgent")
+
+        async def run_agent(**kwargs):
+            if kwargs["agent"].name == "FastAgent":
+                error = ModelBehaviorError("Invalid JSON")
+                error.run_data = MagicMock(input="payload", new_items=[])
+                raise error
+            return MagicMock(final_output=MedicationGroupingOutput(groups=[]))
+
+        run_agent_mock = AsyncMock(side_effect=run_agent)
+        with patch.object(service, "_run_agent", run_agent_mock):
+            output = await service._run_stage(
+                agents=[fast, full],
+                output_type=MedicationGroupingOutput,
+                input_payload="payload",
+                run_context=MagicMock(),
+                metadata={},
+                workflow_name="medication_summary.grouping",
+            )
+
+        assert output.groups == []
+        called = [c.kwargs["agent"].name for c in run_agent_mock.await_args_list]
+        assert called[-1] == "FullAgent"
+        assert called.count("FullAgent") == 1
+
+    async def test_valid_fast_output_is_used(self):
+        service = SummariesService()
+        run_agent = AsyncMock(
+            return_value=MagicMock(final_output=json.dumps({"groups": []}))
+        )
+
+        with patch.object(service, "_run_agent", run_agent):
+            _ = await service._run_stage(
+                agents=[MagicMock(), MagicMock()],
+                output_type=MedicationGroupingOutput,
+                input_payload="{}",
+                run_context=MagicMock(),
+                metadata={},
+                workflow_name="medication_summary.grouping",
+            )
+
+        assert run_agent.await_count == 1
+
+
+@pytest.mark.asyncio
+class TestStructuredOutputRepair:
+    """Test that schema failures redo only the final turn."""
+
+    async def test_invalid_output_is_repaired_without_tools(self):
+        service = SummariesService()
+        error = ModelBehaviorError("Invalid JSON when parsing {} for TypeAdapter")
+        error.run_data = MagicMock(input="payload", new_items=[])
+        repaired = MagicMock(final_output=MedicationGroupingOutput(groups=[]))
+        run_agent = AsyncMock(side_effect=[error, repaired])
+        agent = Agent(
+            name="MedicationGroupingAgent",
+            tools=[MagicMock()],
+            model_settings=ModelSettings(parallel_tool_calls=False),
+        )
+
+        with patch.object(service, "_run_agent", run_agent):
+            output = await service._run_stage(
+                agents=[agent],
+                output_type=MedicationGroupingOutput,
+                input_payload="payload",
+                run_context=MagicMock(),
+                metadata={},
+                workflow_name="medication_summary.grouping",
+            )
+
+        assert output.groups == []
+        repair_call = run_agent.await_args_list[1].kwargs
+        assert repair_call["max_turns"] == 1
+        assert repair_call["agent"].tools == []
+        assert repair_call["input_payload"][0]["content"] == "payload"
+        assert "did not match" in repair_call["input_payload"][-1]["content"]
+
+    async def test_repeated_failure_raises_http_error(self):
+        service = SummariesService()
+        error = ModelBehaviorError("Invalid JSON")
+        error.run_data = MagicMock(input="payload", new_items=[])
+        run_agent = AsyncMock(side_effect=error)
+
+        with (
+            patch.object(service, "_run_agent", run_agent),
+            pytest.raises(HTTPException),
+        ):
+            _ = await service._run_stage(
+                agents=[Agent(name="MedicationGroupingAgent")],
+                output_type=MedicationGroupingOutput,
+                input_payload="payload",
+                run_context=MagicMock(),
+                metadata={},
+                workflow_name="medication_summary.grouping",
+            )
+
+        assert run_agent.await_count == 2
+
+
+@pytest.mark.parametrize(
+    ("setting", "value"),
+    [("summary_stream_batch_size", 99), ("summary_prefetch_enabled", True)],
+)
+def test_pipeline_version_covers_output_shaping_settings(setting: str, value: object):
+    before = _pipeline_version()
+    _pipeline_version.cache_clear()
+
+    try:
+        with patch.object(settings, setting, value):
+            assert _pipeline_version() != before
+    finally:
+        _pipeline_version.cache_clear()
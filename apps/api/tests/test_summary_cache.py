@@ -0,0 +1,48 @@
+"""Tests for the disk-backed summary cache."""
+
+import os
+
+import pytest
+
+from app.services.summary_cache import SummaryCache, content_key
+
+
+def test_content_key_ignores_dict_order():
+    assert content_key({"a": 1, "b": [1, 2]}, "v1") == content_key(
+        {"b": [1, 2], "a": 1}, "v1"
+    )
+    assert content_key({"a": 1}, "v1") != content_key({"a": 1}, "v2")
+
+
+@pytest.mark.asyncio
+class TestSummaryCache:
+    """Test persistence, eviction and disabled mode."""
+
+    async def test_entries_survive_a_new_instance(self, tmp_path):
+        await SummaryCache(tmp_path, max_bytes=10_000).set("abc", {"summary": 1})
+
+        cache = SummaryCache(tmp_path, max_bytes=10_000)
+
+        assert await cache.get("abc") == {"summary": 1}
+        assert await cache.get("missing") is None
+        assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+    async def test_least_recently_used_entry_is_evicted(self, tmp_path):
+        cache = SummaryCache(tmp_path, max_bytes=100)
+        await cache.set("old", {"summary": "x" * 30})
+        await cache.set("new", {"summary": "y" * 30})
+        os.utime(tmp_path / "old.json", (1, 1))
+
+        await cache.set("newest", {"summary": "z" * 30})
+
+        assert await cache.get("old") is None
+        assert await cache.get("newest") is not None
+        assert cache.stats().evictions == 1
+
+    async def test_disabled_cache_stores_nothing(self, tmp_path):
+        cache = SummaryCache(tmp_path, max_bytes=0)
+
+        await cache.set("abc", {"summary": 1})
+
+        assert await cache.get("abc") is None
+        assert not list(tmp_path.iterdir())
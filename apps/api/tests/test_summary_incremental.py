@@ -0,0 +1,133 @@
+"""Tests for incremental medication summary regeneration."""
+
+import copy
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.summaries import (
+    MedicationGroup,
+    MedicationGroupingOutput,
+    MedicationSummary,
+)
+from app.services.summaries import SummariesService
+from app.services.summary_incremental import (
+    merge_regrouped_groups,
+    plan_incremental_update,
+)
+
+
+def make_group(number: int, indication: str, drug: str, lab: str) -> MedicationGroup:
+    return MedicationGroup(
+        group_number=number,
+        treatment_indication=indication,
+        medications=[{"name": drug}],
+        problem_list_match_type="Exact",
+        reasoning="On problem list",
+        relevant_labs=[{"name": lab, "values": [], "trend": "stable"}],
+    )
+
+
+GROUPS = [
+    make_group(1, "Diabetes", "METFORMIN 500MG TAB", "HGB A1C"),
+    make_group(2, "Hypertension", "LISINOPRIL 10MG TAB", "POTASSIUM"),
+]
+
+DATA = {
+    "medications": [
+        {"name": "METFORMIN 500MG TAB", "status": "ACTIVE"},
+        {"name": "LISINOPRIL 10MG TAB", "status": "ACTIVE"},
+    ],
+    "problems": [{"name": "Diabetes"}, {"name": "Hypertension"}],
+    "labs": {
+        "HGB A1C": [{"value": "7.1", "date": "2026-01-01"}],
+        "POTASSIUM": [{"value": "4.1", "date": "2026-01-01"}],
+    },
+    "vitals": {},
+}
+
+
+def changed(**updates):
+    data = copy.deepcopy(DATA)
+    data.update(updates)
+    return data
+
+
+def test_new_lab_value_only_reenriches_linked_group():
+    labs = copy.deepcopy(DATA["labs"])
+    labs["POTASSIUM"].insert(0, {"value": "5.6", "date": "2026-06-01"})
+
+    plan = plan_incremental_update(DATA, changed(labs=labs), GROUPS)
+
+    assert plan is not None
+    assert [g.treatment_indication for g in plan.reused] == ["Diabetes"]
+    assert [g.treatment_indication for g in plan.reenrich] == ["Hypertension"]
+    assert plan.reenrich[0].relevant_labs == []
+    assert plan.regroup_medications == []
+
+
+def test_new_medication_is_grouped_alone_and_merged_by_indication():
+    medications = [*DATA["medications"], {"name": "GLIPIZIDE 5MG TAB"}]
+
+    plan = plan_incremental_update(DATA, changed(medications=medications), GROUPS)
+
+    assert plan is not None
+    assert plan.regroup_medications == [{"name": "GLIPIZIDE 5MG TAB"}]
+    regrouped = make_group(1, "diabetes", "GLIPIZIDE 5MG TAB", "HGB A1C")
+    to_enrich = merge_regrouped_groups(plan, [regrouped])
+    assert [g.group_number for g in to_enrich] == [1]
+    assert [m.name for m in to_enrich[0].medications] == [
+        "METFORMIN 500MG TAB",
+        "GLIPIZIDE 5MG TAB",
+    ]
+    assert [g.treatment_indication for g in plan.reused] == ["Hypertension"]
+
+
+def test_problem_list_change_requires_full_regeneration():
+    assert plan_incremental_update(DATA, changed(problems=[]), GROUPS) is None
+
+
+@pytest.mark.asyncio
+class TestUpdateFromBaseline:
+    """Test the service reuses unchanged groups and runs only the needed stages."""
+
+    async def test_changed_medication_regroups_only_its_group(self):
+        service = SummariesService()
+        medications = copy.deepcopy(DATA["medications"])
+        medications[1]["status"] = "DISCONTINUED"
+        baseline = {
+            "data": DATA,
+            "summary": {"groups": [g.model_dump() for g in GROUPS]},
+        }
+        regrouped = make_group(1, "Hypertension", "LISINOPRIL 10MG TAB", "POTASSIUM")
+        run_stage = AsyncMock(
+            side_effect=[
+                MedicationGroupingOutput(groups=[regrouped]),
+                MedicationSummary(groups=[regrouped]),
+            ]
+        )
+
+        with (
+            patch(
+                "app.services.summaries.summary_cache.get",
+                AsyncMock(return_value=baseline),
+            ),
+            patch.object(service, "_run_stage", run_stage),
+        ):
+            summary = await service._update_from_baseline(
+                baseline_key="baseline",
+                prefetched=changed(medications=medications),
+                tools=MagicMock(),
+                run_context=MagicMock(patient_icn="123V456", station="500"),
+                metadata={},
+            )
+
+        assert summary is not None
+        assert run_stage.await_count == 2
+        grouping_input = run_stage.await_args_list[0].kwargs["input_payload"]
+        assert "METFORMIN" not in grouping_input
+        assert '"existing_groups"' in grouping_input
+        assert [(g.group_number, g.treatment_indication) for g in summary.groups] == [
+            (1, "Diabetes"),
+            (2, "Hypertension"),
+        ]
@@ -0,0 +1,117 @@
+"""Tests for the summary job queue."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.summaries import SummariesRequest
+from app.services.summaries import SummariesService
+from app.services.summary_jobs import InMemorySummaryJobBackend, SummaryJobQueue
+
+MEDICATION = SummariesService.SummaryType.MEDICATION
+
+
+def make_request(icn: str = "123V456") -> SummariesRequest:
+    return SummariesRequest(patient={"icn": icn, "station": "500"})
+
+
+def make_context(sub: str = "user-1") -> MagicMock:
+    return MagicMock(user=MagicMock(sub=sub))
+
+
+def make_queue(service, **overrides) -> SummaryJobQueue:
+    options = {"workers": 2, "result_ttl_seconds": 60.0, "max_pending": 10}
+    options.update(overrides)
+    return SummaryJobQueue(service, backend=InMemorySummaryJobBackend(), **options)
+
+
+async def wait_finished(queue: SummaryJobQueue, job_id: str, owner: str = "user-1"):
+    for _ in range(100):
+        job = await queue.get(job_id, owner=owner)
+        if job is not None and job.finished_at is not None:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+@pytest.mark.asyncio
+class TestSummaryJobQueue:
+    """Test job execution, deduplication, ownership and expiry."""
+
+    async def test_duplicate_submissions_share_one_job(self):
+        release = asyncio.Event()
+
+        async def generate(*_args):
+            await release.wait()
+            return "summary"
+
+        service = MagicMock(generate_summary=AsyncMock(side_effect=generate))
+        queue = make_queue(service)
+
+        first = await queue.submit(MEDICATION, make_request(), make_context())
+        second = await queue.submit(MEDICATION, make_request(), make_context())
+        other = await queue.submit(MEDICATION, make_request("999V1"), make_context())
+        release.set()
+        job = await wait_finished(queue, first.id)
+        await queue.close()
+
+        assert second is first
+        assert other is not first
+        assert job.status == "succeeded"
+        assert job.result == "summary"
+        assert service.generate_summary.await_count == 2
+        assert queue.stats()["deduplicated"] == 1
+
+    async def test_jobs_are_private_to_their_submitter(self):
+        service = MagicMock(generate_summary=AsyncMock(return_value="summary"))
+        queue = make_queue(service)
+
+        job = await queue.submit(MEDICATION, make_request(), make_context("user-1"))
+        await queue.close()
+
+        assert await queue.get(job.id, owner="user-2") is None
+        assert await queue.get(job.id, owner="user-1") is job
+
+    async def test_failed_job_hides_details_and_can_be_resubmitted(self):
+        service = MagicMock(
+            generate_summary=AsyncMock(side_effect=RuntimeError("secret detail"))
+        )
+        queue = make_queue(service)
+
+        failed = await queue.submit(MEDICATION, make_request(), make_context())
+        job = await wait_finished(queue, failed.id)
+        retry = await queue.submit(MEDICATION, make_request(), make_context())
+        await queue.close()
+
+        assert job.status == "failed"
+        assert job.error is not None
+        assert "secret" not in job.error
+        assert retry.id != failed.id
+
+    async def test_finished_jobs_expire_after_ttl(self):
+        service = MagicMock(generate_summary=AsyncMock(return_value="summary"))
+        queue = make_queue(service, result_ttl_seconds=10.0)
+
+        job = await queue.submit(MEDICATION, make_request(), make_context())
+        _ = await wait_finished(queue, job.id)
+        await queue.close()
+        assert job.finished_at is not None
+
+        with patch("app.services.summary_jobs.time.time") as now:
+            now.return_value = job.finished_at + 11
+            assert await queue.get(job.id, owner="user-1") is None
+
+    async def test_full_queue_rejects_new_jobs(self):
+        service = MagicMock(generate_summary=AsyncMock(return_value="summary"))
+        queue = make_queue(service, max_pending=1)
+
+        with patch.object(queue, "_ensure_workers"):
+            _ = await queue.submit(MEDICATION, make_request(), make_context())
+            with pytest.raises(HTTPException) as exc_info:
+                _ = await queue.submit(
+                    MEDICATION, make_request("999V1"), make_context()
+                )
+
+        assert exc_info.value.status_code == 503
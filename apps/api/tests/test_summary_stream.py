@@ -0,0 +1,106 @@
+"""Tests for the streaming medication summary."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.summaries import (
+    MedicationGroup,
+    MedicationSummary,
+    SummaryCompleteEvent,
+    SummaryGroupEvent,
+    SummaryProgressEvent,
+)
+from app.services.summaries import SummariesService
+
+MEDICATION = SummariesService.SummaryType.MEDICATION
+
+
+def make_group(number: int) -> MedicationGroup:
+    return MedicationGroup(
+        group_number=number,
+        treatment_indication=f"Indication {number}",
+        medications=[{"name": f"DRUG {number}"}],
+        problem_list_match_type="Exact",
+        reasoning="On problem list",
+    )
+
+
+@pytest.mark.asyncio
+class TestStreamSummary:
+    """Test event ordering, per-batch delivery and cancellation."""
+
+    async def test_events_precede_final_summary(self):
+        service = SummariesService()
+
+        async def fake_generate(_request, _context, *, on_event):
+            await on_event(SummaryProgressEvent(stage="data_fetched"))
+            await on_event(SummaryGroupEvent(group=make_group(1)))
+            return MedicationSummary(groups=[make_group(1)])
+
+        with patch.object(service, "_generate_medication_summary", fake_generate):
+            events = [
+                event
+                async for event in service.stream_summary(
+                    MEDICATION, MagicMock(), MagicMock()
+                )
+            ]
+
+        assert [event.type for event in events] == ["progress", "group", "summary"]
+        assert isinstance(events[-1], SummaryCompleteEvent)
+        assert len(events[-1].summary.data.groups) == 1
+
+    async def test_each_batch_is_emitted_when_it_finishes(self):
+        service = SummariesService()
+        release_first = asyncio.Event()
+        emitted: list[int] = []
+
+        async def fake_run_agent(*, input_payload: str, **_kwargs):
+            groups = json.loads(input_payload)["medication_groups"]["groups"]
+            if groups[0]["group_number"] == 1:
+                await release_first.wait()
+            return MagicMock(final_output=json.dumps({"groups": groups}))
+
+        async def on_event(event):
+            emitted.append(event.group.group_number)
+            release_first.set()
+
+        with (
+            patch.object(service, "_run_agent", AsyncMock(side_effect=fake_run_agent)),
+            patch("app.services.summaries.settings.summary_stream_batch_size", 1),
+        ):
+            summary = await service._enrich_summary(
+                agents=[MagicMock()],
+                groups=[make_group(1), make_group(2)],
+                prefetched_data=None,
+                run_context=MagicMock(),
+                metadata={},
+                on_event=on_event,
+            )
+
+        assert emitted == [2, 1]
+        assert [group.group_number for group in summary.groups] == [1, 2]
+
+    async def test_closing_the_stream_cancels_the_run(self):
+        service = SummariesService()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def fake_generate(_request, _context, *, on_event):
+            await on_event(SummaryProgressEvent(stage="data_fetched"))
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch.object(service, "_generate_medication_summary", fake_generate):
+            stream = service.stream_summary(MEDICATION, MagicMock(), MagicMock())
+            _ = await anext(stream)
+            await started.wait()
+            await stream.aclose()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
@@ -0,0 +1,70 @@
+"""Tests for serving narrower lab/vital windows from cached wider results."""
+
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.agents.context import MedicationRunContext
+from app.agents.tools import _get_or_load_window
+from app.services.vista_tools import narrow_series
+
+TODAY = date(2025, 6, 1)
+
+
+def test_narrow_series_filters_by_window_and_count():
+    grouped = {
+        "A1C": [
+            {"value": "7.1", "date": "2025-05-01"},
+            {"value": "7.4", "date": "2024-11-01"},
+            {"value": "7.9", "date": "2023-01-01"},
+        ],
+        "LDL": [{"value": "120", "date": "2022-01-01"}],
+    }
+
+    narrowed = narrow_series(grouped, days_back=365, n_most_recent=1, today=TODAY)
+
+    assert narrowed == {"A1C": [{"value": "7.1", "date": "2025-05-01"}]}
+
+
+def make_context() -> MedicationRunContext:
+    return MedicationRunContext(
+        vista_mcp=MagicMock(),
+        patient_icn="1000000219V596118",
+        station="500",
+        user_duz="10000000219",
+    )
+
+
+@pytest.mark.asyncio
+class TestWindowSubsumingCache:
+    """Test reuse of wider cached windows within a run."""
+
+    async def test_narrower_request_is_served_locally(self):
+        context = make_context()
+        context.set_cached_tool(
+            "fetch_labs",
+            (1825, 3),
+            {"A1C": [{"value": "7.1", "date": date.today().isoformat()}]},
+        )
+        loader = AsyncMock()
+
+        labs = await _get_or_load_window(context, "fetch_labs", 365, 2, loader)
+
+        assert labs == {"A1C": [{"value": "7.1", "date": date.today().isoformat()}]}
+        loader.assert_not_awaited()
+
+    async def test_wider_request_is_not_served_from_narrower(self):
+        context = make_context()
+        context.set_cached_tool("fetch_labs", (365, 3), {"A1C": []})
+        context.set_cached_tool("fetch_labs", (1825, 1), {"A1C": []})
+        # Avoid hits from the process-wide cache populated by other tests
+        context.user_duz = "window-test-duz"
+        loader = AsyncMock(return_value={"A1C": [{"value": "7.1", "date": None}]})
+
+        labs = await _get_or_load_window(context, "fetch_labs", 1825, 3, loader)
+
+        assert labs == {"A1C": [{"value": "7.1", "date": None}]}
+        loader.assert_awaited_once()
+        # Both earlier windows are still cached alongside the new one
+        assert len(dict(context.iter_cached_tool("fetch_labs"))) == 3
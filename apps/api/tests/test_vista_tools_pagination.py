@@ -0,0 +1,158 @@
+"""Tests for paginated Vista MCP tool collection."""
+
+import asyncio
+import json
+
+import pytest
+from mcp.types import CallToolResult, TextContent
+
+from app.services.vista_tools import collect_paginated, fetch_labs, iter_paginated
+
+
+class FakePagedVista:
+    """Serves ``total`` numbered records in pages, optionally hiding the total."""
+
+    def __init__(self, total: int, *, report_total: bool = True, delay: float = 0):
+        self.total = total
+        self.report_total = report_total
+        self.delay = delay
+        self.offsets: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def call_tool(self, _tool_name, arguments):
+        offset = arguments["offset"]
+        limit = arguments["limit"]
+        self.offsets.append(offset)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Later pages answer first to prove results are reassembled in order
+            await asyncio.sleep(self.delay / (1 + offset))
+        finally:
+            self.in_flight -= 1
+
+        records = [
+            {
+                "id": i,
+                "type_name": "HEMOGLOBIN A1C",
+                "result": str(i),
+                "observed": f"2024-01-01T00:00:{59 - i % 60:02d}",
+            }
+            for i in range(offset, min(offset + limit, self.total))
+        ]
+        pagination = {"returned": len(records)}
+        if self.report_total:
+            pagination["total_available_items"] = self.total
+        payload = {
+            "success": True,
+            "data": {"labs": records},
+            "metadata": {"pagination": pagination},
+        }
+        return CallToolResult(
+            content=[TextContent(type="text", text=json.dumps(payload))]
+        )
+
+
+async def collect(vista, **overrides):
+    options = {
+        "tool_name": "get_patient_labs",
+        "arguments": {"patient_icn": "123"},
+        "item_key": "labs",
+        "limit": 10,
+        "max_pages": 4,
+    }
+    options.update(overrides)
+    return await collect_paginated(vista, **options)
+
+
+@pytest.mark.asyncio
+class TestCollectPaginated:
+    """Test concurrent page fetching and ordering."""
+
+    async def test_pages_fetched_concurrently_in_offset_order(self):
+        vista = FakePagedVista(35, delay=0.02)
+
+        items = await collect(vista)
+
+        assert [item["id"] for item in items] == list(range(35))
+        assert sorted(vista.offsets) == [0, 10, 20, 30]
+        assert vista.max_in_flight == 3
+
+    async def test_respects_max_pages(self):
+        vista = FakePagedVista(100)
+
+        items = await collect(vista, max_pages=3)
+
+        assert len(items) == 30
+        assert sorted(vista.offsets) == [0, 10, 20]
+
+    async def test_respects_concurrency_limit(self):
+        vista = FakePagedVista(100, delay=0.02)
+
+        _ = await collect(vista, max_pages=10, max_concurrency=2)
+
+        assert vista.max_in_flight == 2
+
+    async def test_falls_back_to_sequential_without_total(self):
+        vista = FakePagedVista(25, report_total=False)
+
+        items = await collect(vista)
+
+        assert [item["id"] for item in items] == list(range(25))
+        assert vista.offsets == [0, 10, 20, 25]
+
+    async def test_iter_paginated_yields_pages_in_order(self):
+        vista = FakePagedVista(25, delay=0.02)
+
+        pages = [
+            [item["id"] for item in page]
+            async for page in iter_paginated(
+                vista,
+                tool_name="get_patient_labs",
+                arguments={},
+                item_key="labs",
+                limit=10,
+                max_pages=4,
+            )
+        ]
+
+        assert pages == [list(range(10)), list(range(10, 20)), list(range(20, 25))]
+
+
+@pytest.mark.asyncio
+class TestFetchLabsStreaming:
+    """Test incremental lab normalization."""
+
+    async def test_keeps_most_recent_per_series(self):
+        vista = FakePagedVista(30)
+
+        labs = await fetch_labs(
+            vista,
+            patient_icn="123",
+            station="500",
+            days_back=365,
+            n_most_recent=3,
+            limit=10,
+            max_pages=4,
+        )
+
+        assert [obs["value"] for obs in labs["HEMOGLOBIN A1C"]] == ["0", "1", "2"]
+        assert sorted(vista.offsets) == [0, 10, 20]
+
+    async def test_stop_when_complete_skips_remaining_pages(self):
+        vista = FakePagedVista(30)
+
+        labs = await fetch_labs(
+            vista,
+            patient_icn="123",
+            station="500",
+            days_back=365,
+            n_most_recent=3,
+            limit=10,
+            max_pages=4,
+            stop_when_complete=True,
+        )
+
+        assert len(labs["HEMOGLOBIN A1C"]) == 3
+        assert vista.offsets == [0]